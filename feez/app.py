@@ -1,14 +1,45 @@
-from flask import Flask, render_template, request, jsonify, Response
+from flask import Flask, render_template, request, jsonify, Response, send_file
 from flask_cors import CORS
 import requests
 import logging
 import time
 import os
 import subprocess
+import threading
+import atexit
+import base64
+import json
+import re
+import sqlite3
+import struct
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from types import SimpleNamespace
 from typing import Any
 from requests import RequestException
 from lessons_data import LESSON_DATABASE
+from lesson_index import LESSON_BANK_SERVICE, LessonCatalog, build_phrase_index, normalize_phrase
+from backend_pool import BackendPool
+from circuit_breaker import CircuitBreaker, CircuitOpenError, RetryBudget, backoff_delay
+from http_sessions import SessionPool
+from memory_cache import LRUCache
+from piper_pool import PiperPool
+from request_hedging import RequestHedger
+from voice_registry import VoiceRegistry, voice_name
+from audio_store import AudioStore, audio_key
+from audio_packs import load_pack_index, pack_paths
+from wav_utils import build_wav, parse_wav, wav_header
+from audio_transforms import MAX_RATE, MIN_RATE, change_wav_rate
+from audio_codecs import AUDIO_FORMATS, encode_audio
+from single_flight import SingleFlight
+from translation_jobs import TranslationJobManager
+from translation_memory import TranslationMatch, TranslationMemory
+from translation_store import TranslationStore
+from synthesis_scheduler import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_PREFETCH,
+    SynthesisQueueFull,
+    SynthesisScheduler,
+)
 try:
     import config as _config_module
     app_config: Any = _config_module
@@ -18,7 +49,23 @@ except ImportError:
         DEBUG=True,
         SECRET_KEY='dev-secret-key',
         LIBRETRANSLATE_URL='https://libretranslate.com/translate',
+        LIBRETRANSLATE_URLS=[],
         LIBRETRANSLATE_API_KEY=None,
+        LIBRETRANSLATE_HEALTH_CHECK_INTERVAL_SECONDS=10,
+        LIBRETRANSLATE_HEALTH_CHECK_TIMEOUT_SECONDS=3,
+        LIBRETRANSLATE_EJECT_SECONDS=30,
+        LIBRETRANSLATE_SLOW_SECONDS=5,
+        LIBRETRANSLATE_HEDGE_PERCENTILE=95,
+        LIBRETRANSLATE_HEDGE_DELAY_SECONDS=1,
+        LIBRETRANSLATE_HEDGE_BUDGET_RATIO=0.1,
+        UPSTREAM_POOL_SIZE=10,
+        UPSTREAM_FAILURE_THRESHOLD=5,
+        UPSTREAM_OPEN_SECONDS=10,
+        UPSTREAM_MAX_OPEN_SECONDS=120,
+        UPSTREAM_RETRY_BUDGET_RATIO=0.2,
+        UPSTREAM_CONNECT_TIMEOUT_SECONDS=3.05,
+        LIBRETRANSLATE_READ_TIMEOUT_SECONDS=10,
+        LOCAL_TTS_READ_TIMEOUT_SECONDS=15,
         LOCAL_TTS_ENABLED=False,
         LOCAL_TTS_PROVIDER='piper',
         LOCAL_TTS_URL='http://localhost:5500/api/tts',
@@ -26,6 +73,24 @@ except ImportError:
         PIPER_BINARY_PATH=os.path.join(_base_dir, 'vendor', 'piper', 'piper', 'piper'),
         PIPER_MODEL_PATH=os.path.join(_base_dir, 'vendor', 'piper', 'voices', 'fi_FI-harri-medium.onnx'),
         PIPER_CONFIG_PATH=os.path.join(_base_dir, 'vendor', 'piper', 'voices', 'fi_FI-harri-medium.onnx.json'),
+        PIPER_POOL_SIZE=2,
+        PIPER_VOICES_DIR=os.path.join(_base_dir, 'vendor', 'piper', 'voices'),
+        PIPER_MAX_RESIDENT_VOICES=2,
+        TTS_AUDIO_CACHE_DIR=os.path.join(_base_dir, 'cache', 'tts'),
+        TTS_AUDIO_CACHE_MAX_BYTES=512 * 1024 * 1024,
+        AUDIO_PACK_DIR=os.path.join(_base_dir, 'cache', 'audio-packs'),
+        TTS_MAX_CONCURRENT_JOBS=0,
+        TTS_MAX_QUEUE_DEPTH=32,
+        TTS_DEFAULT_AUDIO_FORMAT='wav',
+        TRANSLATION_CACHE_MAX_BYTES=4 * 1024 * 1024,
+        TRANSLATION_STORE_PATH=os.path.join(_base_dir, 'cache', 'translations.sqlite3'),
+        TRANSLATION_STORE_MAX_AGE_SECONDS=30 * 24 * 60 * 60,
+        TRANSLATION_MEMORY_MIN_SIMILARITY=0.9,
+        TRANSLATION_MEMORY_MAX_ENTRIES=200000,
+        TRANSLATION_JOB_WORKERS=2,
+        TRANSLATION_JOB_CONCURRENCY=2,
+        TRANSLATION_JOB_RESULT_TTL_SECONDS=60 * 60,
+        TTS_MEMORY_CACHE_MAX_BYTES=64 * 1024 * 1024,
         HOST='0.0.0.0',
         PORT=5000,
     )
@@ -38,38 +103,106 @@ logger = logging.getLogger(__name__)
 
 MAX_TEXT_LENGTH = 300
 MAX_BATCH_LINES = 50
+LESSON_ITEMS_PAGE_SIZE = 500
+MAX_LESSON_ITEMS_PAGE_SIZE = 2000
+MAX_JOB_LINES = 5000
+MAX_JOB_CHARACTERS = 200000
+TRANSLATION_JOB_STREAM_POLL_SECONDS = 15
+TRANSLATION_BATCH_CONCURRENCY = 8
+TRANSLATION_BULK_CHUNK_SIZE = 25
+MAX_TTS_BATCH_LINES = 20
+TTS_BATCH_CONCURRENCY = 4
+TTS_STREAM_SEGMENT_CHARS = 80
+TTS_IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
 TRANSLATION_RETRIES = 3
 TRANSLATION_RETRY_DELAY_SECONDS = 0.6
 TTS_RETRIES = 2
 TTS_RETRY_DELAY_SECONDS = 0.3
+UPSTREAM_RETRY_MAX_DELAY_SECONDS = 2
+HEDGE_MIN_DELAY_SECONDS = 0.05
+TRANSLATION_SOURCE_LANGUAGE = 'fi'
+TRANSLATION_TARGET_LANGUAGE = 'en'
+TRANSLATION_PROVIDER = 'libretranslate'
+TRANSLATION_MEMORY_SERVICE = 'translation-memory'
 TRANSLATION_CACHE_TTL_SECONDS = 24 * 60 * 60
 TTS_CACHE_TTL_SECONDS = 60 * 60
 TRANSLATION_CACHE_MAX_SIZE = 500
 TTS_CACHE_MAX_SIZE = 200
+CACHE_SWEEP_INTERVAL_SECONDS = 60
+PIPER_TIMEOUT_SECONDS = 20
+PIPER_HEALTH_CHECK_INTERVAL_SECONDS = 30
 
-_translation_cache = {}
-_tts_cache = {}
-
+_lesson_catalog = LessonCatalog(LESSON_DATABASE)
+_lesson_phrases = build_phrase_index(LESSON_DATABASE)
+_translation_memory = TranslationMemory(
+    min_similarity=getattr(app_config, 'TRANSLATION_MEMORY_MIN_SIMILARITY', 0.9),
+    max_entries=getattr(app_config, 'TRANSLATION_MEMORY_MAX_ENTRIES', 200000),
+)
+_translation_memory.add_many(
+    (item['finnish'], item['english'])
+    for lesson in LESSON_DATABASE['lessons']
+    for item in lesson['items']
+)
+_translation_cache = LRUCache(
+    max_entries=TRANSLATION_CACHE_MAX_SIZE,
+    max_bytes=getattr(app_config, 'TRANSLATION_CACHE_MAX_BYTES', 4 * 1024 * 1024),
+    ttl_seconds=TRANSLATION_CACHE_TTL_SECONDS,
+    sweep_interval=CACHE_SWEEP_INTERVAL_SECONDS,
+)
+_tts_cache = LRUCache(
+    max_entries=TTS_CACHE_MAX_SIZE,
+    max_bytes=getattr(app_config, 'TTS_MEMORY_CACHE_MAX_BYTES', 64 * 1024 * 1024),
+    ttl_seconds=TTS_CACHE_TTL_SECONDS,
+    sweep_interval=CACHE_SWEEP_INTERVAL_SECONDS,
+)
+_translation_flight = SingleFlight()
+_tts_flight = SingleFlight()
+_voice_registry = None
+_voice_registry_lock = threading.Lock()
+_audio_stores = {}
+_translation_stores = {}
+_translation_store_lock = threading.Lock()
+_libretranslate_pools = {}
+_libretranslate_pool_lock = threading.Lock()
+_audio_store_lock = threading.Lock()
+_http_sessions = SessionPool(getattr(app_config, 'UPSTREAM_POOL_SIZE', 10))
+_circuit_breakers = {
+    name: CircuitBreaker(
+        name,
+        failure_threshold=getattr(app_config, 'UPSTREAM_FAILURE_THRESHOLD', 5),
+        open_seconds=getattr(app_config, 'UPSTREAM_OPEN_SECONDS', 10),
+        max_open_seconds=getattr(app_config, 'UPSTREAM_MAX_OPEN_SECONDS', 120),
+    )
+    for name in ('libretranslate', 'opentts')
+}
+_retry_budgets = {
+    name: RetryBudget(ratio=getattr(app_config, 'UPSTREAM_RETRY_BUDGET_RATIO', 0.2))
+    for name in ('libretranslate', 'opentts')
+}
+_translation_hedger = RequestHedger(
+    RetryBudget(ratio=getattr(app_config, 'LIBRETRANSLATE_HEDGE_BUDGET_RATIO', 0.1), min_retries=1),
+    max_workers=getattr(app_config, 'UPSTREAM_POOL_SIZE', 10),
+)
 
-def _cache_get(cache, key, ttl_seconds):
-    entry = cache.get(key)
-    if not entry:
-        return None
 
-    expires_at, value = entry
-    if expires_at < time.time():
-        cache.pop(key, None)
-        return None
-    return value
+def _default_synthesis_concurrency():
+    """CPU count, capped at the Piper workers that can exist when Piper runs pooled.
 
+    Jobs beyond the warm workers would only queue inside the pools and time
+    out there, without the scheduler's priorities or Retry-After hint.
+    """
+    concurrency = os.cpu_count() or 1
+    pool_size = getattr(app_config, 'PIPER_POOL_SIZE', 2)
+    if getattr(app_config, 'LOCAL_TTS_PROVIDER', 'piper').strip().lower() == 'piper' and pool_size > 0:
+        resident_voices = max(1, getattr(app_config, 'PIPER_MAX_RESIDENT_VOICES', 2))
+        concurrency = min(concurrency, pool_size * resident_voices)
+    return concurrency
 
-def _cache_set(cache, key, value, ttl_seconds, max_size):
-    if len(cache) >= max_size:
-        # Drop the oldest inserted key to keep memory bounded.
-        oldest_key = next(iter(cache))
-        cache.pop(oldest_key, None)
 
-    cache[key] = (time.time() + ttl_seconds, value)
+_synthesis_scheduler = SynthesisScheduler(
+    getattr(app_config, 'TTS_MAX_CONCURRENT_JOBS', 0) or _default_synthesis_concurrency(),
+    getattr(app_config, 'TTS_MAX_QUEUE_DEPTH', 32),
+)
 
 
 def _resolve_local_path(path_value):
@@ -80,66 +213,242 @@ def _resolve_local_path(path_value):
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), path_value)
 
 
+def get_audio_pack_dir():
+    return _resolve_local_path(getattr(app_config, 'AUDIO_PACK_DIR', 'cache/audio-packs'))
+
+
+def _upstream_timeout(read_timeout_name, default_read_seconds):
+    return (
+        getattr(app_config, 'UPSTREAM_CONNECT_TIMEOUT_SECONDS', 3.05),
+        getattr(app_config, read_timeout_name, default_read_seconds),
+    )
+
+
+@atexit.register
+def _close_http_sessions():
+    _http_sessions.close()
+
+
+def get_libretranslate_urls():
+    return list(getattr(app_config, 'LIBRETRANSLATE_URLS', None) or [app_config.LIBRETRANSLATE_URL])
+
+
+def _libretranslate_health_url(url):
+    base = url.rstrip('/')
+    if base.endswith('/translate'):
+        base = base[:-len('/translate')]
+    return f'{base}/languages'
+
+
+def _libretranslate_session(url):
+    """Keep-alive session for one LibreTranslate backend.
+
+    Each backend gets its own connection pool, so routing between
+    instances never evicts another instance's idle connections.
+    """
+    return _http_sessions.get(f'libretranslate {url}')
+
+
+def _probe_libretranslate(url):
+    response = _libretranslate_session(url).get(
+        _libretranslate_health_url(url),
+        timeout=_upstream_timeout('LIBRETRANSLATE_HEALTH_CHECK_TIMEOUT_SECONDS', 3),
+    )
+    response.raise_for_status()
+    return True
+
+
+def _get_libretranslate_pool():
+    """Backend pool for the configured LibreTranslate URLs, health-probed when there are several."""
+    urls = tuple(get_libretranslate_urls())
+    pool = _libretranslate_pools.get(urls)
+    if pool is not None:
+        return pool
+
+    with _libretranslate_pool_lock:
+        if urls not in _libretranslate_pools:
+            _libretranslate_pools[urls] = BackendPool(
+                urls,
+                probe=_probe_libretranslate,
+                health_interval=(
+                    getattr(app_config, 'LIBRETRANSLATE_HEALTH_CHECK_INTERVAL_SECONDS', 10) if len(urls) > 1 else 0
+                ),
+                max_failures=TRANSLATION_RETRIES,
+                eject_seconds=getattr(app_config, 'LIBRETRANSLATE_EJECT_SECONDS', 30),
+                slow_seconds=getattr(app_config, 'LIBRETRANSLATE_SLOW_SECONDS', 5),
+            )
+    return _libretranslate_pools[urls]
+
+
+@atexit.register
+def _close_libretranslate_pools():
+    for pool in list(_libretranslate_pools.values()):
+        pool.close()
+    _translation_hedger.close()
+
+
 def _json_error(message, status_code=400):
     return jsonify({'success': False, 'error': message}), status_code
 
 
+def _unavailable_error(message, exc):
+    """503 response, with Retry-After when the upstream's circuit is open."""
+    response, status_code = _json_error(message, 503)
+    if isinstance(exc, CircuitOpenError):
+        response.headers['Retry-After'] = str(exc.retry_after)
+    return response, status_code
+
+
+def _is_upstream_failure(exc):
+    """Whether ``exc`` says the upstream is unhealthy, rather than that it refused this request."""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return True
+
+
+def get_upstream_state(name):
+    """Circuit breaker state of an upstream: ``closed``, ``open`` or ``half-open``."""
+    return _circuit_breakers[name].state
+
+
+def _tts_busy_error(exc):
+    response, status_code = _json_error('TTS is busy. Please try again shortly.', 503)
+    response.headers['Retry-After'] = str(exc.retry_after)
+    return response, status_code
+
+
 def get_lessons(level=None):
-    lessons = LESSON_DATABASE['lessons']
-    if level:
-        normalized_level = level.strip().upper()
-        lessons = [lesson for lesson in lessons if lesson['level'].upper() == normalized_level]
-    return lessons
+    return _lesson_catalog.filter(level=level)
 
 
 def get_lesson_by_id(lesson_id):
-    for lesson in LESSON_DATABASE['lessons']:
-        if lesson['id'] == lesson_id:
-            return lesson
-    return None
+    return _lesson_catalog.get(lesson_id)
 
 
-def translate_with_libretranslate(text):
-    """Translate using LibreTranslate API"""
-    cache_key = text.strip().lower()
-    cached_translation = _cache_get(_translation_cache, cache_key, TRANSLATION_CACHE_TTL_SECONDS)
-    if cached_translation:
-        return cached_translation
+def lookup_lesson_phrase(text):
+    """Return the lesson bank's own English for ``text``, or None."""
+    return _lesson_phrases.get(normalize_phrase(text))
+
+
+def _translation_cache_key(text):
+    return text.strip().lower()
+
+
+def _get_translation_store():
+    store_path = _resolve_local_path(getattr(app_config, 'TRANSLATION_STORE_PATH', ''))
+    if not store_path:
+        return None
+
+    store = _translation_stores.get(store_path)
+    if store is not None:
+        return store
+
+    with _translation_store_lock:
+        if store_path not in _translation_stores:
+            try:
+                _translation_stores[store_path] = TranslationStore(
+                    store_path,
+                    max_age_seconds=getattr(app_config, 'TRANSLATION_STORE_MAX_AGE_SECONDS', 0),
+                )
+            except (OSError, sqlite3.Error) as exc:
+                logger.error('Translation store is unusable: %s', str(exc))
+                return None
+    return _translation_stores[store_path]
 
-    url = app_config.LIBRETRANSLATE_URL
+
+def _load_stored_translations(cache_keys):
+    """Look ``cache_keys`` up in the persistent store and warm the memory cache with hits."""
+    store = _get_translation_store()
+    if not store or not cache_keys:
+        return {}
+    try:
+        found = store.get_many(
+            cache_keys, TRANSLATION_SOURCE_LANGUAGE, TRANSLATION_TARGET_LANGUAGE, TRANSLATION_PROVIDER
+        )
+    except sqlite3.Error as exc:
+        logger.warning('Translation store lookup failed: %s', str(exc))
+        return {}
+    for cache_key, translation in found.items():
+        _translation_cache.set(cache_key, translation)
+        _translation_memory.add(cache_key, translation)
+    return found
+
+
+def _persist_translations(translations):
+    store = _get_translation_store()
+    if not store or not translations:
+        return
+    try:
+        store.set_many(
+            translations, TRANSLATION_SOURCE_LANGUAGE, TRANSLATION_TARGET_LANGUAGE, TRANSLATION_PROVIDER
+        )
+    except sqlite3.Error as exc:
+        logger.warning('Translation store write failed: %s', str(exc))
+
+
+def _request_libretranslate(query, retry_http_errors=True, tried=None, attempts=TRANSLATION_RETRIES):
+    """POST ``query`` (a string or a list of strings) and return ``translatedText``.
+
+    Without ``retry_http_errors``, a request the upstream rejects (4xx other
+    than 429) raises ``RuntimeError`` at once. Overload, rate limiting and
+    transport errors are retried and end in ``ConnectionError``.
+
+    Backends already in ``tried`` are avoided while others are available;
+    each backend used is added to it. At most ``attempts`` calls are made.
+    """
     payload = {
-        'q': text,
-        'source': 'fi',
-        'target': 'en',
+        'q': query,
+        'source': TRANSLATION_SOURCE_LANGUAGE,
+        'target': TRANSLATION_TARGET_LANGUAGE,
         'format': 'text'
     }
     if app_config.LIBRETRANSLATE_API_KEY:
         payload['api_key'] = app_config.LIBRETRANSLATE_API_KEY
 
+    breaker = _circuit_breakers['libretranslate']
+    retry_budget = _retry_budgets['libretranslate']
+    backends = _get_libretranslate_pool()
+    lines = len(query) if isinstance(query, list) else 1
+    tried = set() if tried is None else tried
+    retry_budget.record_call()
     last_error = None
-    for attempt in range(1, TRANSLATION_RETRIES + 1):
+    for attempt in range(1, attempts + 1):
+        breaker.before_call()
+        backend = backends.acquire(exclude=tried)
+        tried.add(backend.url)
+        started = time.monotonic()
         try:
-            response = requests.post(url, json=payload, timeout=10)
+            response = _libretranslate_session(backend.url).post(
+                backend.url,
+                json=payload,
+                timeout=_upstream_timeout('LIBRETRANSLATE_READ_TIMEOUT_SECONDS', 10),
+            )
             response.raise_for_status()
-            data = response.json()
-            if data.get('translatedText'):
-                translated = data['translatedText']
-                _cache_set(
-                    _translation_cache,
-                    cache_key,
-                    translated,
-                    TRANSLATION_CACHE_TTL_SECONDS,
-                    TRANSLATION_CACHE_MAX_SIZE,
-                )
-                return translated
-            raise ValueError('Translation service returned an unexpected response')
         except RequestException as exc:
+            upstream_failure = _is_upstream_failure(exc)
+            if upstream_failure:
+                breaker.record_failure()
+                backends.release(backend)
+            else:
+                breaker.record_success()
+                backends.release(backend, time.monotonic() - started, lines)
+            if not upstream_failure and not retry_http_errors:
+                logger.error("LibreTranslate rejected request: %s", str(exc))
+                raise RuntimeError('Translation service rejected the request') from exc
             last_error = exc
-            if attempt < TRANSLATION_RETRIES:
-                time.sleep(TRANSLATION_RETRY_DELAY_SECONDS)
+            if attempt < attempts and retry_budget.try_retry():
+                time.sleep(backoff_delay(attempt, TRANSLATION_RETRY_DELAY_SECONDS, UPSTREAM_RETRY_MAX_DELAY_SECONDS))
                 continue
             logger.error("LibreTranslate network error after %s attempts: %s", attempt, str(exc))
             raise ConnectionError('Translation service is temporarily unavailable') from exc
+
+        backends.release(backend, time.monotonic() - started, lines)
+        breaker.record_success()
+        try:
+            data = response.json()
+            if data.get('translatedText'):
+                return data['translatedText']
+            raise ValueError('Translation service returned an unexpected response')
         except (TypeError, ValueError) as exc:
             logger.error("LibreTranslate parse error: %s", str(exc))
             raise RuntimeError('Translation service returned an invalid response') from exc
@@ -147,6 +456,299 @@ def translate_with_libretranslate(text):
     raise ConnectionError('Translation service is temporarily unavailable') from last_error
 
 
+def translate_with_libretranslate(text, use_memory=False):
+    """Translate using LibreTranslate API
+
+    With ``use_memory``, a close enough earlier translation is returned as a
+    ``TranslationMatch`` instead of calling LibreTranslate.
+    """
+    cache_key = _translation_cache_key(text)
+    cached_translation = _translation_cache.get(cache_key)
+    if cached_translation:
+        return cached_translation
+
+    stored_translation = _load_stored_translations([cache_key]).get(cache_key)
+    if stored_translation:
+        return stored_translation
+
+    if use_memory:
+        match = _translation_memory.lookup(text)
+        if match:
+            return match
+
+    return _translation_flight.do(cache_key, _fetch_translation, text, cache_key)
+
+
+def _hedge_delay(backends):
+    """Seconds to wait for the first backend before hedging, or None when hedging is off."""
+    percentile = getattr(app_config, 'LIBRETRANSLATE_HEDGE_PERCENTILE', 0)
+    if not percentile or len(backends.backends) < 2:
+        return None
+    delay = backends.latency_percentile(percentile)
+    if delay is None:
+        delay = getattr(app_config, 'LIBRETRANSLATE_HEDGE_DELAY_SECONDS', 1)
+    return max(HEDGE_MIN_DELAY_SECONDS, delay)
+
+
+def _request_libretranslate_hedged(text):
+    """Translate ``text``, sending it to a second backend too if the first is slow to answer."""
+    delay = _hedge_delay(_get_libretranslate_pool())
+    if delay is None:
+        return _request_libretranslate(text)
+    tried = set()
+    # The hedge is itself the retry, so it makes one attempt and never sleeps in backoff.
+    return _translation_hedger.run(
+        lambda: _request_libretranslate(text, tried=tried),
+        delay,
+        hedge_call=lambda: _request_libretranslate(text, tried=tried, attempts=1),
+    )
+
+
+def _fetch_translation(text, cache_key):
+    translated = _request_libretranslate_hedged(text)
+    if not isinstance(translated, str):
+        logger.error("LibreTranslate parse error: expected a string translation")
+        raise RuntimeError('Translation service returned an invalid response')
+    _translation_cache.set(cache_key, translated)
+    _translation_memory.add(text, translated)
+    _persist_translations({cache_key: translated})
+    return translated
+
+
+def _translate_chunk(chunk):
+    """Translate a list of lines in one upstream call, splitting it on failure.
+
+    Returns ``{line: translation or exception}``. A rejected (4xx other than
+    429) or malformed response is retried as two halves, down to single
+    lines, so one bad line only fails itself. An unreachable, failing (5xx)
+    or rate-limiting (429) upstream fails the whole chunk at once, since
+    smaller requests would not fare any better.
+    """
+    try:
+        translated = _request_libretranslate(chunk, retry_http_errors=False)
+        if not isinstance(translated, list) or len(translated) != len(chunk):
+            raise RuntimeError('Translation service returned an invalid response')
+    except ConnectionError as exc:
+        return {line: exc for line in chunk}
+    except RuntimeError as exc:
+        if len(chunk) == 1:
+            return {chunk[0]: exc}
+        middle = len(chunk) // 2
+        results = _translate_chunk(chunk[:middle])
+        results.update(_translate_chunk(chunk[middle:]))
+        return results
+
+    results = {}
+    for line, translation in zip(chunk, translated):
+        if isinstance(translation, str) and translation:
+            results[line] = translation
+        else:
+            results[line] = RuntimeError('Translation service returned an empty translation')
+    return results
+
+
+def translate_many_with_libretranslate(texts, use_memory=False):
+    """Translate many lines using LibreTranslate's array input.
+
+    Returns a list aligned with ``texts`` holding each translation, or the
+    exception that line failed with. See ``iter_translations``.
+    """
+    resolved = dict(iter_translations(texts, use_memory, TRANSLATION_BATCH_CONCURRENCY))
+    return [resolved[_translation_cache_key(text)] for text in texts]
+
+
+def iter_translations(texts, use_memory=False, concurrency=TRANSLATION_BATCH_CONCURRENCY):
+    """Yield ``(cache_key, translation or exception)`` per distinct line as it resolves.
+
+    Cache and store hits come first, then upstream results chunk by chunk
+    as they complete. Duplicate lines are resolved once; the remaining
+    misses go out in chunks of ``TRANSLATION_BULK_CHUNK_SIZE`` lines, run
+    concurrently. Lines another request is already fetching when their
+    chunk starts are waited for rather than sent again. With ``use_memory``, close translation-memory
+    matches are yielded as ``TranslationMatch`` instead of being sent
+    upstream. At most ``concurrency`` chunks are in flight at once. Closing
+    the generator early cancels chunks not yet started.
+    """
+    misses = {}
+    seen = set()
+    for text in texts:
+        cache_key = _translation_cache_key(text)
+        if cache_key in seen:
+            continue
+        seen.add(cache_key)
+        cached_translation = _translation_cache.get(cache_key)
+        if cached_translation:
+            yield cache_key, cached_translation
+        else:
+            misses[cache_key] = text.strip()
+
+    for cache_key, translation in _load_stored_translations(list(misses)).items():
+        del misses[cache_key]
+        yield cache_key, translation
+
+    if use_memory:
+        for cache_key, text in list(misses.items()):
+            match = _translation_memory.lookup(text)
+            if match:
+                del misses[cache_key]
+                yield cache_key, match
+
+    miss_lines = list(misses.values())
+    chunks = [
+        miss_lines[start:start + TRANSLATION_BULK_CHUNK_SIZE]
+        for start in range(0, len(miss_lines), TRANSLATION_BULK_CHUNK_SIZE)
+    ]
+    if not chunks:
+        return
+    executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks))))
+    futures = [executor.submit(_translate_shared_chunk, chunk) for chunk in chunks]
+    try:
+        for future in as_completed(futures):
+            for line, result in future.result().items():
+                yield _translation_cache_key(line), result
+    finally:
+        # Queued chunks hold no single-flight keys yet, so cancelling them
+        # affects no other request. Running chunks finish on their own and
+        # still fill the cache.
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _translate_shared_chunk(chunk):
+    """Translate a chunk, sharing its lines with concurrent requests through single-flight.
+
+    Keys are claimed only now that the chunk is running, so other requests
+    never wait on a chunk still queued behind a long batch or job. Lines
+    another request is already fetching are waited for, not sent again.
+    """
+    led_calls = {}
+    followed_calls = {}
+    for line in chunk:
+        cache_key = _translation_cache_key(line)
+        call, is_leader = _translation_flight.begin(cache_key)
+        if is_leader:
+            led_calls[cache_key] = call
+        else:
+            followed_calls[line] = call
+
+    led_lines = [line for line in chunk if _translation_cache_key(line) in led_calls]
+    results = _translate_led_chunk(led_lines, led_calls) if led_lines else {}
+    for line, call in followed_calls.items():
+        try:
+            results[line] = call.wait()
+        except Exception as exc:
+            results[line] = exc
+    return results
+
+
+def _translate_led_chunk(chunk, led_calls):
+    """Translate a chunk, cache the results and hand them to any waiting requests."""
+    results = {}
+    try:
+        results = _translate_chunk(chunk)
+        fetched = {}
+        for line, result in results.items():
+            if not isinstance(result, Exception):
+                cache_key = _translation_cache_key(line)
+                _translation_cache.set(cache_key, result)
+                _translation_memory.add(line, result)
+                fetched[cache_key] = result
+        _persist_translations(fetched)
+    finally:
+        # Always release waiters, even if the chunk raised unexpectedly.
+        for line in chunk:
+            cache_key = _translation_cache_key(line)
+            result = results.get(line)
+            if result is None:
+                result = ConnectionError('Translation service is temporarily unavailable')
+                results[line] = result
+            if isinstance(result, Exception):
+                _translation_flight.finish(cache_key, led_calls[cache_key], error=result)
+            else:
+                _translation_flight.finish(cache_key, led_calls[cache_key], result=result)
+    return results
+
+
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+')
+
+
+def segment_document_line(line):
+    """Split a document line into sentences of at most ``MAX_TEXT_LENGTH`` characters.
+
+    Over-long sentences are cut at the last space before the limit, or hard
+    at the limit when there is none.
+    """
+    segments = []
+    for sentence in _SENTENCE_END.split(line.strip()):
+        while len(sentence) > MAX_TEXT_LENGTH:
+            cut = sentence.rfind(' ', 0, MAX_TEXT_LENGTH + 1)
+            if cut <= 0:
+                cut = MAX_TEXT_LENGTH
+            segments.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            segments.append(sentence)
+    return segments
+
+
+def _run_translation_job(job):
+    """Translate a job's lines sentence by sentence, reporting each line once all its sentences resolve."""
+    segments_by_line = [segment_document_line(line) for line in job.lines]
+    lines_by_key = {}
+    pending_counts = []
+    sentences = []
+    for index, segments in enumerate(segments_by_line):
+        pending_counts.append(len(segments))
+        if not segments:
+            job.add_result(index, {'success': True, 'translation': ''})
+        for segment in segments:
+            cache_key = _translation_cache_key(segment)
+            if cache_key not in lines_by_key:
+                lines_by_key[cache_key] = []
+                sentences.append(segment)
+            lines_by_key[cache_key].append(index)
+
+    resolved = {}
+    translations = iter_translations(
+        sentences,
+        use_memory=True,
+        concurrency=getattr(app_config, 'TRANSLATION_JOB_CONCURRENCY', 2),
+    )
+    try:
+        for cache_key, translation in translations:
+            if job.cancel_requested:
+                return
+            resolved[cache_key] = translation
+            # A line repeating a sentence is listed once per occurrence.
+            for index in lines_by_key.get(cache_key, ()):
+                pending_counts[index] -= 1
+                if pending_counts[index] == 0:
+                    job.add_result(index, _job_line_result(segments_by_line[index], resolved))
+    finally:
+        translations.close()
+
+
+def _job_line_result(segments, resolved):
+    parts = []
+    for segment in segments:
+        translation = resolved[_translation_cache_key(segment)]
+        if isinstance(translation, TranslationMatch):
+            translation = translation.translation
+        if isinstance(translation, Exception):
+            return _batch_line_result(translation)
+        parts.append(translation)
+    return {'success': True, 'translation': ' '.join(parts)}
+
+
+_translation_jobs = TranslationJobManager(
+    _run_translation_job,
+    max_workers=getattr(app_config, 'TRANSLATION_JOB_WORKERS', 2),
+    result_ttl_seconds=getattr(app_config, 'TRANSLATION_JOB_RESULT_TTL_SECONDS', 60 * 60),
+)
+atexit.register(_translation_jobs.close)
+
+
 def _validate_text_input(text):
     if not isinstance(text, str):
         return 'Text must be a string'
@@ -158,47 +760,426 @@ def _validate_text_input(text):
     return None
 
 
-def synthesize_speech_with_local_tts(text):
-    """Synthesize Finnish speech using a configured local TTS provider."""
+def _get_audio_store():
+    cache_dir = _resolve_local_path(getattr(app_config, 'TTS_AUDIO_CACHE_DIR', ''))
+    if not cache_dir:
+        return None
+
+    store = _audio_stores.get(cache_dir)
+    if store is not None:
+        return store
+
+    with _audio_store_lock:
+        if cache_dir not in _audio_stores:
+            max_bytes = getattr(app_config, 'TTS_AUDIO_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+            try:
+                _audio_stores[cache_dir] = AudioStore(cache_dir, max_bytes)
+            except OSError as exc:
+                logger.error('Audio cache directory is unusable: %s', str(exc))
+                return None
+    return _audio_stores[cache_dir]
+
+
+def _default_piper_voice():
+    return voice_name(getattr(app_config, 'PIPER_MODEL_PATH', ''))
+
+
+def _tts_voice(tts_provider, voice=None):
+    if voice:
+        return voice
+    if tts_provider == 'piper':
+        return _default_piper_voice()
+    return getattr(app_config, 'LOCAL_TTS_VOICE', 'fi_FI-harri-medium')
+
+
+def _validate_voice(tts_provider, voice):
+    if voice is None or voice == '':
+        return None
+    if not isinstance(voice, str) or not re.fullmatch(r'[A-Za-z0-9_.:-]{1,100}', voice):
+        return 'Voice must be a voice name'
+    if tts_provider == 'piper' and get_voice_registry().get_voice(voice) is None:
+        return 'Unknown voice'
+    return None
+
+
+def _speech_variant(rate=1.0, audio_format='wav'):
+    """Tag for audio derived from the base rendering, or '' for the base itself."""
+    if audio_format != 'wav':
+        return f'enc={audio_format}' if rate == 1.0 else f'rate={rate:g};enc={audio_format}'
+    return f'rate={rate:g}' if rate != 1.0 else ''
+
+
+def _variant_store_key(digest, variant=''):
+    """Disk cache key of the ``variant`` derived from the clip stored at ``digest``."""
+    return audio_key('variant', variant, digest) if variant else digest
+
+
+def _speech_cache_keys(tts_provider, text, variant='', voice=None):
+    """Memory and disk cache keys; ``variant`` tags derived audio such as rate changes."""
+    suffix = f'|{variant}' if variant else ''
+    tts_voice = _tts_voice(tts_provider, voice)
+    return (
+        f'{tts_provider}:{tts_voice}:{text.strip()}{suffix}',
+        _variant_store_key(audio_key(tts_provider, tts_voice, text.strip()), variant),
+    )
+
+
+def _get_cached_speech(tts_provider, text, variant='', voice=None):
+    cache_key, store_key = _speech_cache_keys(tts_provider, text, variant, voice)
+    cached_tts = _tts_cache.get(cache_key)
+    if cached_tts:
+        return cached_tts
+
+    audio_store = _get_audio_store()
+    if not audio_store:
+        return None
+    stored_tts = audio_store.get(store_key)
+    if stored_tts:
+        _tts_cache.set(cache_key, stored_tts)
+    return stored_tts
+
+
+def _store_speech(tts_provider, text, result, variant='', voice=None):
+    cache_key, store_key = _speech_cache_keys(tts_provider, text, variant, voice)
+    audio_store = _get_audio_store()
+    if audio_store:
+        audio_store.set(store_key, *result)
+    _tts_cache.set(cache_key, result)
+
+
+def _synthesize_with_provider(tts_provider, text, voice=None):
+    if tts_provider == 'piper':
+        return synthesize_speech_with_piper(text, voice)
+    return synthesize_speech_with_opentts(text, voice)
+
+
+def _schedule_synthesis(tts_provider, text, priority=PRIORITY_INTERACTIVE, voice=None):
+    return _synthesis_scheduler.run(_synthesize_with_provider, tts_provider, text, voice, priority=priority)
+
+
+def synthesize_speech_with_local_tts(
+    text,
+    priority=PRIORITY_INTERACTIVE,
+    rate=1.0,
+    voice=None,
+    audio_format='wav',
+):
+    """Synthesize Finnish speech using a configured local TTS provider.
+
+    Rates other than 1.0 are derived from the cached base rendering by
+    time-stretching its PCM, so slow playback never needs another synthesis.
+    Compact ``audio_format`` encodings are likewise derived and cached once.
+    """
     tts_enabled = getattr(app_config, 'LOCAL_TTS_ENABLED', False)
     tts_provider = getattr(app_config, 'LOCAL_TTS_PROVIDER', 'piper').strip().lower()
-    cache_key = f'{tts_provider}:{text.strip()}'
 
     if not tts_enabled:
         raise ConnectionError('Local TTS is not enabled')
 
-    cached_tts = _cache_get(_tts_cache, cache_key, TTS_CACHE_TTL_SECONDS)
+    if audio_format != 'wav':
+        return _speech_encoded(tts_provider, text, priority, rate, voice, audio_format)
+    if rate != 1.0:
+        return _speech_at_rate(tts_provider, text, priority, rate, voice)
+
+    cached_tts = _get_cached_speech(tts_provider, text, voice=voice)
     if cached_tts:
         return cached_tts
 
-    if tts_provider == 'piper':
-        result = synthesize_speech_with_piper(text)
-    else:
-        result = synthesize_speech_with_opentts(text)
-
-    _cache_set(
-        _tts_cache,
-        cache_key,
-        result,
-        TTS_CACHE_TTL_SECONDS,
-        TTS_CACHE_MAX_SIZE,
+    flight_key = _speech_cache_keys(tts_provider, text, voice=voice)[0]
+    return _tts_flight.do(flight_key, _synthesize_and_store, tts_provider, text, priority, voice)
+
+
+def _synthesize_and_store(tts_provider, text, priority, voice=None):
+    result = _schedule_synthesis(tts_provider, text, priority, voice)
+    _store_speech(tts_provider, text, result, voice=voice)
+    return result
+
+
+def _speech_at_rate(tts_provider, text, priority, rate, voice=None):
+    variant = _speech_variant(rate)
+    cached_tts = _get_cached_speech(tts_provider, text, variant, voice)
+    if cached_tts:
+        return cached_tts
+
+    flight_key = _speech_cache_keys(tts_provider, text, variant, voice)[0]
+    return _tts_flight.do(flight_key, _derive_speech_at_rate, tts_provider, text, priority, rate, voice)
+
+
+def _derive_speech_at_rate(tts_provider, text, priority, rate, voice=None):
+    variant = _speech_variant(rate)
+    audio_bytes, content_type = synthesize_speech_with_local_tts(text, priority, voice=voice)
+    try:
+        result = change_wav_rate(audio_bytes, rate), content_type
+    except ValueError as exc:
+        # Providers that return compressed audio are played back at normal speed.
+        logger.warning('Cannot change TTS rate: %s', str(exc))
+        return audio_bytes, content_type
+
+    _store_speech(tts_provider, text, result, variant, voice)
+    return result
+
+
+def _speech_encoded(tts_provider, text, priority, rate, voice, audio_format):
+    variant = _speech_variant(rate, audio_format)
+    cached_tts = _get_cached_speech(tts_provider, text, variant, voice)
+    if cached_tts:
+        return cached_tts
+
+    flight_key = _speech_cache_keys(tts_provider, text, variant, voice)[0]
+    return _tts_flight.do(
+        flight_key, _derive_speech_encoded, tts_provider, text, priority, rate, voice, audio_format, variant
+    )
+
+
+def _derive_speech_encoded(tts_provider, text, priority, rate, voice, audio_format, variant):
+    audio_bytes, content_type = synthesize_speech_with_local_tts(text, priority, rate, voice)
+    try:
+        result = encode_audio(audio_bytes, audio_format), 'audio/wav'
+    except ValueError as exc:
+        logger.warning('Cannot encode TTS audio as %s: %s', audio_format, str(exc))
+        return audio_bytes, content_type
+
+    _store_speech(tts_provider, text, result, variant, voice)
+    return result
+
+
+def _stored_speech_variant(audio_store, digest, rate=1.0, audio_format='wav'):
+    """The stored clip at ``digest`` at ``rate`` in ``audio_format``, or None when it is not stored.
+
+    Like the text-addressed path, each derived variant is stored under its
+    variant key, so it is only computed once.
+    """
+    variant = _speech_variant(rate, audio_format)
+    if not variant:
+        return audio_store.get(digest)
+
+    store_key = _variant_store_key(digest, variant)
+    cached_tts = _tts_cache.get(store_key)
+    if cached_tts:
+        return cached_tts
+    stored_tts = audio_store.get(store_key)
+    if stored_tts:
+        _tts_cache.set(store_key, stored_tts)
+        return stored_tts
+
+    return _tts_flight.do(
+        store_key, _derive_stored_speech_variant, audio_store, digest, rate, audio_format, store_key
     )
+
+
+def _derive_stored_speech_variant(audio_store, digest, rate, audio_format, store_key):
+    if audio_format != 'wav':
+        source = _stored_speech_variant(audio_store, digest, rate)
+    else:
+        source = audio_store.get(digest)
+    if not source:
+        return None
+
+    audio_bytes, content_type = source
+    try:
+        if audio_format != 'wav':
+            result = encode_audio(audio_bytes, audio_format), 'audio/wav'
+        else:
+            result = change_wav_rate(audio_bytes, rate), content_type
+    except ValueError as exc:
+        logger.warning('Cannot derive stored TTS audio: %s', str(exc))
+        return source
+
+    audio_store.set(store_key, *result)
+    _tts_cache.set(store_key, result)
     return result
 
 
-def synthesize_speech_with_piper(text):
+def _negotiate_audio_format(requested):
+    """Return ``(audio_format, error)`` from an explicit format or the Accept header.
+
+    Clients can list codecs as ``Accept: audio/wav; codec=ulaw, audio/wav;q=0.5``.
+    """
+    if requested:
+        if requested not in AUDIO_FORMATS:
+            return None, f'Format must be one of: {", ".join(AUDIO_FORMATS)}'
+        return requested, None
+
+    offers = []
+    for position, entry in enumerate(request.headers.get('Accept', '').split(',')):
+        media_type, *params = [part.strip() for part in entry.split(';')]
+        if media_type.lower() not in ('audio/wav', 'audio/wave', 'audio/x-wav', 'audio/*', '*/*'):
+            continue
+        quality = 1.0
+        codec = 'wav'
+        for param in params:
+            name, _, value = param.partition('=')
+            name = name.strip().lower()
+            value = value.strip().strip('"').lower()
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+            elif name in ('codec', 'codecs'):
+                codec = value
+        if codec in AUDIO_FORMATS and quality > 0 and media_type not in ('audio/*', '*/*'):
+            offers.append((-quality, position, codec))
+
+    if offers:
+        return min(offers)[2], None
+    return getattr(app_config, 'TTS_DEFAULT_AUDIO_FORMAT', 'wav'), None
+
+
+def _parse_tts_rate(value):
+    """Return ``(rate, error)`` for a client-supplied playback rate."""
+    if value is None or value == '':
+        return 1.0, None
+    try:
+        rate = round(float(value), 2)
+    except (TypeError, ValueError):
+        return None, 'Rate must be a number'
+    if not MIN_RATE <= rate <= MAX_RATE:
+        return None, f'Rate must be between {MIN_RATE:g} and {MAX_RATE:g}'
+    return rate, None
+
+
+def _split_speech_segments(text):
+    """Split text at sentence ends, and long sentences at commas, for streaming."""
+    segments = []
+    for sentence in re.split(r'(?<=[.!?;:])\s+', text.strip()):
+        if len(sentence) <= TTS_STREAM_SEGMENT_CHARS:
+            segments.append(sentence)
+            continue
+        current = ''
+        for clause in re.split(r'(?<=,)\s+', sentence):
+            if current and len(current) + len(clause) + 1 > TTS_STREAM_SEGMENT_CHARS:
+                segments.append(current)
+                current = clause
+            else:
+                current = f'{current} {clause}' if current else clause
+        if current:
+            segments.append(current)
+    return [segment for segment in segments if segment]
+
+
+def stream_speech_with_local_tts(text, voice=None):
+    """Synthesize speech segment by segment and return ``(chunks, mimetype)``.
+
+    The first segment is synthesized before returning so provider errors still
+    surface as exceptions. The WAV header and first PCM chunk are then yielded
+    immediately, followed by each later segment as it is produced. Once the
+    stream completes the whole clip is stored in the TTS caches.
+    """
+    tts_enabled = getattr(app_config, 'LOCAL_TTS_ENABLED', False)
+    tts_provider = getattr(app_config, 'LOCAL_TTS_PROVIDER', 'piper').strip().lower()
+
+    if not tts_enabled:
+        raise ConnectionError('Local TTS is not enabled')
+
+    cached_tts = _get_cached_speech(tts_provider, text, voice=voice)
+    if cached_tts:
+        return iter([cached_tts[0]]), cached_tts[1]
+
+    segments = _split_speech_segments(text)
+    if len(segments) < 2:
+        audio_bytes, content_type = synthesize_speech_with_local_tts(text, voice=voice)
+        return iter([audio_bytes]), content_type
+
+    first_audio, first_content_type = _schedule_synthesis(tts_provider, segments[0], voice=voice)
+    try:
+        wav_format, first_pcm = parse_wav(first_audio)
+    except (ValueError, struct.error):
+        # Not PCM WAV (e.g. OpenTTS returning MP3); fall back to one full clip.
+        audio_bytes, content_type = synthesize_speech_with_local_tts(text, voice=voice)
+        return iter([audio_bytes]), content_type
+
+    def generate():
+        pcm_parts = [first_pcm]
+        yield wav_header(wav_format) + first_pcm
+        for segment in segments[1:]:
+            try:
+                segment_format, pcm = parse_wav(_schedule_synthesis(tts_provider, segment, voice=voice)[0])
+            except Exception as exc:
+                logger.error('Streaming TTS stopped early: %s', str(exc))
+                return
+            if segment_format != wav_format:
+                logger.error('Streaming TTS stopped early: segment audio format changed')
+                return
+            pcm_parts.append(pcm)
+            yield pcm
+        _store_speech(
+            tts_provider,
+            text,
+            (build_wav(wav_format, b''.join(pcm_parts)), first_content_type),
+            voice=voice,
+        )
+
+    return generate(), first_content_type
+
+
+def _piper_command(piper_model, piper_config=''):
     piper_binary = _resolve_local_path(getattr(app_config, 'PIPER_BINARY_PATH', ''))
-    piper_model = _resolve_local_path(getattr(app_config, 'PIPER_MODEL_PATH', ''))
-    piper_config = _resolve_local_path(getattr(app_config, 'PIPER_CONFIG_PATH', ''))
 
     if not piper_binary or not os.path.isfile(piper_binary):
         raise ConnectionError('Piper binary is unavailable')
     if not piper_model or not os.path.isfile(piper_model):
         raise ConnectionError('Piper model is unavailable')
 
-    command = [piper_binary, '--model', piper_model, '--output_file', '-']
+    command = [piper_binary, '--model', piper_model]
     if piper_config and os.path.isfile(piper_config):
         command.extend(['--config', piper_config])
+    return command
+
+
+def _create_piper_pool(voice):
+    command = _piper_command(voice['model'], voice['config']) + ['--json-input']
+    try:
+        return PiperPool(
+            command,
+            size=getattr(app_config, 'PIPER_POOL_SIZE', 2),
+            timeout=PIPER_TIMEOUT_SECONDS,
+            health_interval=PIPER_HEALTH_CHECK_INTERVAL_SECONDS,
+        )
+    except OSError as exc:
+        logger.error('Piper pool for %s failed to start: %s', voice['name'], str(exc))
+        raise ConnectionError('Piper TTS service is unavailable') from exc
+
+
+def get_voice_registry():
+    global _voice_registry
+    if _voice_registry is not None:
+        return _voice_registry
+
+    with _voice_registry_lock:
+        if _voice_registry is None:
+            _voice_registry = VoiceRegistry(
+                _resolve_local_path(getattr(app_config, 'PIPER_VOICES_DIR', 'vendor/piper/voices')),
+                _create_piper_pool,
+                max_resident=getattr(app_config, 'PIPER_MAX_RESIDENT_VOICES', 2),
+                extra_models=[_resolve_local_path(getattr(app_config, 'PIPER_MODEL_PATH', ''))],
+            )
+    return _voice_registry
+
+
+@atexit.register
+def _shutdown_voice_registry():
+    if _voice_registry is not None:
+        _voice_registry.close()
+
+
+def synthesize_speech_with_piper(text, voice=None):
+    if voice and voice != _default_piper_voice():
+        voice_entry = get_voice_registry().get_voice(voice)
+        if voice_entry is None:
+            raise LookupError(f'Unknown voice: {voice}')
+        piper_model, piper_config = voice_entry['model'], voice_entry['config']
+    else:
+        voice = _default_piper_voice()
+        piper_model = _resolve_local_path(getattr(app_config, 'PIPER_MODEL_PATH', ''))
+        piper_config = _resolve_local_path(getattr(app_config, 'PIPER_CONFIG_PATH', ''))
+
+    if getattr(app_config, 'PIPER_POOL_SIZE', 2) > 0:
+        if get_voice_registry().get_voice(voice) is None:
+            raise ConnectionError('Piper model is unavailable')
+        return get_voice_registry().synthesize(voice, text)
+
+    command = _piper_command(piper_model, piper_config) + ['--output_file', '-']
 
     try:
         result = subprocess.run(
@@ -207,7 +1188,7 @@ def synthesize_speech_with_piper(text):
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             check=False,
-            timeout=20,
+            timeout=PIPER_TIMEOUT_SECONDS,
         )
     except (FileNotFoundError, subprocess.SubprocessError) as exc:
         logger.error('Piper execution failed: %s', str(exc))
@@ -224,9 +1205,9 @@ def synthesize_speech_with_piper(text):
     return result.stdout, 'audio/wav'
 
 
-def synthesize_speech_with_opentts(text):
+def synthesize_speech_with_opentts(text, voice=None):
     tts_url = getattr(app_config, 'LOCAL_TTS_URL', '').strip()
-    tts_voice = getattr(app_config, 'LOCAL_TTS_VOICE', 'fi_FI-harri-medium')
+    tts_voice = voice or getattr(app_config, 'LOCAL_TTS_VOICE', 'fi_FI-harri-medium')
 
     if not tts_url:
         raise ConnectionError('Local TTS URL is not configured')
@@ -236,25 +1217,37 @@ def synthesize_speech_with_opentts(text):
         'voice': tts_voice
     }
 
+    breaker = _circuit_breakers['opentts']
+    retry_budget = _retry_budgets['opentts']
+    retry_budget.record_call()
     last_error = None
     for attempt in range(1, TTS_RETRIES + 1):
+        breaker.before_call()
         try:
-            response = requests.get(tts_url, params=params, timeout=15)
+            response = _http_sessions.get('opentts').get(
+                tts_url,
+                params=params,
+                timeout=_upstream_timeout('LOCAL_TTS_READ_TIMEOUT_SECONDS', 15),
+            )
             response.raise_for_status()
-            if not response.content:
-                raise ValueError('TTS service returned empty audio')
-            content_type = response.headers.get('Content-Type', 'audio/wav')
-            return response.content, content_type
         except RequestException as exc:
+            if _is_upstream_failure(exc):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
             last_error = exc
-            if attempt < TTS_RETRIES:
-                time.sleep(TTS_RETRY_DELAY_SECONDS)
+            if attempt < TTS_RETRIES and retry_budget.try_retry():
+                time.sleep(backoff_delay(attempt, TTS_RETRY_DELAY_SECONDS, UPSTREAM_RETRY_MAX_DELAY_SECONDS))
                 continue
             logger.error('Local TTS network error after %s attempts: %s', attempt, str(exc))
             raise ConnectionError('Local TTS service is unavailable') from exc
-        except ValueError as exc:
-            logger.error('Local TTS parse error: %s', str(exc))
-            raise RuntimeError('Local TTS service returned invalid audio') from exc
+
+        breaker.record_success()
+        if not response.content:
+            logger.error('Local TTS parse error: TTS service returned empty audio')
+            raise RuntimeError('Local TTS service returned invalid audio')
+        content_type = response.headers.get('Content-Type', 'audio/wav')
+        return response.content, content_type
 
     raise ConnectionError('Local TTS service is unavailable') from last_error
 
@@ -263,6 +1256,16 @@ def synthesize_speech_with_opentts(text):
 def index():
     return render_template('index.html')
 
+def _translation_memory_result(match):
+    return {
+        'success': True,
+        'translation': match.translation,
+        'service': TRANSLATION_MEMORY_SERVICE,
+        'similarity': match.similarity,
+        'matchedText': match.source_text,
+    }
+
+
 @app.route('/api/translate', methods=['POST'])
 def translate():
     try:
@@ -272,47 +1275,211 @@ def translate():
         if validation_error:
             return _json_error(validation_error, 400)
         text = text.strip()
-        translation = translate_with_libretranslate(text)
+        lesson_translation = lookup_lesson_phrase(text)
+        if lesson_translation:
+            return jsonify({'success': True, 'translation': lesson_translation, 'service': LESSON_BANK_SERVICE})
+        translation = translate_with_libretranslate(text, use_memory=True)
+        if isinstance(translation, TranslationMatch):
+            return jsonify(_translation_memory_result(translation))
         return jsonify({'success': True, 'translation': translation, 'service': 'libretranslate'})
     except ConnectionError as exc:
         logger.error("Translation error: %s", str(exc))
-        return _json_error('Translation service is temporarily unavailable', 503)
+        return _unavailable_error('Translation service is temporarily unavailable', exc)
     except Exception as exc:
         logger.error("Unexpected translation error: %s", str(exc))
         return _json_error('Translation failed. Please try again.', 500)
 
+def _validate_batch_lines(lines):
+    if not isinstance(lines, list):
+        return 'Lines must be an array of strings'
+    if not lines:
+        return 'No lines provided'
+    if len(lines) > MAX_BATCH_LINES:
+        return f'Too many lines (max {MAX_BATCH_LINES} per request)'
+    return None
+
+
+def _batch_line_result(translation):
+    """Per-line batch result for a translation, ``TranslationMatch`` or exception."""
+    if isinstance(translation, TranslationMatch):
+        return _translation_memory_result(translation)
+    if isinstance(translation, ConnectionError):
+        return {'success': False, 'translation': '', 'error': 'Service unavailable'}
+    if isinstance(translation, Exception):
+        return {'success': False, 'translation': '', 'error': 'Translation failed'}
+    return {'success': True, 'translation': translation, 'service': 'libretranslate'}
+
+
+def _resolve_local_batch_lines(lines):
+    """Answer invalid and lesson bank lines; return ``(results, indexes left to translate)``."""
+    results = [None] * len(lines)
+    pending_indexes = []
+    for index, line in enumerate(lines):
+        validation_error = _validate_text_input(line)
+        if validation_error:
+            results[index] = {'success': False, 'translation': '', 'error': validation_error}
+            continue
+        lesson_translation = lookup_lesson_phrase(line)
+        if lesson_translation:
+            results[index] = {'success': True, 'translation': lesson_translation, 'service': LESSON_BANK_SERVICE}
+            continue
+        pending_indexes.append(index)
+    return results, pending_indexes
+
+
 @app.route('/api/translate-batch', methods=['POST'])
 def translate_batch():
     try:
         data = request.get_json(silent=True) or {}
         lines = data.get('lines', [])
-        if not isinstance(lines, list):
-            return _json_error('Lines must be an array of strings', 400)
-        if not lines:
-            return _json_error('No lines provided', 400)
-        if len(lines) > MAX_BATCH_LINES:
-            return _json_error(f'Too many lines (max {MAX_BATCH_LINES} per request)', 400)
+        validation_error = _validate_batch_lines(lines)
+        if validation_error:
+            return _json_error(validation_error, 400)
 
-        results = []
-        for line in lines:
-            validation_error = _validate_text_input(line)
-            if validation_error:
-                results.append({'success': False, 'translation': '', 'error': validation_error})
-                continue
-            try:
-                line = line.strip()
-                translation = translate_with_libretranslate(line)
-                results.append({'success': True, 'translation': translation, 'service': 'libretranslate'})
-            except ConnectionError:
-                results.append({'success': False, 'translation': '', 'error': 'Service unavailable'})
-            except Exception:
-                results.append({'success': False, 'translation': '', 'error': 'Translation failed'})
+        results, valid_indexes = _resolve_local_batch_lines(lines)
+        if valid_indexes:
+            translations = translate_many_with_libretranslate(
+                [lines[index].strip() for index in valid_indexes],
+                use_memory=True,
+            )
+            for index, translation in zip(valid_indexes, translations):
+                results[index] = _batch_line_result(translation)
         return jsonify({'success': True, 'results': results})
     except Exception as exc:
         logger.error("Batch translation error: %s", str(exc))
         return _json_error('Batch translation failed. Please try again.', 500)
 
 
+@app.route('/api/translate-stream', methods=['POST'])
+def translate_stream():
+    """Stream batch results as NDJSON, one ``{"index": ..., ...}`` line per input line.
+
+    Lines are emitted as soon as they resolve, so cached lines arrive first
+    and out of order; a final ``{"done": true, ...}`` line closes the
+    stream. Disconnecting cancels translation chunks not yet started.
+    """
+    data = request.get_json(silent=True) or {}
+    lines = data.get('lines', [])
+    validation_error = _validate_batch_lines(lines)
+    if validation_error:
+        return _json_error(validation_error, 400)
+
+    results, pending_indexes = _resolve_local_batch_lines(lines)
+    indexes_by_key = {}
+    for index in pending_indexes:
+        indexes_by_key.setdefault(_translation_cache_key(lines[index]), []).append(index)
+
+    def generate():
+        counts = {'translated': 0, 'failed': 0}
+
+        def emit(index, result):
+            counts['translated' if result['success'] else 'failed'] += 1
+            return json.dumps({'index': index, **result}) + '\n'
+
+        for index, result in enumerate(results):
+            if result is not None:
+                yield emit(index, result)
+
+        translations = iter_translations([lines[index].strip() for index in pending_indexes], use_memory=True)
+        try:
+            for cache_key, translation in translations:
+                result = _batch_line_result(translation)
+                for index in indexes_by_key.get(cache_key, ()):
+                    yield emit(index, result)
+        except Exception as exc:
+            logger.error("Streaming translation error: %s", str(exc))
+            yield json.dumps({'done': True, 'error': 'Batch translation failed. Please try again.', **counts}) + '\n'
+            return
+        finally:
+            translations.close()
+        yield json.dumps({'done': True, **counts}) + '\n'
+
+    return Response(
+        generate(),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+def _document_lines(data):
+    """Return ``(lines, error)`` from a job request's ``text`` or ``lines``."""
+    if 'lines' in data:
+        lines = data['lines']
+        if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+            return None, 'Lines must be an array of strings'
+    else:
+        text = data.get('text', '')
+        if not isinstance(text, str):
+            return None, 'Text must be a string'
+        lines = text.splitlines()
+    if not any(line.strip() for line in lines):
+        return None, 'No text provided'
+    if len(lines) > MAX_JOB_LINES:
+        return None, f'Document is too long (max {MAX_JOB_LINES} lines)'
+    if sum(len(line) for line in lines) > MAX_JOB_CHARACTERS:
+        return None, f'Document is too long (max {MAX_JOB_CHARACTERS} characters)'
+    return lines, None
+
+
+@app.route('/api/translate-jobs', methods=['POST'])
+def create_translation_job():
+    data = request.get_json(silent=True) or {}
+    lines, validation_error = _document_lines(data)
+    if validation_error:
+        return _json_error(validation_error, 400)
+    try:
+        job = _translation_jobs.submit(lines)
+    except OverflowError:
+        response, status_code = _json_error('Too many translation jobs are running. Please try again shortly.', 503)
+        response.headers['Retry-After'] = '30'
+        return response, status_code
+
+    response = jsonify({'success': True, 'job': job.summary()})
+    response.headers['Location'] = f'/api/translate-jobs/{job.id}'
+    return response, 202
+
+
+@app.route('/api/translate-jobs/<job_id>', methods=['GET'])
+def get_translation_job(job_id):
+    job = _translation_jobs.get(job_id)
+    if job is None:
+        return _json_error('Translation job not found', 404)
+    return jsonify({'success': True, 'job': job.summary(include_results=True)})
+
+
+@app.route('/api/translate-jobs/<job_id>', methods=['DELETE'])
+def cancel_translation_job(job_id):
+    job = _translation_jobs.cancel(job_id)
+    if job is None:
+        return _json_error('Translation job not found', 404)
+    return jsonify({'success': True, 'job': job.summary()})
+
+
+@app.route('/api/translate-jobs/<job_id>/stream', methods=['GET'])
+def stream_translation_job(job_id):
+    """Stream a job's line results as NDJSON, replaying those already done, then a final summary line."""
+    job = _translation_jobs.get(job_id)
+    if job is None:
+        return _json_error('Translation job not found', 404)
+
+    def generate():
+        cursor = 0
+        while True:
+            events, finished = job.events_since(cursor, TRANSLATION_JOB_STREAM_POLL_SECONDS)
+            for index, result in events:
+                yield json.dumps({'index': index, **result}) + '\n'
+            cursor += len(events)
+            if finished and not events:
+                break
+        yield json.dumps({'done': True, **job.summary()}) + '\n'
+
+    return Response(
+        generate(),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
 @app.route('/api/tts', methods=['POST'])
 def text_to_speech():
     try:
@@ -321,53 +1488,292 @@ def text_to_speech():
         validation_error = _validate_text_input(text)
         if validation_error:
             return _json_error(validation_error, 400)
+        rate, rate_error = _parse_tts_rate(data.get('rate'))
+        if rate_error:
+            return _json_error(rate_error, 400)
+        tts_provider = getattr(app_config, 'LOCAL_TTS_PROVIDER', 'piper').strip().lower()
+        voice = data.get('voice') or None
+        voice_error = _validate_voice(tts_provider, voice)
+        if voice_error:
+            return _json_error(voice_error, 400)
+        audio_format, format_error = _negotiate_audio_format(data.get('format') or request.args.get('format'))
+        if format_error:
+            return _json_error(format_error, 400)
+
+        if rate == 1.0 and audio_format == 'wav' and (data.get('stream') or request.args.get('stream') == '1'):
+            chunks, content_type = stream_speech_with_local_tts(text.strip(), voice=voice)
+            return Response(chunks, mimetype=content_type, headers={'Vary': 'Accept'})
 
-        audio_bytes, content_type = synthesize_speech_with_local_tts(text.strip())
-        return Response(audio_bytes, mimetype=content_type)
+        audio_bytes, content_type = synthesize_speech_with_local_tts(
+            text.strip(),
+            rate=rate,
+            voice=voice,
+            audio_format=audio_format,
+        )
+        return Response(audio_bytes, mimetype=content_type, headers={'Vary': 'Accept'})
+    except SynthesisQueueFull as exc:
+        logger.warning('TTS request rejected: %s', str(exc))
+        return _tts_busy_error(exc)
     except ConnectionError as exc:
         logger.error('TTS error: %s', str(exc))
-        return _json_error('Local TTS is unavailable', 503)
+        return _unavailable_error('Local TTS is unavailable', exc)
     except Exception as exc:
         logger.error('Unexpected TTS error: %s', str(exc))
         return _json_error('TTS failed. Please try again.', 500)
 
 
-@app.route('/api/lessons', methods=['GET'])
-def list_lessons():
-    level = request.args.get('level', '').strip()
-    lessons = get_lessons(level if level else None)
-    summaries = [
-        {
-            'id': lesson['id'],
-            'code': lesson['code'],
-            'level': lesson['level'],
-            'title': lesson['title'],
-            'theme': lesson['theme'],
-            'grammar': lesson['grammar'],
-            'objectives': lesson['objectives'],
-            'skills': lesson['skills'],
-            'itemCount': len(lesson['items']),
-        }
-        for lesson in lessons
-    ]
+@app.route('/api/tts/info', methods=['GET'])
+def text_to_speech_info():
+    tts_provider = getattr(app_config, 'LOCAL_TTS_PROVIDER', 'piper').strip().lower()
+    return jsonify({
+        'success': True,
+        'enabled': bool(getattr(app_config, 'LOCAL_TTS_ENABLED', False)),
+        'provider': tts_provider,
+        'voice': _tts_voice(tts_provider),
+        'formats': list(AUDIO_FORMATS),
+        'defaultFormat': getattr(app_config, 'TTS_DEFAULT_AUDIO_FORMAT', 'wav'),
+    })
+
+
+@app.route('/api/tts/voices', methods=['GET'])
+def list_tts_voices():
+    registry = get_voice_registry()
     return jsonify({
         'success': True,
-        'version': LESSON_DATABASE['version'],
-        'title': LESSON_DATABASE['title'],
-        'lessons': summaries,
+        'default': _default_piper_voice(),
+        'maxResident': registry.max_resident,
+        'voices': registry.voice_stats(),
     })
 
 
+@app.route('/api/tts/<digest>', methods=['GET'])
+def text_to_speech_by_digest(digest):
+    """Cacheable TTS addressed by audio_key(provider, voice, text).
+
+    ``text`` is only needed when the clip is not already in the disk cache.
+    ``voice`` defaults to the configured voice and must match the digest.
+    """
+    if not re.fullmatch(r'[0-9a-f]{64}', digest):
+        return _json_error('Audio not found', 404)
+
+    rate, rate_error = _parse_tts_rate(request.args.get('rate'))
+    if rate_error:
+        return _json_error(rate_error, 400)
+    tts_provider = getattr(app_config, 'LOCAL_TTS_PROVIDER', 'piper').strip().lower()
+    voice = request.args.get('voice') or None
+    voice_error = _validate_voice(tts_provider, voice)
+    if voice_error:
+        return _json_error(voice_error, 400)
+    audio_format, format_error = _negotiate_audio_format(request.args.get('format'))
+    if format_error:
+        return _json_error(format_error, 400)
+
+    entity_tag = digest if rate == 1.0 else f'{digest}-r{rate:g}'
+    if audio_format != 'wav':
+        entity_tag = f'{entity_tag}-{audio_format}'
+    cache_headers = {
+        'ETag': f'"{entity_tag}"',
+        'Cache-Control': TTS_IMMUTABLE_CACHE_CONTROL,
+        'Vary': 'Accept',
+    }
+    if request.if_none_match.contains(entity_tag):
+        return Response(status=304, headers=cache_headers)
+
+    try:
+        text = request.args.get('text', '')
+        if text:
+            validation_error = _validate_text_input(text)
+            if validation_error:
+                return _json_error(validation_error, 400)
+            if audio_key(tts_provider, _tts_voice(tts_provider, voice), text.strip()) != digest:
+                return _json_error('Audio not found', 404)
+            audio_bytes, content_type = synthesize_speech_with_local_tts(
+                text.strip(),
+                rate=rate,
+                voice=voice,
+                audio_format=audio_format,
+            )
+        else:
+            audio_store = _get_audio_store()
+            stored_tts = _stored_speech_variant(audio_store, digest, rate, audio_format) if audio_store else None
+            if not stored_tts:
+                return _json_error('Audio not found', 404)
+            audio_bytes, content_type = stored_tts
+
+        return Response(audio_bytes, mimetype=content_type, headers=cache_headers)
+    except SynthesisQueueFull as exc:
+        logger.warning('TTS request rejected: %s', str(exc))
+        return _tts_busy_error(exc)
+    except ConnectionError as exc:
+        logger.error('TTS error: %s', str(exc))
+        return _unavailable_error('Local TTS is unavailable', exc)
+    except Exception as exc:
+        logger.error('Unexpected TTS error: %s', str(exc))
+        return _json_error('TTS failed. Please try again.', 500)
+
+
+@app.route('/api/tts-batch', methods=['POST'])
+def text_to_speech_batch():
+    try:
+        data = request.get_json(silent=True) or {}
+        lines = data.get('lines', [])
+        if not isinstance(lines, list):
+            return _json_error('Lines must be an array of strings', 400)
+        if not lines:
+            return _json_error('No lines provided', 400)
+        if len(lines) > MAX_TTS_BATCH_LINES:
+            return _json_error(f'Too many lines (max {MAX_TTS_BATCH_LINES} per request)', 400)
+        rate, rate_error = _parse_tts_rate(data.get('rate'))
+        if rate_error:
+            return _json_error(rate_error, 400)
+        tts_provider = getattr(app_config, 'LOCAL_TTS_PROVIDER', 'piper').strip().lower()
+        voice = data.get('voice') or None
+        voice_error = _validate_voice(tts_provider, voice)
+        if voice_error:
+            return _json_error(voice_error, 400)
+        audio_format, format_error = _negotiate_audio_format(data.get('format'))
+        if format_error:
+            return _json_error(format_error, 400)
+
+        results = [None] * len(lines)
+        pending = {}
+        for index, line in enumerate(lines):
+            validation_error = _validate_text_input(line)
+            if validation_error:
+                results[index] = {'success': False, 'audio': '', 'error': validation_error}
+                continue
+            pending.setdefault(line.strip(), []).append(index)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(TTS_BATCH_CONCURRENCY, len(pending))) as executor:
+                futures = {
+                    text: executor.submit(
+                        synthesize_speech_with_local_tts,
+                        text,
+                        PRIORITY_PREFETCH,
+                        rate,
+                        voice,
+                        audio_format,
+                    )
+                    for text in pending
+                }
+                for text, future in futures.items():
+                    try:
+                        audio_bytes, content_type = future.result()
+                        result = {
+                            'success': True,
+                            'audio': base64.b64encode(audio_bytes).decode('ascii'),
+                            'mimetype': content_type,
+                        }
+                    except ConnectionError:
+                        result = {'success': False, 'audio': '', 'error': 'Service unavailable'}
+                    except Exception:
+                        result = {'success': False, 'audio': '', 'error': 'TTS failed'}
+                    for index in pending[text]:
+                        results[index] = result
+
+        return jsonify({'success': True, 'results': results})
+    except Exception as exc:
+        logger.error('Batch TTS error: %s', str(exc))
+        return _json_error('Batch TTS failed. Please try again.', 500)
+
+
+@app.route('/api/lessons', methods=['GET'])
+def list_lessons():
+    body = _lesson_catalog.list_json(
+        level=request.args.get('level', '').strip() or None,
+        grammar=request.args.get('grammar', '').strip() or None,
+        theme=request.args.get('theme', '').strip() or None,
+    )
+    return Response(body, mimetype='application/json')
+
+
+@app.route('/api/lessons/items', methods=['GET'])
+def list_lesson_items():
+    """Page through every item of a level's lessons (``level=all`` or none for every level)."""
+    level = request.args.get('level', '').strip()
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', LESSON_ITEMS_PAGE_SIZE))
+    except ValueError:
+        return _json_error('offset and limit must be integers')
+    if offset < 0 or not 1 <= limit <= MAX_LESSON_ITEMS_PAGE_SIZE:
+        return _json_error(f'offset must be non-negative and limit between 1 and {MAX_LESSON_ITEMS_PAGE_SIZE}')
+
+    body = _lesson_catalog.items_page_json(
+        level=None if level.lower() in ('', 'all') else level,
+        offset=offset,
+        limit=limit,
+    )
+    return Response(body, mimetype='application/json')
+
+
 @app.route('/api/lessons/<lesson_id>', methods=['GET'])
 def get_lesson(lesson_id):
-    lesson = get_lesson_by_id(lesson_id)
-    if lesson is None:
+    body = _lesson_catalog.detail_json(lesson_id)
+    if body is None:
+        return _json_error('Lesson not found', 404)
+    return Response(body, mimetype='application/json')
+
+
+@app.route('/api/lessons/<lesson_id>/audio-pack', methods=['GET'])
+def get_lesson_audio_pack(lesson_id):
+    if get_lesson_by_id(lesson_id) is None:
+        return _json_error('Lesson not found', 404)
+    pack_path, _index_path = pack_paths(get_audio_pack_dir(), lesson_id)
+    if not os.path.isfile(pack_path):
+        return _json_error('Audio pack not found', 404)
+    # conditional=True enables Range, ETag and If-Modified-Since handling.
+    return send_file(pack_path, mimetype='application/octet-stream', conditional=True, max_age=3600)
+
+
+@app.route('/api/lessons/<lesson_id>/audio-pack/index', methods=['GET'])
+def get_lesson_audio_pack_index(lesson_id):
+    if get_lesson_by_id(lesson_id) is None:
         return _json_error('Lesson not found', 404)
-    return jsonify({'success': True, 'lesson': lesson})
+    index = load_pack_index(get_audio_pack_dir(), lesson_id)
+    if index is None:
+        return _json_error('Audio pack not found', 404)
+    return jsonify({'success': True, 'pack': index})
+
+
+def _translation_store_stats():
+    store = _get_translation_store()
+    if not store:
+        return None
+    try:
+        return store.stats()
+    except sqlite3.Error:
+        return None
+
+
+@app.route('/api/stats', methods=['GET'])
+def get_service_stats():
+    return jsonify({
+        'success': True,
+        'caches': {
+            'translation': _translation_cache.stats(),
+            'tts': _tts_cache.stats(),
+        },
+        'translationStore': _translation_store_stats(),
+        'translationMemory': _translation_memory.stats(),
+        'translationJobs': _translation_jobs.stats(),
+        'upstreams': {
+            name: {**breaker.stats(), 'retryBudget': _retry_budgets[name].stats()}
+            for name, breaker in _circuit_breakers.items()
+        },
+        'libretranslateBackends': _get_libretranslate_pool().stats(),
+        'translationHedging': _translation_hedger.stats(),
+        'synthesisScheduler': _synthesis_scheduler.stats(),
+        'singleFlight': {
+            'translation': _translation_flight.stats(),
+            'tts': _tts_flight.stats(),
+        },
+    })
 
 if __name__ == '__main__':
     logger.info(f"Starting Flask server on {app_config.HOST}:{app_config.PORT}")
     logger.info(f"Debug mode: {getattr(app_config, 'DEBUG', False)}")
-    logger.info(f"LibreTranslate endpoint: {app_config.LIBRETRANSLATE_URL}")
+    logger.info(f"LibreTranslate endpoints: {', '.join(get_libretranslate_urls())}")
     logger.info(f"Local TTS enabled: {getattr(app_config, 'LOCAL_TTS_ENABLED', False)}")
     app.run(debug=getattr(app_config, 'DEBUG', False), host=app_config.HOST, port=app_config.PORT)
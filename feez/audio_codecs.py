@@ -0,0 +1,154 @@
+import struct
+
+import numpy as np
+
+from wav_utils import WAVE_FORMAT_PCM, WavFormat, build_wav, parse_wav, pcm_format
+
+WAVE_FORMAT_MULAW = 0x0007
+WAVE_FORMAT_IMA_ADPCM = 0x0011
+
+COMPACT_SAMPLE_RATE = 16000
+
+# name -> short description, in the order offered to clients
+AUDIO_FORMATS = {
+    'wav': 'Original 16-bit PCM WAV',
+    'pcm16k': '16 kHz mono 16-bit PCM WAV',
+    'ulaw': '16 kHz mono 8-bit mu-law WAV',
+    'adpcm': 'Mono 4-bit IMA-ADPCM WAV',
+}
+
+_IMA_STEP_TABLE = (
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41, 45,
+    50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190, 209, 230,
+    253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724, 796, 876, 963,
+    1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749, 3024, 3327,
+    3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132, 7845, 8630, 9493, 10442,
+    11487, 12635, 13899, 15289, 16818, 18500, 20350, 22385, 24623, 27086, 29794,
+    32767,
+)
+_IMA_INDEX_TABLE = (-1, -1, -1, -1, 2, 4, 6, 8, -1, -1, -1, -1, 2, 4, 6, 8)
+
+
+def _mono_samples(wav_bytes):
+    wav_format, pcm = parse_wav(wav_bytes)
+    if wav_format.audio_format != WAVE_FORMAT_PCM or wav_format.bits_per_sample != 16:
+        raise ValueError('Only 16-bit PCM WAV audio can be re-encoded')
+    usable = len(pcm) - len(pcm) % wav_format.block_align
+    samples = np.frombuffer(pcm[:usable], dtype='<i2').reshape(-1, wav_format.channels)
+    return wav_format.sample_rate, samples.mean(axis=1)
+
+
+def resample(samples, source_rate, target_rate):
+    """Band-limit with a windowed-sinc low-pass, then interpolate to ``target_rate``."""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    if target_rate < source_rate:
+        cutoff = 0.45 * target_rate / source_rate
+        taps = np.arange(-32, 33)
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * taps) * np.hamming(len(taps))
+        samples = np.convolve(samples, kernel / kernel.sum(), mode='same')
+    output_length = int(len(samples) * target_rate / source_rate)
+    positions = np.arange(output_length) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples)
+
+
+def _to_int16(samples):
+    return np.clip(np.round(samples), -32768, 32767).astype(np.int16)
+
+
+def mulaw_encode(samples):
+    """G.711 mu-law encode int16 samples to bytes."""
+    values = samples.astype(np.int32)
+    sign = np.where(values < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(values), 32635) + 0x84
+    exponent = np.floor(np.log2(magnitude >> 7)).astype(np.int32)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8).tobytes()
+
+
+def _ima_block_align(sample_rate):
+    if sample_rate <= 11025:
+        return 256
+    if sample_rate <= 22050:
+        return 512
+    return 1024
+
+
+def ima_adpcm_encode(samples, sample_rate):
+    """Encode mono int16 samples as IMA-ADPCM WAV blocks.
+
+    Returns ``(WavFormat, data, sample_count)``. Each block starts with the
+    uncompressed first sample and step index; the rest are 4-bit codes with
+    the low nibble first. The predictor is inherently sequential, so this is
+    a plain loop; the result is cached, so it runs once per clip.
+    """
+    block_align = _ima_block_align(sample_rate)
+    samples_per_block = (block_align - 4) * 2 + 1
+    values = samples.tolist()
+    blocks = []
+    step_index = 0
+    for block_start in range(0, len(values), samples_per_block):
+        block = values[block_start:block_start + samples_per_block]
+        block += [block[-1]] * (samples_per_block - len(block))
+        predictor = block[0]
+        header = struct.pack('<hBB', predictor, step_index, 0)
+        codes = []
+        for sample in block[1:]:
+            step = _IMA_STEP_TABLE[step_index]
+            diff = sample - predictor
+            code = 0
+            if diff < 0:
+                code = 8
+                diff = -diff
+            delta = step >> 3
+            if diff >= step:
+                code |= 4
+                diff -= step
+                delta += step
+            step >>= 1
+            if diff >= step:
+                code |= 2
+                diff -= step
+                delta += step
+            step >>= 1
+            if diff >= step:
+                code |= 1
+                delta += step
+            predictor = predictor - delta if code & 8 else predictor + delta
+            predictor = max(-32768, min(32767, predictor))
+            step_index = max(0, min(88, step_index + _IMA_INDEX_TABLE[code]))
+            codes.append(code)
+        packed = bytes(low | (high << 4) for low, high in zip(codes[0::2], codes[1::2]))
+        blocks.append(header + packed)
+
+    wav_format = WavFormat(
+        WAVE_FORMAT_IMA_ADPCM,
+        1,
+        sample_rate,
+        sample_rate * block_align // samples_per_block,
+        block_align,
+        4,
+        struct.pack('<HH', 2, samples_per_block),
+    )
+    return wav_format, b''.join(blocks), len(values)
+
+
+def encode_audio(wav_bytes, audio_format):
+    """Re-encode a 16-bit PCM WAV clip into one of ``AUDIO_FORMATS``."""
+    if audio_format == 'wav':
+        return wav_bytes
+    if audio_format not in AUDIO_FORMATS:
+        raise ValueError(f'Unknown audio format: {audio_format}')
+
+    sample_rate, samples = _mono_samples(wav_bytes)
+    if audio_format == 'adpcm':
+        wav_format, data, sample_count = ima_adpcm_encode(_to_int16(samples), sample_rate)
+        return build_wav(wav_format, data, fact_samples=sample_count)
+
+    target_rate = min(sample_rate, COMPACT_SAMPLE_RATE)
+    compact = _to_int16(resample(samples, sample_rate, target_rate))
+    if audio_format == 'pcm16k':
+        return build_wav(pcm_format(1, target_rate, 16), compact.astype('<i2').tobytes())
+
+    ulaw_format = WavFormat(WAVE_FORMAT_MULAW, 1, target_rate, target_rate, 1, 8, struct.pack('<H', 0))
+    return build_wav(ulaw_format, mulaw_encode(compact), fact_samples=len(compact))
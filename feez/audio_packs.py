@@ -0,0 +1,140 @@
+"""Pre-render lesson audio into per-lesson audio packs.
+
+A pack is a single ``<lesson_id>.pack`` file holding every item's clip back to
+back, plus a ``<lesson_id>.json`` index with the byte offset and length of
+each clip. Clients fetch the pack once (or byte ranges of it) and play items
+without waiting for synthesis.
+
+Usage:
+    python audio_packs.py                 # render every lesson
+    python audio_packs.py --level A1      # only A1 lessons
+    python audio_packs.py --lesson a1-01-greetings-introductions
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from synthesis_scheduler import PRIORITY_BATCH
+
+logger = logging.getLogger(__name__)
+
+PACK_SUFFIX = '.pack'
+INDEX_SUFFIX = '.json'
+
+
+def pack_paths(pack_dir, lesson_id):
+    return (
+        os.path.join(pack_dir, lesson_id + PACK_SUFFIX),
+        os.path.join(pack_dir, lesson_id + INDEX_SUFFIX),
+    )
+
+
+def _write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def build_lesson_pack(lesson, clips, pack_dir, version=''):
+    """Write one lesson pack from ``clips``, a list of ``(bytes, mimetype)`` per item."""
+    entries = []
+    chunks = []
+    offset = 0
+    for index, (item, (audio_bytes, mimetype)) in enumerate(zip(lesson['items'], clips)):
+        entries.append({
+            'index': index,
+            'finnish': item['finnish'],
+            'offset': offset,
+            'length': len(audio_bytes),
+            'mimetype': mimetype,
+        })
+        chunks.append(audio_bytes)
+        offset += len(audio_bytes)
+
+    index_payload = {
+        'lessonId': lesson['id'],
+        'version': version,
+        'size': offset,
+        'items': entries,
+    }
+    os.makedirs(pack_dir, exist_ok=True)
+    pack_path, index_path = pack_paths(pack_dir, lesson['id'])
+    _write_atomic(pack_path, b''.join(chunks))
+    _write_atomic(index_path, json.dumps(index_payload, ensure_ascii=False).encode('utf-8'))
+    return index_payload
+
+
+def load_pack_index(pack_dir, lesson_id):
+    _pack_path, index_path = pack_paths(pack_dir, lesson_id)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as index_file:
+            return json.load(index_file)
+    except (OSError, ValueError):
+        return None
+
+
+def render_lessons(lessons, synthesize, pack_dir, version='', workers=4):
+    """Synthesize every item of ``lessons`` in parallel and write their packs.
+
+    Returns ``(written, failed)`` lesson id lists. A lesson with any failed
+    item is skipped rather than written with gaps.
+    """
+    written = []
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for lesson in lessons:
+            futures = [executor.submit(synthesize, item['finnish']) for item in lesson['items']]
+            try:
+                clips = [future.result() for future in futures]
+            except Exception as exc:
+                logger.error('Skipping lesson %s: %s', lesson['id'], str(exc))
+                failed.append(lesson['id'])
+                continue
+            build_lesson_pack(lesson, clips, pack_dir, version)
+            written.append(lesson['id'])
+            logger.info('Wrote audio pack for %s (%s items)', lesson['id'], len(clips))
+    return written, failed
+
+
+def main(argv=None):
+    import app
+
+    parser = argparse.ArgumentParser(description='Pre-render lesson audio packs.')
+    parser.add_argument('--level', help='Only render lessons of this level (A1, A2)')
+    parser.add_argument('--lesson', action='append', help='Only render this lesson id (repeatable)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4, help='Parallel synthesis jobs')
+    parser.add_argument('--out', help='Output directory (defaults to AUDIO_PACK_DIR)')
+    args = parser.parse_args(argv)
+
+    lessons = app.get_lessons(args.level)
+    if args.lesson:
+        wanted = set(args.lesson)
+        lessons = [lesson for lesson in lessons if lesson['id'] in wanted]
+
+    pack_dir = args.out or app.get_audio_pack_dir()
+    written, failed = render_lessons(
+        lessons,
+        partial(app.synthesize_speech_with_local_tts, priority=PRIORITY_BATCH),
+        pack_dir,
+        version=app.LESSON_DATABASE['version'],
+        workers=args.workers,
+    )
+    logger.info('Audio packs written: %s, failed: %s', len(written), len(failed))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def audio_key(provider, voice, text):
+    """Content address for a synthesized clip."""
+    digest = hashlib.sha256()
+    for part in (provider, voice, text):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class AudioStore:
+    """Disk-backed audio cache shared by every worker process.
+
+    Each entry is one file named after its content hash. The file holds the
+    mimetype on the first line followed by the raw audio bytes. Writes go to
+    a temporary file that is renamed into place, so readers never see a
+    partial clip. When the store grows past ``max_bytes`` the least recently
+    used files are removed.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        self._total_bytes = self._scan_total()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def _entries(self):
+        for dir_path, _dir_names, file_names in os.walk(self.root):
+            for file_name in file_names:
+                if file_name.startswith('.'):
+                    continue
+                path = os.path.join(dir_path, file_name)
+                try:
+                    yield path, os.stat(path)
+                except OSError:
+                    continue
+
+    def _scan_total(self):
+        return sum(stat_result.st_size for _path, stat_result in self._entries())
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as audio_file:
+                data = audio_file.read()
+            os.utime(path)
+        except OSError:
+            return None
+
+        mimetype, separator, audio_bytes = data.partition(b'\n')
+        if not separator or not audio_bytes:
+            return None
+        return audio_bytes, mimetype.decode('ascii', errors='ignore')
+
+    def set(self, key, audio_bytes, mimetype):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(mimetype.encode('ascii') + b'\n')
+                tmp_file.write(audio_bytes)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning('Audio store write failed: %s', str(exc))
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._total_bytes += len(audio_bytes) + len(mimetype) + 1
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used clips until the store is under 90% of budget."""
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+            total = sum(stat_result.st_size for _path, stat_result in entries)
+            target = int(self.max_bytes * 0.9)
+            for path, stat_result in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= stat_result.st_size
+            self._total_bytes = total
+
+    def stats(self):
+        return {'bytes': self._total_bytes, 'maxBytes': self.max_bytes}
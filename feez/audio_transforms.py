@@ -0,0 +1,74 @@
+import numpy as np
+
+from wav_utils import build_wav, parse_wav, WAVE_FORMAT_PCM
+
+MIN_RATE = 0.5
+MAX_RATE = 2.0
+FRAME_SECONDS = 0.04
+
+
+def _frame_window(frame_length):
+    # Periodic Hann windows at 50% overlap sum to one, so overlap-add keeps the level.
+    return 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(frame_length) / frame_length)
+
+
+def time_stretch(samples, sample_rate, rate):
+    """Change speaking rate without changing pitch (WSOLA).
+
+    ``samples`` is a float array shaped ``(frames, channels)``. ``rate`` > 1
+    speeds speech up, < 1 slows it down. Each output frame is taken from
+    around its nominal input position, shifted within a small tolerance to
+    the offset that best continues the previous frame's waveform, then
+    overlap-added with a Hann window.
+    """
+    frame_length = max(64, int(sample_rate * FRAME_SECONDS) // 2 * 2)
+    hop = frame_length // 2
+    tolerance = hop // 2
+    output_length = int(round(len(samples) / rate))
+    if len(samples) < frame_length or output_length < frame_length:
+        return samples
+
+    window = _frame_window(frame_length)
+    padding = frame_length + 2 * tolerance
+    padded = np.pad(samples, ((padding, padding), (0, 0)))
+    guide = padded.mean(axis=1)
+
+    frame_count = output_length // hop + 2
+    output = np.zeros((frame_count * hop + frame_length, samples.shape[1]))
+    previous_start = padding
+    for frame_index in range(frame_count):
+        # Output sample ``hop + t`` maps to input sample ``t * rate``.
+        nominal = padding - hop + int(round(frame_index * hop * rate))
+        if frame_index == 0:
+            start = nominal
+        else:
+            target = guide[previous_start + hop:previous_start + hop + frame_length]
+            search_start = max(0, nominal - tolerance)
+            region = guide[search_start:nominal + tolerance + frame_length]
+            if len(region) < frame_length or len(target) < frame_length:
+                start = nominal
+            else:
+                scores = np.correlate(region, target, mode='valid')
+                start = search_start + int(np.argmax(scores))
+        frame = padded[start:start + frame_length]
+        if len(frame) < frame_length:
+            break
+        output_start = frame_index * hop
+        output[output_start:output_start + frame_length] += frame * window[:, None]
+        previous_start = start
+
+    # The first half-frame only has a rising window contributing; skip it.
+    return output[hop:hop + output_length]
+
+
+def change_wav_rate(wav_bytes, rate):
+    """Return 16-bit PCM ``wav_bytes`` re-timed by ``rate``."""
+    wav_format, pcm = parse_wav(wav_bytes)
+    if wav_format.audio_format != WAVE_FORMAT_PCM or wav_format.bits_per_sample != 16:
+        raise ValueError('Only 16-bit PCM WAV audio can be re-timed')
+
+    usable = len(pcm) - len(pcm) % wav_format.block_align
+    samples = np.frombuffer(pcm[:usable], dtype='<i2').reshape(-1, wav_format.channels).astype(np.float64)
+    stretched = time_stretch(samples, wav_format.sample_rate, rate)
+    pcm_out = np.clip(np.round(stretched), -32768, 32767).astype('<i2').tobytes()
+    return build_wav(wav_format, pcm_out)
@@ -0,0 +1,168 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in each backend's per-line latency average.
+LATENCY_SMOOTHING = 0.3
+# Recent successful single-line call durations kept, across all backends, for percentiles.
+LATENCY_SAMPLE_SIZE = 200
+# Percentiles are not reported until this many single-line calls have succeeded.
+MIN_LATENCY_SAMPLES = 20
+
+
+class Backend:
+    def __init__(self, url):
+        self.url = url
+        self.outstanding = 0
+        self.healthy = True
+        self.ejected_until = 0.0
+        self.consecutive_failures = 0
+        self.latency = None
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def available(self, now):
+        return self.healthy and self.ejected_until <= now
+
+    def stats(self, now):
+        return {
+            'url': self.url,
+            'available': self.available(now),
+            'healthy': self.healthy,
+            'ejectedFor': round(max(0.0, self.ejected_until - now), 1),
+            'outstanding': self.outstanding,
+            'latencySecondsPerLine': round(self.latency, 3) if self.latency is not None else None,
+            'requests': self.requests,
+            'failures': self.failures,
+            'ejections': self.ejections,
+        }
+
+
+class BackendPool:
+    """Routes calls across equivalent backends by least outstanding requests.
+
+    A backend is ejected for ``eject_seconds`` after ``max_failures``
+    consecutive failures, or when its average latency per line exceeds
+    ``slow_seconds``; the last available backend is never ejected. With
+    ``probe`` and ``health_interval`` set, a daemon thread calls
+    ``probe(url)`` on every backend periodically: a failed probe takes it
+    out of rotation until a later probe passes.
+    """
+
+    def __init__(self, urls, probe=None, health_interval=0, max_failures=3, eject_seconds=30, slow_seconds=5):
+        if not urls:
+            raise ValueError('At least one backend URL is required')
+        self.backends = [Backend(url) for url in urls]
+        self.probe = probe
+        self.max_failures = max(1, int(max_failures))
+        self.eject_seconds = eject_seconds
+        self.slow_seconds = slow_seconds
+        self._single_line_latencies = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        if probe is not None and health_interval and health_interval > 0:
+            prober = threading.Thread(target=self._probe_loop, args=(health_interval,), daemon=True)
+            prober.start()
+
+    def _probe_loop(self, interval):
+        while not self._stop_event.wait(interval):
+            self.check_health()
+
+    def check_health(self):
+        for backend in self.backends:
+            try:
+                healthy = bool(self.probe(backend.url))
+            except Exception as exc:
+                logger.warning('Health probe of %s failed: %s', backend.url, str(exc))
+                healthy = False
+            with self._lock:
+                if healthy and not backend.healthy:
+                    logger.info('Backend %s is healthy again', backend.url)
+                backend.healthy = healthy
+        return self.stats()
+
+    def pick(self, exclude=()):
+        """Choose the available backend with the fewest outstanding requests.
+
+        Ties go to the lower average latency, then at random. When nothing
+        is available, the backend due back soonest is used rather than
+        failing outright.
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [backend for backend in self.backends if backend.url not in exclude] or self.backends
+            available = [backend for backend in candidates if backend.available(now)]
+            if not available:
+                return min(candidates, key=lambda backend: (not backend.healthy, backend.ejected_until))
+            return min(
+                available,
+                key=lambda backend: (backend.outstanding, backend.latency or 0.0, random.random()),
+            )
+
+    def acquire(self, exclude=()):
+        """Pick a backend and count the call as outstanding until ``release``."""
+        backend = self.pick(exclude)
+        with self._lock:
+            backend.outstanding += 1
+            backend.requests += 1
+        return backend
+
+    def release(self, backend, elapsed=None, lines=1):
+        """End a call: ``elapsed`` seconds on success, None when the backend failed.
+
+        ``lines`` is how many lines the call carried; the backend's average
+        is kept per line, so bulk calls are not mistaken for slowness.
+        """
+        now = time.monotonic()
+        with self._lock:
+            backend.outstanding -= 1
+            if elapsed is None:
+                backend.failures += 1
+                backend.consecutive_failures += 1
+                eject = backend.consecutive_failures >= self.max_failures
+            else:
+                backend.consecutive_failures = 0
+                if lines == 1:
+                    self._single_line_latencies.append(elapsed)
+                per_line = elapsed / max(1, lines)
+                if backend.latency is None:
+                    backend.latency = per_line
+                else:
+                    backend.latency += LATENCY_SMOOTHING * (per_line - backend.latency)
+                eject = self.slow_seconds and backend.latency > self.slow_seconds
+            others_available = any(
+                other is not backend and other.available(now) for other in self.backends
+            )
+            if eject and others_available and backend.ejected_until <= now:
+                backend.ejected_until = now + self.eject_seconds
+                backend.ejections += 1
+                # Start afresh when it comes back rather than being ejected again at once.
+                backend.consecutive_failures = 0
+                backend.latency = None
+                logger.warning('Ejecting backend %s for %ss', backend.url, self.eject_seconds)
+
+    def latency_percentile(self, percentile):
+        """Recent successful single-line call duration at ``percentile`` (0-100).
+
+        Bulk calls are left out, since their duration grows with the number
+        of lines. None until enough single-line calls have succeeded.
+        """
+        with self._lock:
+            samples = sorted(self._single_line_latencies)
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        rank = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[rank]
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return [backend.stats(now) for backend in self.backends]
+
+    def close(self):
+        self._stop_event.set()
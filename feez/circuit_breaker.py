@@ -0,0 +1,148 @@
+import random
+import threading
+import time
+from collections import deque
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f'{name} is unavailable; circuit is open')
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+def backoff_delay(attempt, base_seconds, max_seconds):
+    """Full-jitter exponential backoff: uniform in ``[0, min(max, base * 2**(attempt - 1))]``."""
+    return random.uniform(0, min(max_seconds, base_seconds * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Per-upstream circuit breaker.
+
+    Closed: calls go through; ``failure_threshold`` consecutive failures
+    open the circuit. Open: calls fail at once with ``CircuitOpenError``
+    until the open period ends. Half-open: one probe call is let through;
+    success closes the circuit, failure reopens it for twice as long (up to
+    ``max_open_seconds``, jittered so workers do not probe in lockstep).
+    """
+
+    def __init__(self, name, failure_threshold=5, open_seconds=10, max_open_seconds=120):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_count = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now):
+        if self._state == STATE_OPEN and now >= self._open_until:
+            return STATE_HALF_OPEN
+        return self._state
+
+    def before_call(self):
+        """Admit a call or raise ``CircuitOpenError``."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == STATE_CLOSED:
+                return
+            if state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._state = STATE_HALF_OPEN
+                self._probe_in_flight = True
+                return
+            self.rejected += 1
+            retry_after = self._open_until - now if state == STATE_OPEN else self.open_seconds
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self):
+        with self._lock:
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._opened_count = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        now = time.monotonic()
+        with self._lock:
+            self._failures += 1
+            probe_failed = self._state == STATE_HALF_OPEN
+            self._probe_in_flight = False
+            if probe_failed or (self._state == STATE_CLOSED and self._failures >= self.failure_threshold):
+                self._opened_count += 1
+                self.trips += 1
+                open_for = min(self.max_open_seconds, self.open_seconds * 2 ** (self._opened_count - 1))
+                self._state = STATE_OPEN
+                self._open_until = now + random.uniform(0.8, 1.0) * open_for
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            return {
+                'state': state,
+                'consecutiveFailures': self._failures,
+                'retryAfter': round(max(0.0, self._open_until - now), 1) if state == STATE_OPEN else 0,
+                'trips': self.trips,
+                'rejected': self.rejected,
+            }
+
+
+class RetryBudget:
+    """Caps retries at ``ratio`` of recent calls, plus ``min_retries`` per window.
+
+    During an outage every call fails, so retries would otherwise multiply
+    upstream load and hold request threads in backoff sleeps.
+    """
+
+    def __init__(self, ratio=0.2, min_retries=3, window_seconds=10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self._calls = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+        self.denied = 0
+
+    def _trim(self, now):
+        cutoff = now - self.window_seconds
+        for events in (self._calls, self._retries):
+            while events and events[0] < cutoff:
+                events.popleft()
+
+    def record_call(self):
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            self._calls.append(now)
+
+    def try_retry(self):
+        """Spend budget on one retry; return False when the budget is exhausted."""
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._calls):
+                self.denied += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def stats(self):
+        with self._lock:
+            self._trim(time.monotonic())
+            return {'calls': len(self._calls), 'retries': len(self._retries), 'denied': self.denied}
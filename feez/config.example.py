@@ -18,15 +18,77 @@ MYMEMORY_API_KEY = os.environ.get('MYMEMORY_API_KEY', None)
 # Public instance: https://libretranslate.com
 LIBRETRANSLATE_URL = os.environ.get('LIBRETRANSLATE_URL', 'https://libretranslate.com/translate')
 LIBRETRANSLATE_API_KEY = os.environ.get('LIBRETRANSLATE_API_KEY', None)
+LIBRETRANSLATE_READ_TIMEOUT_SECONDS = float(os.environ.get('LIBRETRANSLATE_READ_TIMEOUT_SECONDS', '10'))
+# Several equivalent instances, comma separated (e.g. http://localhost:5001/translate,http://localhost:5002/translate).
+# Requests go to the one with the fewest in flight; when empty, LIBRETRANSLATE_URL is used alone.
+LIBRETRANSLATE_URLS = [url.strip() for url in os.environ.get('LIBRETRANSLATE_URLS', '').split(',') if url.strip()]
+# With several instances, each one's /languages is probed this often; failing ones leave rotation
+LIBRETRANSLATE_HEALTH_CHECK_INTERVAL_SECONDS = float(os.environ.get('LIBRETRANSLATE_HEALTH_CHECK_INTERVAL_SECONDS', '10'))
+LIBRETRANSLATE_HEALTH_CHECK_TIMEOUT_SECONDS = float(os.environ.get('LIBRETRANSLATE_HEALTH_CHECK_TIMEOUT_SECONDS', '3'))
+# An instance that keeps failing, or averages slower than LIBRETRANSLATE_SLOW_SECONDS per line, is skipped this long
+LIBRETRANSLATE_EJECT_SECONDS = float(os.environ.get('LIBRETRANSLATE_EJECT_SECONDS', '30'))
+LIBRETRANSLATE_SLOW_SECONDS = float(os.environ.get('LIBRETRANSLATE_SLOW_SECONDS', '5'))
+# With several instances, a single-line translation that has not answered within this percentile
+# of recent response times is also sent to a second instance (0 disables hedging).
+# LIBRETRANSLATE_HEDGE_DELAY_SECONDS is used until enough responses have been seen.
+LIBRETRANSLATE_HEDGE_PERCENTILE = float(os.environ.get('LIBRETRANSLATE_HEDGE_PERCENTILE', '95'))
+LIBRETRANSLATE_HEDGE_DELAY_SECONDS = float(os.environ.get('LIBRETRANSLATE_HEDGE_DELAY_SECONDS', '1'))
+# Hedged requests allowed as a fraction of recent translations
+LIBRETRANSLATE_HEDGE_BUDGET_RATIO = float(os.environ.get('LIBRETRANSLATE_HEDGE_BUDGET_RATIO', '0.1'))
+
+# Keep-alive connections kept per upstream service (LibreTranslate, OpenTTS)
+UPSTREAM_POOL_SIZE = int(os.environ.get('UPSTREAM_POOL_SIZE', '10'))
+UPSTREAM_CONNECT_TIMEOUT_SECONDS = float(os.environ.get('UPSTREAM_CONNECT_TIMEOUT_SECONDS', '3.05'))
+# Circuit breaker: after this many consecutive failures an upstream is skipped (503) for
+# UPSTREAM_OPEN_SECONDS, doubling on each failed probe up to UPSTREAM_MAX_OPEN_SECONDS
+UPSTREAM_FAILURE_THRESHOLD = int(os.environ.get('UPSTREAM_FAILURE_THRESHOLD', '5'))
+UPSTREAM_OPEN_SECONDS = float(os.environ.get('UPSTREAM_OPEN_SECONDS', '10'))
+UPSTREAM_MAX_OPEN_SECONDS = float(os.environ.get('UPSTREAM_MAX_OPEN_SECONDS', '120'))
+# Retries allowed as a fraction of recent calls, so an outage does not multiply load
+UPSTREAM_RETRY_BUDGET_RATIO = float(os.environ.get('UPSTREAM_RETRY_BUDGET_RATIO', '0.2'))
 
 # Local TTS (recommended: direct Piper binary + Finnish model)
 LOCAL_TTS_ENABLED = os.environ.get('LOCAL_TTS_ENABLED', 'true').lower() == 'true'
 LOCAL_TTS_PROVIDER = os.environ.get('LOCAL_TTS_PROVIDER', 'piper')
 LOCAL_TTS_URL = os.environ.get('LOCAL_TTS_URL', 'http://localhost:5500/api/tts')
 LOCAL_TTS_VOICE = os.environ.get('LOCAL_TTS_VOICE', 'fi_FI-harri-medium')
+LOCAL_TTS_READ_TIMEOUT_SECONDS = float(os.environ.get('LOCAL_TTS_READ_TIMEOUT_SECONDS', '15'))
 PIPER_BINARY_PATH = os.environ.get('PIPER_BINARY_PATH', 'vendor/piper/piper/piper')
 PIPER_MODEL_PATH = os.environ.get('PIPER_MODEL_PATH', 'vendor/piper/voices/fi_FI-harri-medium.onnx')
 PIPER_CONFIG_PATH = os.environ.get('PIPER_CONFIG_PATH', 'vendor/piper/voices/fi_FI-harri-medium.onnx.json')
+# Number of long-lived Piper processes kept warm with the model loaded (0 = spawn one per request)
+PIPER_POOL_SIZE = int(os.environ.get('PIPER_POOL_SIZE', '2'))
+# Extra voices (*.onnx + *.onnx.json) are discovered here; only this many stay loaded at once
+PIPER_VOICES_DIR = os.environ.get('PIPER_VOICES_DIR', 'vendor/piper/voices')
+PIPER_MAX_RESIDENT_VOICES = int(os.environ.get('PIPER_MAX_RESIDENT_VOICES', '2'))
+# Disk cache for synthesized audio, shared by all worker processes (empty = disabled)
+TTS_AUDIO_CACHE_DIR = os.environ.get('TTS_AUDIO_CACHE_DIR', 'cache/tts')
+TTS_AUDIO_CACHE_MAX_BYTES = int(os.environ.get('TTS_AUDIO_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+# In-memory LRU cache budgets (entries past these sizes are evicted least recently used first)
+TRANSLATION_CACHE_MAX_BYTES = int(os.environ.get('TRANSLATION_CACHE_MAX_BYTES', str(4 * 1024 * 1024)))
+TTS_MEMORY_CACHE_MAX_BYTES = int(os.environ.get('TTS_MEMORY_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+# Persistent translation cache shared by worker processes and restarts (empty = disabled)
+TRANSLATION_STORE_PATH = os.environ.get('TRANSLATION_STORE_PATH', 'cache/translations.sqlite3')
+# Stored translations older than this are refetched and eventually deleted (0 keeps them forever)
+TRANSLATION_STORE_MAX_AGE_SECONDS = int(os.environ.get('TRANSLATION_STORE_MAX_AGE_SECONDS', str(30 * 24 * 60 * 60)))
+# Fuzzy translation memory: reuse an earlier translation when a line is at least this
+# similar (character trigram Dice, 1.0 = differs only in case, punctuation or spacing)
+TRANSLATION_MEMORY_MIN_SIMILARITY = float(os.environ.get('TRANSLATION_MEMORY_MIN_SIMILARITY', '0.9'))
+TRANSLATION_MEMORY_MAX_ENTRIES = int(os.environ.get('TRANSLATION_MEMORY_MAX_ENTRIES', '200000'))
+# Background document translation jobs: worker threads, upstream chunks in flight per job,
+# and how long finished results are kept
+TRANSLATION_JOB_WORKERS = int(os.environ.get('TRANSLATION_JOB_WORKERS', '2'))
+TRANSLATION_JOB_CONCURRENCY = int(os.environ.get('TRANSLATION_JOB_CONCURRENCY', '2'))
+TRANSLATION_JOB_RESULT_TTL_SECONDS = int(os.environ.get('TRANSLATION_JOB_RESULT_TTL_SECONDS', '3600'))
+# TTS admission control: concurrent synthesis jobs (0 = CPU count, capped at
+# PIPER_POOL_SIZE x PIPER_MAX_RESIDENT_VOICES when Piper is pooled) and waiting-queue depth
+TTS_MAX_CONCURRENT_JOBS = int(os.environ.get('TTS_MAX_CONCURRENT_JOBS', '0'))
+TTS_MAX_QUEUE_DEPTH = int(os.environ.get('TTS_MAX_QUEUE_DEPTH', '32'))
+# Audio encoding when the client does not ask for one: wav, pcm16k, ulaw or adpcm
+# (compact encodings cut classroom Wi-Fi usage 1.4-4x)
+TTS_DEFAULT_AUDIO_FORMAT = os.environ.get('TTS_DEFAULT_AUDIO_FORMAT', 'wav')
+# Pre-rendered lesson audio packs (build with: python audio_packs.py)
+AUDIO_PACK_DIR = os.environ.get('AUDIO_PACK_DIR', 'cache/audio-packs')
 
 # Google Cloud Translation API (Official - requires API key)
 # Sign up: https://cloud.google.com/translate
@@ -0,0 +1,14 @@
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture(autouse=True)
+def isolated_translation_store(monkeypatch):
+    """Keep tests off the persistent translation store that a local config.py or the fallback config enables.
+
+    Tests that exercise the store patch ``app.app_config`` with their own
+    ``TRANSLATION_STORE_PATH``.
+    """
+    monkeypatch.setattr(app_module.app_config, 'TRANSLATION_STORE_PATH', '', raising=False)
+    monkeypatch.setattr(app_module, '_translation_stores', {})
@@ -0,0 +1,46 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SessionPool:
+    """One keep-alive ``requests.Session`` per upstream service (or backend).
+
+    Each session keeps up to ``pool_size`` idle connections to one host, so
+    repeated calls reuse TCP (and TLS) connections instead of opening new
+    ones. Sessions are created on first use and closed by ``close``.
+    """
+
+    def __init__(self, pool_size=10):
+        self.pool_size = max(1, int(pool_size))
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self):
+        session = requests.Session()
+        # One host per session, so one per-host pool. Concurrent callers
+        # beyond pool_size still connect; the extra connections are just
+        # not kept afterwards.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def get(self, name):
+        session = self._sessions.get(name)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(name)
+            if session is None:
+                session = self._create_session()
+                self._sessions[name] = session
+            return session
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
@@ -0,0 +1,150 @@
+import json
+import unicodedata
+from types import MappingProxyType
+
+LESSON_BANK_SERVICE = 'lesson-bank'
+
+
+def normalize_phrase(text):
+    """Fold case, Unicode composition and whitespace so pasted lesson lines still match."""
+    return ' '.join(unicodedata.normalize('NFC', text).split()).casefold()
+
+
+def build_phrase_index(lesson_database):
+    """Map each normalized lesson ``finnish`` line to its authoritative ``english``.
+
+    When a phrase appears in several lessons, the first translation wins.
+    """
+    index = {}
+    for lesson in lesson_database['lessons']:
+        for item in lesson['items']:
+            finnish = item.get('finnish', '')
+            english = item.get('english', '')
+            if finnish and english:
+                index.setdefault(normalize_phrase(finnish), english)
+    return index
+
+
+def _json_bytes(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _index_by(lessons, keys_of):
+    index = {}
+    for lesson in lessons:
+        for key in keys_of(lesson):
+            index.setdefault(normalize_phrase(key), []).append(lesson)
+    return MappingProxyType({key: tuple(matches) for key, matches in index.items()})
+
+
+def annotated_items(lesson):
+    """The lesson's items, each tagged with the lesson it came from."""
+    return [
+        {
+            **item,
+            'lessonCode': lesson['code'],
+            'lessonTitle': lesson['title'],
+            'lessonLevel': lesson['level'],
+            'lessonTheme': lesson['theme'],
+        }
+        for item in lesson['items']
+    ]
+
+
+def lesson_summary(lesson):
+    return {
+        'id': lesson['id'],
+        'code': lesson['code'],
+        'level': lesson['level'],
+        'title': lesson['title'],
+        'theme': lesson['theme'],
+        'grammar': lesson['grammar'],
+        'objectives': lesson['objectives'],
+        'skills': lesson['skills'],
+        'itemCount': len(lesson['items']),
+    }
+
+
+class LessonCatalog:
+    """Read-only lesson indexes and prebuilt JSON responses, built once.
+
+    Lessons are indexed by id, level, grammar topic and theme (the last
+    three matched after ``normalize_phrase``). Each lesson's detail
+    response and summary, and the whole list response for every level, are
+    serialized up front, so lesson endpoints only look bytes up. So is
+    every item, annotated with its lesson, for paging through a level's
+    combined items.
+    """
+
+    def __init__(self, lesson_database):
+        self.version = lesson_database['version']
+        self.title = lesson_database['title']
+        self.lessons = tuple(lesson_database['lessons'])
+        self.by_id = MappingProxyType({lesson['id']: lesson for lesson in self.lessons})
+        self.by_level = _index_by(self.lessons, lambda lesson: [lesson['level']])
+        self.by_grammar = _index_by(self.lessons, lambda lesson: lesson['grammar'])
+        self.by_theme = _index_by(self.lessons, lambda lesson: [lesson['theme']])
+
+        self._summary_bytes = {lesson['id']: _json_bytes(lesson_summary(lesson)) for lesson in self.lessons}
+        self._detail_bytes = MappingProxyType({
+            lesson['id']: _json_bytes({'success': True, 'lesson': lesson}) for lesson in self.lessons
+        })
+        self._list_prefix = _json_bytes({'success': True, 'version': self.version, 'title': self.title})[:-1] + b',"lessons":['
+        self._list_bytes = MappingProxyType({
+            level: self._build_list_bytes(lessons)
+            for level, lessons in [('', self.lessons), *self.by_level.items()]
+        })
+        self._item_bytes = MappingProxyType({
+            level: tuple(_json_bytes(item) for lesson in lessons for item in annotated_items(lesson))
+            for level, lessons in [('', self.lessons), *self.by_level.items()]
+        })
+
+    def _build_list_bytes(self, lessons):
+        return self._list_prefix + b','.join(self._summary_bytes[lesson['id']] for lesson in lessons) + b']}'
+
+    def get(self, lesson_id):
+        return self.by_id.get(lesson_id)
+
+    def filter(self, level=None, grammar=None, theme=None):
+        """Lessons matching every given criterion, in catalog order."""
+        selections = [
+            index.get(normalize_phrase(value), ())
+            for index, value in ((self.by_level, level), (self.by_grammar, grammar), (self.by_theme, theme))
+            if value
+        ]
+        if not selections:
+            return self.lessons
+        selections.sort(key=len)
+        matching_ids = set(lesson['id'] for lesson in selections[0])
+        for selection in selections[1:]:
+            matching_ids.intersection_update(lesson['id'] for lesson in selection)
+        return tuple(lesson for lesson in selections[0] if lesson['id'] in matching_ids)
+
+    def detail_json(self, lesson_id):
+        """Serialized ``{'success': True, 'lesson': ...}`` response, or None for an unknown id."""
+        return self._detail_bytes.get(lesson_id)
+
+    def list_json(self, level=None, grammar=None, theme=None):
+        """Serialized lesson list response; prebuilt when filtering by level alone."""
+        if not grammar and not theme:
+            prebuilt = self._list_bytes.get(normalize_phrase(level) if level else '')
+            if prebuilt is not None:
+                return prebuilt
+        return self._build_list_bytes(self.filter(level, grammar, theme))
+
+    def items_page_json(self, level=None, offset=0, limit=500):
+        """Serialized page of a level's items (all levels when None), annotated with their lessons.
+
+        ``nextOffset`` is None on the last page.
+        """
+        items = self._item_bytes.get(normalize_phrase(level) if level else '', ())
+        offset = max(0, offset)
+        page = items[offset:offset + limit]
+        next_offset = offset + len(page) if offset + len(page) < len(items) else None
+        header = _json_bytes({
+            'success': True,
+            'total': len(items),
+            'offset': offset,
+            'nextOffset': next_offset,
+        })
+        return header[:-1] + b',"items":[' + b','.join(page) + b']}'
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def value_size(value):
+    """Approximate payload size in bytes of cached strings, bytes and tuples of them."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (tuple, list)):
+        return sum(value_size(item) for item in value)
+    return 0
+
+
+class LRUCache:
+    """Thread-safe in-memory cache with LRU eviction, TTL and a byte budget.
+
+    Entries are kept in an ``OrderedDict`` in recency order, so lookups,
+    inserts and evictions are O(1). An entry is dropped when its TTL passes,
+    or least recently used first when ``max_entries`` or ``max_bytes`` would
+    be exceeded. With ``sweep_interval`` set, a daemon thread also removes
+    expired entries that are never read again.
+    """
+
+    def __init__(self, max_entries=500, max_bytes=0, ttl_seconds=3600, sweep_interval=0, sizeof=value_size):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_seconds = ttl_seconds
+        self.sizeof = sizeof
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._stop_event = threading.Event()
+        if sweep_interval and sweep_interval > 0:
+            sweeper = threading.Thread(target=self._sweep_loop, args=(sweep_interval,), daemon=True)
+            sweeper.start()
+
+    def _sweep_loop(self, interval):
+        while not self._stop_event.wait(interval):
+            self.sweep()
+
+    def _remove(self, key):
+        _expires_at, _value, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        size = self.sizeof(value)
+        if self.max_bytes and size > self.max_bytes:
+            # Caching it would flush everything else; leave the cache as it is.
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+        return True
+
+    def pop(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def sweep(self):
+        """Drop expired entries and return how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if entry[0] < now]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def close(self):
+        self._stop_event.set()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'maxEntries': self.max_entries,
+                'maxBytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
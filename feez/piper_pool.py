@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class PiperWorker:
+    """A long-lived Piper process with the voice model already loaded.
+
+    Requests are written to stdin as JSON lines with an ``output_file``; Piper
+    writes the WAV there and echoes the path on stdout once it is done.
+    """
+
+    def __init__(self, command, output_dir):
+        self.command = command
+        self.output_dir = output_dir
+        self.process = None
+        self._lines = queue.Queue()
+        self.started_at = 0.0
+        self.jobs_done = 0
+        self.start()
+
+    def start(self):
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._lines = queue.Queue()
+        self.started_at = time.time()
+        self.jobs_done = 0
+        reader = threading.Thread(
+            target=self._read_stdout,
+            args=(self.process, self._lines),
+            daemon=True,
+        )
+        reader.start()
+
+    @staticmethod
+    def _read_stdout(process, lines):
+        for raw_line in process.stdout:
+            lines.put(raw_line.decode('utf-8', errors='ignore').strip())
+        lines.put(None)
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def synthesize(self, text, timeout):
+        if not self.is_alive():
+            raise ConnectionError('Piper worker is not running')
+
+        output_file = os.path.join(self.output_dir, f'{uuid.uuid4().hex}.wav')
+        request_line = json.dumps({'text': text, 'output_file': output_file}) + '\n'
+        try:
+            self.process.stdin.write(request_line.encode('utf-8'))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as exc:
+            raise ConnectionError('Piper worker stopped accepting input') from exc
+
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError('Piper worker timed out')
+                try:
+                    line = self._lines.get(timeout=remaining)
+                except queue.Empty as exc:
+                    raise TimeoutError('Piper worker timed out') from exc
+                if line is None:
+                    raise ConnectionError('Piper worker exited during synthesis')
+                if os.path.abspath(line) == output_file:
+                    break
+
+            with open(output_file, 'rb') as audio_file:
+                audio_bytes = audio_file.read()
+        finally:
+            try:
+                os.remove(output_file)
+            except OSError:
+                pass
+
+        if not audio_bytes:
+            raise RuntimeError('Piper returned empty audio')
+        self.jobs_done += 1
+        return audio_bytes
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+
+class PiperPool:
+    """Fixed-size pool of Piper workers sharing one voice model."""
+
+    def __init__(self, command, size=2, timeout=20, acquire_timeout=30, health_interval=30):
+        self.command = list(command)
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self.acquire_timeout = acquire_timeout
+        self.output_dir = tempfile.mkdtemp(prefix='piper-pool-')
+        self.restarts = 0
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stop_event = threading.Event()
+
+        try:
+            for _ in range(self.size):
+                worker = PiperWorker(self.command, self.output_dir)
+                self._workers.append(worker)
+                self._idle.put(worker)
+        except BaseException:
+            # Do not leave the workers that did start running without a pool.
+            for worker in self._workers:
+                worker.stop()
+            try:
+                os.rmdir(self.output_dir)
+            except OSError:
+                pass
+            raise
+
+        if health_interval and health_interval > 0:
+            monitor = threading.Thread(
+                target=self._monitor,
+                args=(health_interval,),
+                daemon=True,
+            )
+            monitor.start()
+
+    def _monitor(self, interval):
+        while not self._stop_event.wait(interval):
+            self.health_check()
+
+    def _restart(self, worker):
+        worker.stop()
+        with self._lock:
+            self.restarts += 1
+        try:
+            worker.start()
+        except OSError as exc:
+            raise ConnectionError('Piper worker could not be restarted') from exc
+
+    def _acquire(self):
+        try:
+            worker = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty as exc:
+            raise ConnectionError('All Piper workers are busy') from exc
+        if not worker.is_alive():
+            logger.warning('Piper worker exited unexpectedly; restarting')
+            try:
+                self._restart(worker)
+            except ConnectionError:
+                # Keep it in the pool; the next caller or health check retries the restart.
+                self._idle.put(worker)
+                raise
+        return worker
+
+    def synthesize(self, text):
+        if self._closed:
+            raise ConnectionError('Piper pool is shut down')
+
+        worker = self._acquire()
+        try:
+            return worker.synthesize(text, self.timeout), 'audio/wav'
+        except (TimeoutError, ConnectionError) as exc:
+            logger.error('Piper worker failed: %s', str(exc))
+            if not self._closed:
+                self._restart(worker)
+            raise ConnectionError('Piper TTS service is unavailable') from exc
+        finally:
+            self._idle.put(worker)
+
+    def health_check(self):
+        """Restart any idle worker whose process has died."""
+        checked = []
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            checked.append(worker)
+            if not worker.is_alive():
+                logger.warning('Piper worker failed health check; restarting')
+                try:
+                    self._restart(worker)
+                except ConnectionError as exc:
+                    logger.error('Piper health check restart failed: %s', str(exc))
+        for worker in checked:
+            self._idle.put(worker)
+        return self.stats()
+
+    def stats(self):
+        return {
+            'size': self.size,
+            'alive': sum(1 for worker in self._workers if worker.is_alive()),
+            'idle': self._idle.qsize(),
+            'restarts': self.restarts,
+            'jobs': sum(worker.jobs_done for worker in self._workers),
+        }
+
+    def pids(self):
+        return [worker.process.pid for worker in self._workers if worker.is_alive()]
+
+    def close(self):
+        """Stop all workers, letting in-flight jobs finish first."""
+        self._closed = True
+        self._stop_event.set()
+        for _ in self._workers:
+            try:
+                self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                break
+        for worker in self._workers:
+            worker.stop()
+        try:
+            os.rmdir(self.output_dir)
+        except OSError:
+            pass
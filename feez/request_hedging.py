@@ -0,0 +1,97 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+
+class RequestHedger:
+    """Runs a call and, if it is slow, a second copy, returning whichever succeeds first.
+
+    The hedge is only sent after ``delay`` seconds without an answer, and
+    only while ``budget`` (a ``RetryBudget``) allows, so the extra load stays
+    a small share of calls. Each primary call gets its own thread, so the
+    delay measures the upstream rather than a queue. Hedges run on at most
+    ``max_workers`` threads and are skipped, not queued, when all are busy.
+    The slower copy is left to finish in the background; its result is
+    discarded.
+    """
+
+    def __init__(self, budget, max_workers=16):
+        self.budget = budget
+        max_workers = max(1, int(max_workers))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedged-request')
+        self._hedge_slots = threading.BoundedSemaphore(max_workers)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.skipped_busy = 0
+
+    def _start_primary(self, call):
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(call())
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        threading.Thread(target=run, name='hedged-request-primary', daemon=True).start()
+        return future
+
+    def _submit_hedge(self, hedge_call):
+        """Start the hedge on a free worker, or return None when none is free or the budget is spent."""
+        if not self._hedge_slots.acquire(blocking=False):
+            with self._lock:
+                self.skipped_busy += 1
+            return None
+        if not self.budget.try_retry():
+            self._hedge_slots.release()
+            return None
+        hedge = self._executor.submit(hedge_call)
+        hedge.add_done_callback(lambda _future: self._hedge_slots.release())
+        with self._lock:
+            self.hedged += 1
+        return hedge
+
+    def run(self, call, delay, hedge_call=None):
+        """Return ``call()``'s result, racing ``hedge_call`` (default ``call``) against it when slow."""
+        self.budget.record_call()
+        with self._lock:
+            self.calls += 1
+        primary = self._start_primary(call)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        hedge = self._submit_hedge(hedge_call or call)
+        if hedge is None:
+            return primary.result()
+
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                if error is None or future is primary:
+                    error = future.exception()
+        raise error
+
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'hedged': self.hedged,
+                'hedgeWins': self.hedge_wins,
+                'skippedBusy': self.skipped_busy,
+                'budget': self.budget.stats(),
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,69 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """Coalesce concurrent identical work onto one in-flight call.
+
+    The first caller for a key becomes the leader and does the work; callers
+    arriving while it runs wait and receive the leader's result or exception.
+    Nothing is remembered once the call finishes; caching stays the caller's job.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def begin(self, key):
+        """Return ``(call, is_leader)``; a leader must later call ``finish``."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            self.leaders += 1
+            return call, True
+
+    def finish(self, key, call, result=None, error=None):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.result = result
+        call.error = error
+        call.done.set()
+
+    def do(self, key, func, *args, **kwargs):
+        call, is_leader = self.begin(key)
+        if not is_leader:
+            return call.wait()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as exc:
+            self.finish(key, call, error=exc)
+            raise
+        self.finish(key, call, result=result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'inFlight': len(self._calls),
+                'upstreamCalls': self.leaders,
+                'callsSaved': self.coalesced,
+            }
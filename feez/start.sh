@@ -29,34 +29,53 @@ if ! docker images | grep -q libretranslate/libretranslate; then
     docker pull libretranslate/libretranslate
 fi
 
-# Start LibreTranslate Docker container if not running
-if ! docker ps --format '{{.Names}}' | grep -q '^libretranslate$'; then
-    echo "Starting LibreTranslate Docker container..."
-    if docker ps -a --format '{{.Names}}' | grep -q '^libretranslate$'; then
-        docker start libretranslate
+# Start LibreTranslate Docker containers if not running.
+# LIBRETRANSLATE_INSTANCES > 1 runs extra containers on ports 5002, 5003, ...
+LIBRETRANSLATE_INSTANCES="${LIBRETRANSLATE_INSTANCES:-1}"
+LIBRETRANSLATE_ENDPOINTS=()
+for n in $(seq 1 "$LIBRETRANSLATE_INSTANCES"); do
+    name="libretranslate"
+    if [ "$n" -gt 1 ]; then
+        name="libretranslate-$n"
+    fi
+    port=$((5000 + n))
+    LIBRETRANSLATE_ENDPOINTS+=("http://localhost:${port}")
+
+    if ! docker ps --format '{{.Names}}' | grep -q "^${name}$"; then
+        echo "Starting LibreTranslate Docker container ${name}..."
+        if docker ps -a --format '{{.Names}}' | grep -q "^${name}$"; then
+            docker start "$name"
+        else
+            docker run -d --name "$name" -p "${port}:5000" libretranslate/libretranslate --load-only en,fi
+        fi
+        echo "LibreTranslate started on http://localhost:${port}"
     else
-        docker run -d --name libretranslate -p 5001:5000 libretranslate/libretranslate --load-only en,fi
+        echo "LibreTranslate ${name} is already running"
     fi
-    echo "LibreTranslate started on http://localhost:5001"
-else
-    echo "LibreTranslate is already running"
-fi
+done
 
 echo "Waiting for LibreTranslate to become ready..."
-for i in $(seq 1 60); do
-    if curl -fsS "http://localhost:5001/languages" >/dev/null 2>&1; then
-        echo "LibreTranslate is ready"
-        break
-    fi
+for endpoint in "${LIBRETRANSLATE_ENDPOINTS[@]}"; do
+    for i in $(seq 1 60); do
+        if curl -fsS "${endpoint}/languages" >/dev/null 2>&1; then
+            echo "LibreTranslate at ${endpoint} is ready"
+            break
+        fi
 
-    if [ "$i" -eq 60 ]; then
-        echo "Timed out waiting for LibreTranslate readiness"
-        exit 1
-    fi
+        if [ "$i" -eq 60 ]; then
+            echo "Timed out waiting for LibreTranslate readiness at ${endpoint}"
+            exit 1
+        fi
 
-    sleep 1
+        sleep 1
+    done
 done
 
+if [ "$LIBRETRANSLATE_INSTANCES" -gt 1 ] && [ -z "${LIBRETRANSLATE_URLS:-}" ]; then
+    LIBRETRANSLATE_URLS=$(printf '%s/translate,' "${LIBRETRANSLATE_ENDPOINTS[@]}")
+    export LIBRETRANSLATE_URLS="${LIBRETRANSLATE_URLS%,}"
+fi
+
 # Check if virtual environment exists
 if [ ! -d "venv" ]; then
     echo "Creating virtual environment..."
@@ -48,6 +48,7 @@ let lessonUiFxState = {
 
 let translationCancelled = false;
 let isTranslating = false;
+let translationAbortController = null;
 
 const defaultPhrases = [
     { finnish: 'Hei, mita kuuluu?', english: 'Hello, how are you?' },
@@ -285,24 +286,33 @@ async function getLessonDetail(lessonId) {
     return data.lesson;
 }
 
+// Fetches a level's items, already annotated with their lesson, one page at a time.
+async function getLessonItems(level) {
+    const items = [];
+    let offset = 0;
+    while (offset !== null) {
+        const params = new URLSearchParams({ level, offset: String(offset) });
+        const response = await fetch(`${API_BASE_URL}/api/lessons/items?${params}`);
+        const data = await response.json();
+        if (!response.ok || !data.success) {
+            throw new Error(data.error || 'Failed to load lesson items');
+        }
+        items.push(...data.items);
+        offset = data.nextOffset;
+    }
+    return items;
+}
+
 async function buildCombinedLesson(level) {
     const selectedLessons = level === 'all'
         ? lessonCatalog
         : lessonCatalog.filter((lesson) => lesson.level === level);
 
-    const detailLessons = await Promise.all(selectedLessons.map((lesson) => getLessonDetail(lesson.id)));
+    const combinedItems = await getLessonItems(level);
 
-    const combinedItems = detailLessons.flatMap((lesson) => lesson.items.map((item) => ({
-        ...item,
-        lessonCode: lesson.code,
-        lessonTitle: lesson.title,
-        lessonLevel: lesson.level,
-        lessonTheme: lesson.theme,
-    })));
-
-    const uniqueGrammar = [...new Set(detailLessons.flatMap((lesson) => lesson.grammar || []))];
-    const uniqueObjectives = [...new Set(detailLessons.flatMap((lesson) => lesson.objectives || []))];
-    const uniqueSkills = [...new Set(detailLessons.flatMap((lesson) => lesson.skills || []))];
+    const uniqueGrammar = [...new Set(selectedLessons.flatMap((lesson) => lesson.grammar || []))];
+    const uniqueObjectives = [...new Set(selectedLessons.flatMap((lesson) => lesson.objectives || []))];
+    const uniqueSkills = [...new Set(selectedLessons.flatMap((lesson) => lesson.skills || []))];
     const labelLevel = level === 'all' ? 'A1-A2' : level;
 
     return {
@@ -314,7 +324,7 @@ async function buildCombinedLesson(level) {
         grammar: uniqueGrammar,
         objectives: uniqueObjectives,
         skills: uniqueSkills,
-        lessonCount: detailLessons.length,
+        lessonCount: selectedLessons.length,
         items: combinedItems,
         isCombined: true,
     };
@@ -365,6 +375,9 @@ function rotateDailyState() {
 
 function cancelTranslation() {
     translationCancelled = true;
+    if (translationAbortController) {
+        translationAbortController.abort();
+    }
     showStatus('Translation cancelled by user', 'warning');
 }
 
@@ -761,6 +774,11 @@ function generateLessonPractice({ worksheet, fontSize, lineColor, textColor, pra
     });
     worksheet.appendChild(block);
     renderGamificationBanner(lessonSkill);
+
+    const upcomingTexts = itemsToDisplay
+        .slice(lessonPracticeState.currentIndex, lessonPracticeState.currentIndex + 1 + TTS_PREFETCH_AHEAD)
+        .map((item) => item.finnish);
+    prefetchLocalTts(upcomingTexts);
 }
 
 function renderGamificationBanner(lessonSkill) {
@@ -1802,30 +1820,110 @@ function createFeedbackSection(titleText, rows, className) {
 }
 
 let ttsAudio = null;
+const TTS_PREFETCH_AHEAD = 3;
+const TTS_PREFETCH_CACHE_SIZE = 30;
+const ttsPrefetchCache = new Map();
 
-async function speakFinnish(text, rate = 1) {
-    const localTtsPlayed = await speakViaLocalTts(text);
-    if (localTtsPlayed) {
+async function prefetchLocalTts(texts) {
+    const missing = [...new Set(texts.filter((text) => text && !ttsPrefetchCache.has(text)))];
+    if (missing.length === 0) {
         return;
     }
-    speakViaBrowserTts(text, rate);
-}
 
-async function speakViaLocalTts(text) {
     try {
-        const response = await fetch(`${API_BASE_URL}/api/tts`, {
+        const response = await fetch(`${API_BASE_URL}/api/tts-batch`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ text })
+            body: JSON.stringify({ lines: missing })
         });
+        if (!response.ok) {
+            return;
+        }
+
+        const data = await response.json();
+        data.results.forEach((result, index) => {
+            if (!result.success) {
+                return;
+            }
+            const bytes = Uint8Array.from(atob(result.audio), (char) => char.charCodeAt(0));
+            ttsPrefetchCache.set(missing[index], new Blob([bytes], { type: result.mimetype }));
+        });
+
+        while (ttsPrefetchCache.size > TTS_PREFETCH_CACHE_SIZE) {
+            ttsPrefetchCache.delete(ttsPrefetchCache.keys().next().value);
+        }
+    } catch (error) {
+        // Prefetch is best-effort; speakViaLocalTts fetches on demand.
+    }
+}
+
+async function speakFinnish(text, rate = 1) {
+    const localTtsPlayed = await speakViaLocalTts(text, rate);
+    if (localTtsPlayed) {
+        return;
+    }
+    speakViaBrowserTts(text, rate);
+}
 
+let ttsVoiceInfo = null;
+
+async function getLocalTtsAudioUrl(text, rate = 1) {
+    // The digest must match audio_key() in audio_store.py: sha256 of provider, voice and text, each NUL-terminated.
+    if (!window.crypto || !window.crypto.subtle || !window.TextEncoder) {
+        return null;
+    }
+
+    if (!ttsVoiceInfo) {
+        const response = await fetch(`${API_BASE_URL}/api/tts/info`);
         if (!response.ok) {
-            return false;
+            return null;
         }
+        ttsVoiceInfo = await response.json();
+    }
+    if (!ttsVoiceInfo.enabled) {
+        return null;
+    }
+
+    const trimmedText = text.trim();
+    const keyMaterial = new TextEncoder().encode(`${ttsVoiceInfo.provider}\0${ttsVoiceInfo.voice}\0${trimmedText}\0`);
+    const digestBuffer = await window.crypto.subtle.digest('SHA-256', keyMaterial);
+    const digest = Array.from(new Uint8Array(digestBuffer), (byte) => byte.toString(16).padStart(2, '0')).join('');
+    const rateParam = rate === 1 ? '' : `&rate=${rate}`;
+    return `${API_BASE_URL}/api/tts/${digest}?text=${encodeURIComponent(trimmedText)}${rateParam}`;
+}
 
-        const audioBlob = await response.blob();
+async function speakViaLocalTts(text, rate = 1) {
+    try {
+        // Prefetched clips are normal speed; other rates are derived server-side from the cached base clip.
+        let audioBlob = rate === 1 ? ttsPrefetchCache.get(text) : null;
+        const audioUrl = audioBlob ? null : await getLocalTtsAudioUrl(text, rate);
+        if (audioUrl) {
+            // GET URLs are immutable, so replays come straight from the browser HTTP cache.
+            if (ttsAudio) {
+                ttsAudio.pause();
+            }
+            ttsAudio = new Audio(audioUrl);
+            await ttsAudio.play();
+            return true;
+        }
+
+        if (!audioBlob) {
+            const response = await fetch(`${API_BASE_URL}/api/tts`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({ text, rate })
+            });
+
+            if (!response.ok) {
+                return false;
+            }
+
+            audioBlob = await response.blob();
+        }
         const blobUrl = URL.createObjectURL(audioBlob);
 
         if (ttsAudio) {
@@ -2258,31 +2356,71 @@ function showStatus(message, type = 'info') {
     }
 }
 
-async function translateViaAPI(text) {
+// Posts lines to the NDJSON streaming endpoint and calls onResult for each
+// line result as it arrives (cached lines first, in no particular order).
+// Resolves quietly when the signal aborts the request.
+async function streamTranslations(lines, signal, onResult) {
+    let response;
     try {
-        const response = await fetch(`${API_BASE_URL}/api/translate`, {
+        response = await fetch(`${API_BASE_URL}/api/translate-stream`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ text })
+            body: JSON.stringify({ lines }),
+            signal
         });
+    } catch (error) {
+        if (signal.aborted) {
+            return;
+        }
+        throw error;
+    }
 
-        const data = await response.json();
-        if (!response.ok || !data.success) {
-            throw new Error(data.error || 'Translation failed');
+    if (!response.ok) {
+        const data = await response.json().catch(() => ({}));
+        throw new Error(data.error || 'Translation failed');
+    }
+
+    const handleLine = (line) => {
+        if (!line.trim()) {
+            return;
+        }
+        const event = JSON.parse(line);
+        if (event.done) {
+            if (event.error) {
+                throw new Error(event.error);
+            }
+            return;
         }
+        onResult(event);
+    };
 
-        return {
-            success: true,
-            translation: data.translation,
-            service: data.service
-        };
+    try {
+        if (!response.body || !response.body.getReader) {
+            (await response.text()).split('\n').forEach(handleLine);
+            return;
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffered += decoder.decode(value, { stream: true });
+            const lines = buffered.split('\n');
+            buffered = lines.pop();
+            lines.forEach(handleLine);
+        }
+        handleLine(buffered + decoder.decode());
     } catch (error) {
-        return {
-            success: false,
-            error: error.message
-        };
+        if (signal.aborted) {
+            return;
+        }
+        throw error;
     }
 }
 
@@ -2331,41 +2469,52 @@ async function translateToEnglish() {
         <div class="progress-text" id="progressText">Starting translation...</div>
     `;
 
-    const translations = [];
+    const translations = new Array(finnishLines.length).fill('');
+    const requestIndexes = [];
     let successCount = 0;
     let failCount = 0;
+    let completedCount = 0;
 
-    try {
-        for (let i = 0; i < finnishLines.length; i++) {
-            if (translationCancelled) {
-                showStatus(`Translation cancelled after ${successCount} line(s).`, 'warning');
-                break;
-            }
-
-            const line = finnishLines[i];
-            if (line.length > MAX_CHARS_PER_LINE) {
-                translations.push('[Line too long]');
-                failCount += 1;
-                continue;
-            }
-
-            updateProgress(i + 1, finnishLines.length, line);
-            await new Promise((resolve) => setTimeout(resolve, 0));
-
-            const result = await translateViaAPI(line);
-            if (result.success) {
-                translations.push(result.translation);
-                successCount += 1;
-            } else {
-                translations.push('[Translation failed]');
-                failCount += 1;
-            }
+    finnishLines.forEach((line, index) => {
+        if (line.length > MAX_CHARS_PER_LINE) {
+            translations[index] = '[Line too long]';
+            failCount += 1;
+            completedCount += 1;
+        } else {
+            requestIndexes.push(index);
+        }
+    });
 
-            englishInput.value = translations.join('\n');
+    try {
+        translationAbortController = new AbortController();
+        updateProgress(completedCount, finnishLines.length, finnishLines[requestIndexes[0]] || '');
+
+        if (requestIndexes.length > 0) {
+            await streamTranslations(
+                requestIndexes.map((index) => finnishLines[index]),
+                translationAbortController.signal,
+                (result) => {
+                    const index = requestIndexes[result.index];
+                    if (index === undefined) {
+                        return;
+                    }
+                    if (result.success) {
+                        translations[index] = result.translation;
+                        successCount += 1;
+                    } else {
+                        translations[index] = '[Translation failed]';
+                        failCount += 1;
+                    }
+                    completedCount += 1;
+                    englishInput.value = translations.join('\n');
+                    updateProgress(completedCount, finnishLines.length, finnishLines[index]);
+                }
+            );
+        }
+        englishInput.value = translations.join('\n');
 
-            if (i < finnishLines.length - 1 && !translationCancelled) {
-                await new Promise((resolve) => setTimeout(resolve, 300));
-            }
+        if (translationCancelled) {
+            showStatus(`Translation cancelled after ${successCount} line(s).`, 'warning');
         }
 
         generateWorksheet();
@@ -2387,6 +2536,7 @@ async function translateToEnglish() {
     } finally {
         isTranslating = false;
         translationCancelled = false;
+        translationAbortController = null;
         translateBtn.textContent = 'Translate All Lines';
         translateBtn.style.opacity = '1';
         cancelBtn.style.display = 'none';
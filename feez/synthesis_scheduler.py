@@ -0,0 +1,97 @@
+import heapq
+import itertools
+import threading
+import time
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_PREFETCH = 1
+PRIORITY_BATCH = 2
+
+
+class SynthesisQueueFull(ConnectionError):
+    """Raised when a synthesis job cannot be admitted; carries a Retry-After hint."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SynthesisScheduler:
+    """Bounded admission control for synthesis jobs.
+
+    At most ``max_concurrent`` jobs run at once. Further jobs wait in a
+    priority queue of at most ``max_queue`` entries, served lowest priority
+    value first and FIFO within a priority. Jobs beyond that are rejected
+    immediately with ``SynthesisQueueFull`` instead of piling up until they
+    time out.
+    """
+
+    def __init__(self, max_concurrent, max_queue, max_wait_seconds=30):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue = max(0, int(max_queue))
+        self.max_wait_seconds = max_wait_seconds
+        self._condition = threading.Condition()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._average_seconds = 1.0
+        self.rejected = 0
+        self.completed = 0
+
+    def retry_after(self):
+        """Rough seconds until a slot frees up, for the Retry-After header."""
+        backlog = len(self._waiting) + self._active
+        estimate = self._average_seconds * backlog / self.max_concurrent
+        return max(1, int(estimate + 0.999))
+
+    def _acquire(self, priority):
+        with self._condition:
+            if self._active < self.max_concurrent and not self._waiting:
+                self._active += 1
+                return
+            if len(self._waiting) >= self.max_queue:
+                self.rejected += 1
+                raise SynthesisQueueFull('Synthesis queue is full', self.retry_after())
+
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            deadline = time.monotonic() + self.max_wait_seconds
+            while not (self._active < self.max_concurrent and self._waiting[0] == ticket):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._condition.notify_all()
+                    self.rejected += 1
+                    raise SynthesisQueueFull('Timed out waiting for a synthesis slot', self.retry_after())
+                self._condition.wait(remaining)
+            heapq.heappop(self._waiting)
+            self._active += 1
+            # Another slot may still be free for the next waiter in line.
+            self._condition.notify_all()
+
+    def _release(self, elapsed):
+        with self._condition:
+            self._active -= 1
+            self.completed += 1
+            self._average_seconds = 0.8 * self._average_seconds + 0.2 * elapsed
+            self._condition.notify_all()
+
+    def run(self, func, *args, priority=PRIORITY_INTERACTIVE):
+        self._acquire(priority)
+        started_at = time.monotonic()
+        try:
+            return func(*args)
+        finally:
+            self._release(time.monotonic() - started_at)
+
+    def stats(self):
+        with self._condition:
+            return {
+                'active': self._active,
+                'queued': len(self._waiting),
+                'maxConcurrent': self.max_concurrent,
+                'maxQueue': self.max_queue,
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
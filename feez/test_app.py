@@ -35,16 +35,16 @@ class TestFlaskApp(unittest.TestCase):
         response = self.client.post('/api/translate-batch', json={})
         self.assertEqual(response.status_code, 400)
 
-    @patch('app.translate_with_libretranslate')
+    @patch('app.translate_many_with_libretranslate')
     def test_translate_batch_success(self, mock_translate):
-        mock_translate.side_effect = ['Hello', 'Thank you']
+        mock_translate.return_value = ['Hello', 'Thank you']
         response = self.client.post('/api/translate-batch', json={'lines': ['Hei', 'Kiitos']})
         self.assertEqual(response.status_code, 200)
         data = json.loads(response.data)
         self.assertTrue(data['success'])
         self.assertEqual(len(data['results']), 2)
 
-    @patch('app.requests.post')
+    @patch('app.requests.Session.post')
     def test_translate_with_libretranslate_success(self, mock_post):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
@@ -54,7 +54,7 @@ class TestFlaskApp(unittest.TestCase):
         result = translate_with_libretranslate('Hei')
         self.assertEqual(result, 'Hello')
 
-    @patch('app.requests.post')
+    @patch('app.requests.Session.post')
     def test_translate_with_libretranslate_bad_payload(self, mock_post):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
@@ -1,7 +1,68 @@
+import base64
+import json
+import os
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from types import SimpleNamespace
+from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
-from app import app, synthesize_speech_with_local_tts, synthesize_speech_with_piper
+import requests
+from app import (
+    _default_synthesis_concurrency,
+    _libretranslate_session,
+    _translation_flight,
+    app,
+    get_lesson_by_id,
+    iter_translations,
+    segment_document_line,
+    synthesize_speech_with_local_tts,
+    synthesize_speech_with_piper,
+    translate_many_with_libretranslate,
+    translate_with_libretranslate,
+)
+from audio_packs import render_lessons
+from audio_codecs import encode_audio, mulaw_encode
+from audio_store import AudioStore, audio_key
+from audio_transforms import change_wav_rate
+from backend_pool import BackendPool
+from circuit_breaker import CircuitBreaker, CircuitOpenError, RetryBudget
+from http_sessions import SessionPool
+from memory_cache import LRUCache
+from piper_pool import PiperPool
+from request_hedging import RequestHedger
+from single_flight import SingleFlight
+from voice_registry import VoiceRegistry
+from translation_jobs import TranslationJobManager
+from translation_memory import TranslationMemory
+from translation_store import TranslationStore
+from synthesis_scheduler import PRIORITY_BATCH, SynthesisQueueFull, SynthesisScheduler
+from wav_utils import build_wav, parse_wav, pcm_format
+
+FAKE_PIPER_SCRIPT = '''#!{python}
+import json
+import sys
+
+for line in sys.stdin:
+    request = json.loads(line)
+    if request['text'] == 'crash':
+        sys.exit(1)
+    with open(request['output_file'], 'wb') as audio_file:
+        audio_file.write(b'RIFF' + request['text'].encode('utf-8'))
+    print(request['output_file'], flush=True)
+'''
+
+
+@pytest.fixture
+def fake_piper(tmp_path):
+    script_path = tmp_path / 'piper'
+    script_path.write_text(FAKE_PIPER_SCRIPT.format(python=sys.executable))
+    script_path.chmod(script_path.stat().st_mode | stat.S_IEXEC)
+    return str(script_path)
 
 
 @pytest.fixture
@@ -98,7 +159,7 @@ def test_translate_batch_too_many_lines(client):
 
 
 def test_translate_batch_success(client, mocker):
-    mocker.patch('app.translate_with_libretranslate', side_effect=['Hello', 'Thanks'])
+    mocker.patch('app.translate_many_with_libretranslate', return_value=['Hello', 'Thanks'])
     response = client.post('/api/translate-batch', json={'lines': ['Hei', 'Kiitos']})
     assert response.status_code == 200
     data = response.get_json()
@@ -108,7 +169,7 @@ def test_translate_batch_success(client, mocker):
 
 
 def test_translate_batch_mixed_results(client, mocker):
-    mocker.patch('app.translate_with_libretranslate', side_effect=['Hello', RuntimeError('bad')])
+    mocker.patch('app.translate_many_with_libretranslate', return_value=['Hello', RuntimeError('bad')])
     response = client.post('/api/translate-batch', json={'lines': ['Hei', 'Kiitos']})
     assert response.status_code == 200
     data = response.get_json()
@@ -116,6 +177,671 @@ def test_translate_batch_mixed_results(client, mocker):
     assert data['results'][1]['success'] is False
 
 
+def test_translate_batch_keeps_order_around_invalid_lines(client, mocker):
+    mock_translate = mocker.patch('app.translate_many_with_libretranslate', return_value=['Hello', ConnectionError('down')])
+    response = client.post('/api/translate-batch', json={'lines': ['Hei', '', 'Moi']})
+    results = response.get_json()['results']
+
+    mock_translate.assert_called_once_with(['Hei', 'Moi'], use_memory=True)
+    assert results[0]['translation'] == 'Hello'
+    assert results[1]['success'] is False
+    assert results[2] == {'success': False, 'translation': '', 'error': 'Service unavailable'}
+
+
+def test_lesson_bank_phrases_skip_libretranslate(client, mocker):
+    mock_translate = mocker.patch('app.translate_with_libretranslate')
+    mock_many = mocker.patch('app.translate_many_with_libretranslate', return_value=['Hello'])
+
+    response = client.post('/api/translate', json={'text': '  hyvää   HUOMENTA! '})
+    assert response.get_json() == {'success': True, 'translation': 'Good morning!', 'service': 'lesson-bank'}
+    mock_translate.assert_not_called()
+
+    response = client.post('/api/translate-batch', json={'lines': ['Mitä kuuluu?', 'Hei']})
+    results = response.get_json()['results']
+    assert results[0] == {'success': True, 'translation': 'How are you?', 'service': 'lesson-bank'}
+    assert results[1]['service'] == 'libretranslate'
+    mock_many.assert_called_once_with(['Hei'], use_memory=True)
+
+
+def _libretranslate_response(translated):
+    response = MagicMock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = {'translatedText': translated}
+    return response
+
+
+def test_translate_many_sends_one_array_request_and_deduplicates(mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+    mock_post = mocker.patch(
+        'app.requests.Session.post',
+        side_effect=lambda url, json, timeout: _libretranslate_response([line.upper() for line in json['q']]),
+    )
+
+    results = translate_many_with_libretranslate(['Hei', 'Moi', 'hei'])
+
+    assert results == ['HEI', 'MOI', 'HEI']
+    mock_post.assert_called_once()
+    assert mock_post.call_args.kwargs['json']['q'] == ['Hei', 'Moi']
+    assert translate_many_with_libretranslate(['Moi']) == ['MOI']
+    assert mock_post.call_count == 1
+
+
+def test_lru_cache_evicts_least_recently_used_within_byte_budget():
+    cache = LRUCache(max_entries=3, max_bytes=10)
+    cache.set('a', b'1234')
+    cache.set('b', b'1234')
+    assert cache.get('a') == b'1234'
+    cache.set('c', b'1234')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1234'
+    assert cache.set('huge', b'x' * 11) is False
+    stats = cache.stats()
+    assert stats['bytes'] == 8
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 1, 1)
+
+
+def test_lru_cache_expires_entries_in_background():
+    cache = LRUCache(ttl_seconds=0.05, sweep_interval=0.02)
+    cache.set('hei', 'hello')
+    deadline = time.time() + 2
+    while len(cache) and time.time() < deadline:
+        time.sleep(0.01)
+    cache.close()
+
+    assert len(cache) == 0
+    assert cache.stats()['expirations'] == 1
+
+
+def test_translation_store_bulk_lookup_is_scoped_by_language_and_provider(tmp_path):
+    store = TranslationStore(str(tmp_path / 'translations.sqlite3'))
+    store.set_many({'hei': 'Hello', 'moi': 'Hi'}, 'fi', 'en', 'libretranslate')
+    store.set('hei', 'Hallo', 'fi', 'de', 'libretranslate')
+
+    assert store.get_many(['hei', 'moi', 'kiitos'], 'fi', 'en', 'libretranslate') == {'hei': 'Hello', 'moi': 'Hi'}
+    assert store.get('hei', 'fi', 'de', 'libretranslate') == 'Hallo'
+    assert store.get('hei', 'fi', 'en', 'deepl') is None
+    assert TranslationStore(store.path).stats()['entries'] == 3
+
+
+def test_translation_store_keeps_count_and_purges_expired_rows(tmp_path, mocker):
+    store = TranslationStore(str(tmp_path / 'translations.sqlite3'), max_age_seconds=60)
+    store.set_many({'hei': 'Hello', 'moi': 'Hi'}, 'fi', 'en', 'libretranslate')
+    store.set('hei', 'Hello there', 'fi', 'en', 'libretranslate')
+    assert store.stats()['entries'] == 2
+
+    mocker.patch('translation_store.time.time', return_value=time.time() + 2 * 60 * 60)
+    assert store.get('hei', 'fi', 'en', 'libretranslate') is None
+    store.set('kiitos', 'Thanks', 'fi', 'en', 'libretranslate')
+    assert store.purge_expired() == 0, 'the write already purged the expired rows'
+    assert store.stats()['entries'] == 1
+    assert TranslationStore(store.path).stats()['entries'] == 1
+
+
+def test_translations_persist_across_memory_cache_resets(mocker, tmp_path):
+    mocker.patch('app.app_config', SimpleNamespace(
+        LIBRETRANSLATE_URL='http://translate.test/translate',
+        LIBRETRANSLATE_API_KEY=None,
+        TRANSLATION_STORE_PATH=str(tmp_path / 'translations.sqlite3'),
+    ))
+    mocker.patch('app._translation_cache', LRUCache())
+    mock_post = mocker.patch(
+        'app.requests.Session.post',
+        side_effect=lambda url, json, timeout: _libretranslate_response([line.upper() for line in json['q']]),
+    )
+    assert translate_many_with_libretranslate(['Hei', 'Moi']) == ['HEI', 'MOI']
+
+    mocker.patch('app._translation_cache', LRUCache())
+    assert translate_many_with_libretranslate(['Moi', 'Kiitos']) == ['MOI', 'KIITOS']
+    assert translate_with_libretranslate('hei') == 'HEI'
+
+    assert mock_post.call_count == 2
+    assert mock_post.call_args.kwargs['json']['q'] == ['Kiitos']
+
+
+def test_translation_memory_finds_near_duplicates_above_threshold():
+    memory = TranslationMemory(min_similarity=0.8, max_entries=3)
+    memory.add_many([
+        ('Me opiskelemme suomea.', 'We study Finnish.'),
+        ('Kissa istuu pöydällä.', 'The cat sits on the table.'),
+    ])
+
+    exact = memory.lookup('  KISSA istuu pöydällä!')
+    assert (exact.translation, exact.similarity) == ('The cat sits on the table.', 1.0)
+    near = memory.lookup('Me opiskelimme suomea')
+    assert near.translation == 'We study Finnish.'
+    assert 0.8 <= near.similarity < 1.0
+    assert memory.lookup('Junat ovat myöhässä.') is None
+
+    memory.add('Junat ovat myöhässä.', 'The trains are late.')
+    memory.add('Hyvää yötä.', 'Good night.')
+    assert len(memory) == 3
+    assert memory.lookup('Me opiskelemme suomea.') is None
+
+
+def test_translate_route_serves_translation_memory_match(client, mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+    mocker.patch('app._translation_memory', TranslationMemory(min_similarity=0.8))
+    mock_post = mocker.patch('app.requests.Session.post', return_value=_libretranslate_response('We study Finnish.'))
+    assert client.post('/api/translate', json={'text': 'Me opiskelemme suomea.'}).get_json()['service'] == 'libretranslate'
+
+    data = client.post('/api/translate', json={'text': 'me opiskelimme suomea'}).get_json()
+
+    assert data['service'] == 'translation-memory'
+    assert data['translation'] == 'We study Finnish.'
+    assert data['matchedText'] == 'Me opiskelemme suomea.'
+    assert 0.8 <= data['similarity'] < 1.0
+    assert mock_post.call_count == 1
+
+
+def test_translate_stream_emits_cached_lines_before_upstream_results(client, mocker):
+    cache = LRUCache()
+    cache.set('moi', 'Hi')
+    mocker.patch('app._translation_cache', cache)
+    mocker.patch('app._translation_memory', TranslationMemory())
+    mocker.patch(
+        'app.requests.Session.post',
+        side_effect=lambda url, json, timeout: _libretranslate_response([line.upper() for line in json['q']]),
+    )
+
+    response = client.post('/api/translate-stream', json={'lines': ['Kiitos', '', 'Moi', 'Hyvää huomenta!', 'kiitos']})
+    assert response.mimetype == 'application/x-ndjson'
+    events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert [event.get('index') for event in events[:3]] == [1, 3, 2]
+    assert events[1]['service'] == 'lesson-bank'
+    assert events[2]['translation'] == 'Hi'
+    assert {event['index']: event['translation'] for event in events[3:5]} == {0: 'KIITOS', 4: 'KIITOS'}
+    assert events[-1] == {'done': True, 'translated': 4, 'failed': 1}
+
+
+def test_closing_translation_stream_cancels_pending_chunks(mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+    mocker.patch('app.TRANSLATION_BULK_CHUNK_SIZE', 1)
+    second_started = threading.Event()
+    release = threading.Event()
+
+    def fake_post(url, json, timeout):
+        if json['q'] == ['Kaksi']:
+            second_started.set()
+            release.wait(5)
+        return _libretranslate_response([line.upper() for line in json['q']])
+
+    mock_post = mocker.patch('app.requests.Session.post', side_effect=fake_post)
+    translations = iter_translations(['Yksi', 'Kaksi', 'Kolme'], concurrency=1)
+    assert next(translations) == ('yksi', 'YKSI')
+    second_started.wait(5)
+    translations.close()
+    release.set()
+
+    deadline = time.time() + 2
+    while _translation_flight.stats()['inFlight'] and time.time() < deadline:
+        time.sleep(0.01)
+    assert mock_post.call_count == 2
+    assert _translation_flight.stats()['inFlight'] == 0
+
+
+def test_queued_stream_chunks_do_not_hold_lines_other_requests_need(mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+    mocker.patch('app.TRANSLATION_BULK_CHUNK_SIZE', 1)
+    second_started = threading.Event()
+    release = threading.Event()
+
+    def fake_post(url, json, timeout):
+        if json['q'] == ['Kaksi']:
+            second_started.set()
+            release.wait(10)
+        lines = json['q'] if isinstance(json['q'], list) else [json['q']]
+        translated = [line.upper() for line in lines]
+        return _libretranslate_response(translated if isinstance(json['q'], list) else translated[0])
+
+    mocker.patch('app.requests.Session.post', side_effect=fake_post)
+    translations = iter_translations(['Yksi', 'Kaksi', 'Kolme'], concurrency=1)
+    assert next(translations) == ('yksi', 'YKSI')
+    second_started.wait(5)
+
+    # 'Kolme' is still queued behind 'Kaksi', so this request fetches it itself.
+    interactive = {}
+    waiter = threading.Thread(target=lambda: interactive.update(result=translate_with_libretranslate('Kolme')))
+    waiter.start()
+    waiter.join(2)
+    answered_while_queued = 'result' in interactive
+    translations.close()
+    release.set()
+    waiter.join(5)
+    assert answered_while_queued
+    assert interactive.get('result') == 'KOLME'
+
+
+def test_background_job_does_not_hold_lines_interactive_requests_need(client, mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+    mocker.patch('app.TRANSLATION_BULK_CHUNK_SIZE', 1)
+    mocker.patch('app.app_config.TRANSLATION_JOB_CONCURRENCY', 1, create=True)
+    second_started = threading.Event()
+    release = threading.Event()
+
+    def fake_post(url, json, timeout):
+        if json['q'] == ['Toinen lause.']:
+            second_started.set()
+            release.wait(10)
+        lines = json['q'] if isinstance(json['q'], list) else [json['q']]
+        translated = [line.upper() for line in lines]
+        return _libretranslate_response(translated if isinstance(json['q'], list) else translated[0])
+
+    mocker.patch('app.requests.Session.post', side_effect=fake_post)
+    job_id = client.post(
+        '/api/translate-jobs', json={'lines': ['Ensimmäinen lause.', 'Toinen lause.', 'Kolmas lause.']}
+    ).get_json()['job']['id']
+    assert second_started.wait(5)
+
+    started = time.monotonic()
+    interactive = client.post('/api/translate', json={'text': 'Kolmas lause.'})
+    assert time.monotonic() - started < 2, 'must not wait for the job to reach its queued chunk'
+    assert client.delete(f'/api/translate-jobs/{job_id}').status_code == 200
+    release.set()
+
+    assert interactive.status_code == 200
+    assert interactive.get_json()['translation'] == 'KOLMAS LAUSE.'
+
+
+def test_segment_document_line_splits_sentences_and_long_runs():
+    assert segment_document_line('Hei! Mitä kuuluu?  Hyvää. ') == ['Hei!', 'Mitä kuuluu?', 'Hyvää.']
+    long_sentence = ' '.join(['sana'] * 100)
+    segments = segment_document_line(long_sentence)
+    assert all(len(segment) <= 300 for segment in segments)
+    assert ' '.join(segments) == long_sentence
+    assert segment_document_line('   ') == []
+
+
+def test_translation_job_translates_document_in_background(client, mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+    mocker.patch('app._translation_memory', TranslationMemory())
+    mock_post = mocker.patch(
+        'app.requests.Session.post',
+        side_effect=lambda url, json, timeout: _libretranslate_response([line.upper() for line in json['q']]),
+    )
+    document = 'Yksi. Kaksi.\n\nKaksi.\n' + '\n'.join(f'Rivi {number}' for number in range(80))
+
+    response = client.post('/api/translate-jobs', json={'text': document})
+    assert response.status_code == 202
+    job_id = response.get_json()['job']['id']
+    assert response.headers['Location'] == f'/api/translate-jobs/{job_id}'
+
+    events = [json.loads(line) for line in client.get(f'/api/translate-jobs/{job_id}/stream').get_data(as_text=True).splitlines()]
+    assert events[-1]['done'] is True
+    assert events[-1]['status'] == 'done'
+    assert len(events) == 84
+
+    job = client.get(f'/api/translate-jobs/{job_id}').get_json()['job']
+    assert job['completed'] == job['total'] == 83
+    assert job['results'][0]['translation'] == 'YKSI. KAKSI.'
+    assert job['results'][1] == {'success': True, 'translation': ''}
+    assert job['results'][2]['translation'] == 'KAKSI.'
+    sent = [line for call in mock_post.call_args_list for line in call.kwargs['json']['q']]
+    assert len(sent) == len(set(sent)) == 82
+
+
+def test_translation_job_rejects_oversized_documents_and_unknown_ids(client):
+    response = client.post('/api/translate-jobs', json={'lines': ['Hei'] * 5001})
+    assert response.status_code == 400
+    assert client.get('/api/translate-jobs/missing').status_code == 404
+    assert client.delete('/api/translate-jobs/missing').status_code == 404
+
+
+def test_translation_job_manager_cancels_and_expires_jobs():
+    release = threading.Event()
+
+    def run_job(job):
+        for index, line in enumerate(job.lines):
+            release.wait(5)
+            if job.cancel_requested:
+                return
+            job.add_result(index, {'success': True, 'translation': line.upper()})
+
+    manager = TranslationJobManager(run_job, max_workers=1, result_ttl_seconds=0.05)
+    running = manager.submit(['a', 'b'])
+    queued = manager.submit(['c'])
+    manager.cancel(queued.id)
+    manager.cancel(running.id)
+    release.set()
+
+    events, finished = running.events_since(0, timeout=5)
+    while not finished:
+        events, finished = running.events_since(0, timeout=5)
+    assert running.summary()['status'] == 'cancelled'
+    assert queued.summary()['status'] == 'cancelled'
+    time.sleep(0.1)
+    assert manager.get(running.id) is None
+    manager.close()
+
+
+def test_circuit_breaker_opens_probes_and_closes():
+    breaker = CircuitBreaker('upstream', failure_threshold=2, open_seconds=0.05, max_open_seconds=1)
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_after >= 1
+
+    time.sleep(0.06)
+    assert breaker.state == 'half-open'
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    time.sleep(0.11)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.stats()['trips'] == 2
+
+
+def test_retry_budget_limits_retries_to_share_of_calls():
+    budget = RetryBudget(ratio=0.5, min_retries=1, window_seconds=10)
+    for _ in range(4):
+        budget.record_call()
+    assert [budget.try_retry() for _ in range(4)] == [True, True, True, False]
+    assert budget.stats()['denied'] == 1
+
+
+def test_open_circuit_fails_translation_fast_with_retry_after(client, mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+    breaker = CircuitBreaker('libretranslate', failure_threshold=1, open_seconds=30)
+    mocker.patch.dict('app._circuit_breakers', {'libretranslate': breaker})
+    mock_post = mocker.patch('app.requests.Session.post', side_effect=requests.ConnectionError('refused'))
+
+    first = client.post('/api/translate', json={'text': 'Tämä ei käänny'})
+    second = client.post('/api/translate', json={'text': 'Eikä tämäkään'})
+
+    assert first.status_code == second.status_code == 503
+    assert mock_post.call_count == 1
+    assert int(second.headers['Retry-After']) >= 20
+    assert client.get('/api/stats').get_json()['upstreams']['libretranslate']['state'] == 'open'
+
+
+def test_backend_pool_routes_to_least_loaded_and_ejects_failing_backends():
+    pool = BackendPool(['http://a', 'http://b'], max_failures=2, eject_seconds=30)
+    first = pool.acquire()
+    second = pool.acquire()
+    assert {first.url, second.url} == {'http://a', 'http://b'}
+    pool.release(first, 0.1)
+    assert pool.acquire() is first
+    pool.release(first, 0.1)
+    pool.release(second, 0.1)
+
+    failing = pool.backends[0]
+    for _ in range(2):
+        pool.release(pool.acquire(exclude={'http://b'}))
+    assert [backend['available'] for backend in pool.stats()] == [False, True]
+    assert pool.acquire().url == 'http://b'
+
+    for _ in range(3):
+        pool.release(pool.backends[1])
+    assert pool.stats()[1]['available'], 'the last available backend is never ejected'
+    assert failing.ejections == 1
+
+
+def test_backend_pool_judges_slowness_per_line():
+    pool = BackendPool(['http://a', 'http://b'], slow_seconds=1)
+    for _ in range(3):
+        pool.release(pool.acquire(exclude={'http://b'}), 12.0, lines=25)
+    assert [backend['available'] for backend in pool.stats()] == [True, True]
+
+    pool.release(pool.acquire(exclude={'http://b'}), 3.0)
+    assert [backend['available'] for backend in pool.stats()] == [False, True]
+
+
+def test_backend_pool_latency_percentile_ignores_bulk_calls():
+    pool = BackendPool(['http://a'], slow_seconds=0)
+    for _ in range(30):
+        pool.release(pool.acquire(), 0.2)
+        pool.release(pool.acquire(), 8.0, lines=25)
+    assert pool.latency_percentile(95) == 0.2
+
+
+def test_backend_pool_health_probe_takes_backends_out_of_rotation():
+    down = {'http://b'}
+    pool = BackendPool(['http://a', 'http://b'], probe=lambda url: url not in down)
+    pool.check_health()
+    assert {pool.acquire().url for _ in range(3)} == {'http://a'}
+
+    down.clear()
+    pool.check_health()
+    assert pool.acquire().url == 'http://b'
+
+
+def test_translation_retries_on_another_libretranslate_backend(mocker):
+    mocker.patch('app.app_config', SimpleNamespace(
+        LIBRETRANSLATE_URL='http://translate.test/translate',
+        LIBRETRANSLATE_URLS=['http://one.test/translate', 'http://two.test/translate'],
+        LIBRETRANSLATE_API_KEY=None,
+        LIBRETRANSLATE_HEALTH_CHECK_INTERVAL_SECONDS=0,
+    ))
+    mocker.patch('app._translation_cache', LRUCache())
+    mocker.patch('app.time.sleep')
+    mocker.patch.dict('app._libretranslate_pools', clear=True)
+    calls = []
+
+    def post(url, json, timeout):
+        calls.append(url)
+        if len(calls) == 1:
+            raise requests.ConnectionError('refused')
+        return _libretranslate_response(['Hello'])
+
+    mocker.patch('app.requests.Session.post', side_effect=post)
+
+    assert translate_many_with_libretranslate(['Hei']) == ['Hello']
+    assert len(set(calls)) == 2
+
+
+def test_request_hedger_uses_first_answer_within_budget():
+    hedger = RequestHedger(RetryBudget(ratio=0, min_retries=1), max_workers=4)
+    answers = iter([(0.3, 'slow'), (0, 'fast'), (0.05, 'slow again')])
+
+    def call():
+        delay, answer = next(answers)
+        time.sleep(delay)
+        return answer
+
+    assert hedger.run(call, delay=0.02) == 'fast'
+    assert hedger.run(call, delay=0.01) == 'slow again', 'no budget left to hedge'
+    assert hedger.stats()['hedged'] == 1
+    assert hedger.stats()['hedgeWins'] == 1
+    hedger.close()
+
+
+def test_request_hedger_runs_primaries_unqueued_and_skips_hedges_when_busy():
+    hedger = RequestHedger(RetryBudget(ratio=1, min_retries=10), max_workers=1)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as callers:
+        results = list(callers.map(lambda index: hedger.run(lambda: time.sleep(0.2) or index, delay=0.05), range(4)))
+
+    assert results == [0, 1, 2, 3]
+    assert time.monotonic() - started < 0.6, 'primaries must not wait for the single hedge worker'
+    stats = hedger.stats()
+    assert stats['hedged'] >= 1
+    assert stats['hedged'] + stats['skippedBusy'] == 4
+    hedger.close()
+
+
+def test_slow_translation_is_hedged_to_another_backend(mocker):
+    mocker.patch('app.app_config', SimpleNamespace(
+        LIBRETRANSLATE_URL='http://translate.test/translate',
+        LIBRETRANSLATE_URLS=['http://one.test/translate', 'http://two.test/translate'],
+        LIBRETRANSLATE_API_KEY=None,
+        LIBRETRANSLATE_HEALTH_CHECK_INTERVAL_SECONDS=0,
+        LIBRETRANSLATE_HEDGE_PERCENTILE=95,
+        LIBRETRANSLATE_HEDGE_DELAY_SECONDS=0.05,
+    ))
+    mocker.patch('app._translation_cache', LRUCache())
+    mocker.patch.dict('app._libretranslate_pools', clear=True)
+    hedger = RequestHedger(RetryBudget(ratio=0, min_retries=1))
+    mocker.patch('app._translation_hedger', hedger)
+    calls = []
+
+    def post(url, json, timeout):
+        calls.append(url)
+        if len(calls) == 1:
+            time.sleep(0.3)
+            return _libretranslate_response('Hello slowly')
+        return _libretranslate_response('Hello')
+
+    mocker.patch('app.requests.Session.post', side_effect=post)
+
+    assert translate_with_libretranslate('Hei hedge') == 'Hello'
+    assert len(set(calls)) == 2
+    assert hedger.stats()['hedgeWins'] == 1
+    hedger.close()
+
+
+def test_session_pool_reuses_one_session_per_upstream():
+    pool = SessionPool(pool_size=4)
+    session = pool.get('libretranslate')
+    assert pool.get('libretranslate') is session
+    assert pool.get('opentts') is not session
+    assert session.get_adapter('https://libretranslate.com')._pool_maxsize == 4
+
+    pool.close()
+    assert pool.get('libretranslate') is not session
+
+
+def test_libretranslate_backends_keep_their_own_connection_pools():
+    urls = ['http://localhost:5001/translate', 'http://localhost:5002/translate']
+    pools = [
+        _libretranslate_session(url).get_adapter(url).poolmanager.connection_from_url(url)
+        for url in urls + urls
+    ]
+    assert pools[0] is pools[2] and pools[1] is pools[3]
+
+
+def test_translation_uses_separate_connect_and_read_timeouts(mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+    mock_post = mocker.patch('app.requests.Session.post', return_value=_libretranslate_response(['Hello']))
+
+    translate_many_with_libretranslate(['Hei'])
+
+    connect_timeout, read_timeout = mock_post.call_args.kwargs['timeout']
+    assert connect_timeout < read_timeout
+
+
+def test_translate_many_splits_failing_chunk(mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+
+    def fake_post(url, json, timeout):
+        if 'Huono' in json['q']:
+            error_response = MagicMock()
+            error_response.raise_for_status.side_effect = requests.HTTPError(
+                '400 Bad Request', response=MagicMock(status_code=400)
+            )
+            return error_response
+        return _libretranslate_response([line.upper() for line in json['q']])
+
+    mock_post = mocker.patch('app.requests.Session.post', side_effect=fake_post)
+
+    results = translate_many_with_libretranslate(['Hei', 'Moi', 'Huono', 'Kiitos'])
+
+    assert results[:2] == ['HEI', 'MOI']
+    assert isinstance(results[2], RuntimeError)
+    assert results[3] == 'KIITOS'
+    # [all four] -> [Hei, Moi] ok + [Huono, Kiitos] -> [Huono] fails, [Kiitos] ok
+    assert mock_post.call_count == 5
+
+
+def test_translate_many_fails_rate_limited_chunk_without_splitting(mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+    mocker.patch('app.time.sleep')
+    error_response = MagicMock()
+    error_response.raise_for_status.side_effect = requests.HTTPError(
+        '429 Too Many Requests', response=MagicMock(status_code=429)
+    )
+    mock_post = mocker.patch('app.requests.Session.post', return_value=error_response)
+
+    results = translate_many_with_libretranslate(['Hei', 'Moi', 'Huono', 'Kiitos'])
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert mock_post.call_count <= 3, 'retried as one chunk, never split into smaller requests'
+
+
+def test_single_flight_shares_result_and_error():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(value):
+        calls.append(value)
+        release.wait(5)
+        if value == 'fail':
+            raise ConnectionError('upstream down')
+        return value.upper()
+
+    results = []
+    errors = []
+
+    def run(key):
+        try:
+            results.append(flight.do(key, slow_fetch, key))
+        except ConnectionError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(key,)) for key in ['hei'] * 3 + ['fail'] * 2]
+    for thread in threads:
+        thread.start()
+    while flight.stats()['callsSaved'] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls) == ['fail', 'hei']
+    assert results == ['HEI'] * 3
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert flight.stats() == {'inFlight': 0, 'upstreamCalls': 2, 'callsSaved': 3}
+
+
+def test_bulk_translation_waits_for_in_flight_single_translation(mocker):
+    mocker.patch('app._translation_cache', LRUCache())
+    single_started = threading.Event()
+    release = threading.Event()
+
+    def fake_post(url, json, timeout):
+        if json['q'] == 'Hei':
+            single_started.set()
+            release.wait(5)
+            return _libretranslate_response('Hello')
+        return _libretranslate_response([line.upper() for line in json['q']])
+
+    mock_post = mocker.patch('app.requests.Session.post', side_effect=fake_post)
+    single_results = []
+    single = threading.Thread(target=lambda: single_results.append(translate_with_libretranslate('Hei')))
+    single.start()
+    single_started.wait(5)
+
+    bulk = threading.Thread(target=lambda: single_results.append(translate_many_with_libretranslate(['hei', 'Moi'])))
+    bulk.start()
+    while mock_post.call_count < 2:
+        time.sleep(0.01)
+    release.set()
+    single.join()
+    bulk.join()
+
+    assert 'Hello' in single_results
+    assert ['Hello', 'MOI'] in single_results
+    assert mock_post.call_count == 2
+    assert mock_post.call_args_list[1].kwargs['json']['q'] == ['Moi']
+
+
+def test_stats_endpoint_reports_single_flight_counters(client):
+    response = client.get('/api/stats')
+    data = response.get_json()
+    assert response.status_code == 200
+    assert set(data['singleFlight']) == {'translation', 'tts'}
+    assert 'callsSaved' in data['singleFlight']['tts']
+
+
 def test_tts_missing_text(client):
     response = client.post('/api/tts', json={})
     assert response.status_code == 400
@@ -135,6 +861,226 @@ def test_tts_unavailable(client, mocker):
     assert response.status_code == 503
 
 
+def test_tts_get_by_digest_is_cacheable(client, mocker):
+    mocker.patch('app.app_config', SimpleNamespace(
+        LOCAL_TTS_ENABLED=True,
+        LOCAL_TTS_PROVIDER='piper',
+        PIPER_MODEL_PATH='voices/fi_FI-harri-medium.onnx',
+    ))
+    mocker.patch('app.synthesize_speech_with_local_tts', return_value=(b'RIFF....', 'audio/wav'))
+    info = client.get('/api/tts/info').get_json()
+    digest = audio_key(info['provider'], info['voice'], 'Hei')
+
+    response = client.get(f'/api/tts/{digest}', query_string={'text': 'Hei'})
+    assert response.status_code == 200
+    assert response.data == b'RIFF....'
+    assert response.headers['ETag'] == f'"{digest}"'
+    assert 'immutable' in response.headers['Cache-Control']
+
+    revalidated = client.get(
+        f'/api/tts/{digest}',
+        query_string={'text': 'Hei'},
+        headers={'If-None-Match': f'"{digest}"'},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+
+
+def test_tts_get_by_digest_rejects_mismatched_text(client, mocker):
+    mocker.patch('app.app_config', SimpleNamespace(LOCAL_TTS_ENABLED=True, LOCAL_TTS_PROVIDER='piper'))
+    digest = audio_key('piper', '', 'Moi')
+    response = client.get(f'/api/tts/{digest}', query_string={'text': 'Hei'})
+    assert response.status_code == 404
+
+
+def test_tts_get_by_digest_without_text_stores_derived_variants(client, mocker, tmp_path):
+    wav_format = pcm_format(1, 22050, 16)
+    base_pcm = b''.join(int(3000 * (index % 50) / 50).to_bytes(2, 'little', signed=True) for index in range(22050))
+    store = AudioStore(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    digest = audio_key('piper', '', 'Hei')
+    store.set(digest, build_wav(wav_format, base_pcm), 'audio/wav')
+    mocker.patch('app.app_config', SimpleNamespace(LOCAL_TTS_ENABLED=True, LOCAL_TTS_PROVIDER='piper'))
+    mocker.patch('app._get_audio_store', return_value=store)
+    mocker.patch('app._tts_cache', LRUCache())
+    mock_rate = mocker.patch('app.change_wav_rate', wraps=change_wav_rate)
+    mock_encode = mocker.patch('app.encode_audio', wraps=encode_audio)
+
+    first = client.get(f'/api/tts/{digest}', query_string={'rate': '0.5', 'format': 'ulaw'})
+    mocker.patch('app._tts_cache', LRUCache())
+    again = client.get(f'/api/tts/{digest}', query_string={'rate': '0.5', 'format': 'ulaw'})
+
+    assert first.status_code == 200
+    assert again.data == first.data
+    assert parse_wav(first.data)[0].audio_format == 7
+    assert mock_rate.call_count == 1
+    assert mock_encode.call_count == 1
+
+
+def test_tts_rate_variant_derived_from_cached_base(client, mocker):
+    wav_format = pcm_format(1, 22050, 16)
+    base_pcm = b''.join(int(3000 * (index % 50) / 50).to_bytes(2, 'little', signed=True) for index in range(22050))
+    mocker.patch('app.app_config', SimpleNamespace(LOCAL_TTS_ENABLED=True, LOCAL_TTS_PROVIDER='piper'))
+    mocker.patch('app._tts_cache', LRUCache())
+    mock_piper = mocker.patch('app.synthesize_speech_with_piper', return_value=(build_wav(wav_format, base_pcm), 'audio/wav'))
+
+    slow = client.post('/api/tts', json={'text': 'Hei', 'rate': 0.5})
+    again = client.post('/api/tts', json={'text': 'Hei', 'rate': 0.5})
+    fast = client.post('/api/tts', json={'text': 'Hei', 'rate': 2})
+
+    assert slow.status_code == 200
+    slow_format, slow_pcm = parse_wav(slow.data)
+    assert slow_format == wav_format
+    assert len(slow_pcm) == 2 * len(base_pcm)
+    assert again.data == slow.data
+    assert len(parse_wav(fast.data)[1]) == len(base_pcm) // 2
+    mock_piper.assert_called_once()
+
+
+def test_tts_compact_format_negotiated_and_cached(client, mocker):
+    wav_format = pcm_format(1, 22050, 16)
+    base_pcm = b''.join(int(3000 * (index % 50) / 50).to_bytes(2, 'little', signed=True) for index in range(22050))
+    mocker.patch('app.app_config', SimpleNamespace(LOCAL_TTS_ENABLED=True, LOCAL_TTS_PROVIDER='piper'))
+    mocker.patch('app._tts_cache', LRUCache())
+    mocker.patch('app.synthesize_speech_with_piper', return_value=(build_wav(wav_format, base_pcm), 'audio/wav'))
+    mock_encode = mocker.patch('app.encode_audio', wraps=encode_audio)
+
+    ulaw = client.post('/api/tts', json={'text': 'Hei'}, headers={'Accept': 'audio/wav; codec=ulaw, audio/wav;q=0.5'})
+    again = client.post('/api/tts', json={'text': 'Hei'}, headers={'Accept': 'audio/wav; codec=ulaw'})
+    adpcm = client.post('/api/tts?format=adpcm', json={'text': 'Hei'})
+
+    ulaw_format, ulaw_data = parse_wav(ulaw.data)
+    assert ulaw_format.audio_format == 7
+    assert ulaw_format.sample_rate == 16000
+    assert len(ulaw_data) == 16000
+    assert again.data == ulaw.data
+    assert parse_wav(adpcm.data)[0].audio_format == 0x11
+    assert len(adpcm.data) < len(base_pcm) / 3
+    assert mock_encode.call_count == 2
+
+
+def test_tts_unknown_format(client):
+    response = client.post('/api/tts', json={'text': 'Hei', 'format': 'flac'})
+    assert response.status_code == 400
+
+
+def test_mulaw_encode_reference_values():
+    samples = np.array([0, 32767, -32768, -1], dtype=np.int16)
+    assert mulaw_encode(samples) == bytes([0xFF, 0x80, 0x00, 0x7F])
+
+
+def test_tts_rate_out_of_range(client):
+    response = client.post('/api/tts', json={'text': 'Hei', 'rate': 5})
+    assert response.status_code == 400
+
+
+def test_tts_queue_full_returns_retry_after(client, mocker):
+    mocker.patch(
+        'app.synthesize_speech_with_local_tts',
+        side_effect=SynthesisQueueFull('Synthesis queue is full', retry_after=7),
+    )
+    response = client.post('/api/tts', json={'text': 'Hei'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '7'
+
+
+def test_synthesis_scheduler_prioritizes_interactive_and_bounds_queue():
+    scheduler = SynthesisScheduler(max_concurrent=1, max_queue=2, max_wait_seconds=5)
+    release_first = threading.Event()
+    order = []
+
+    def job(name):
+        if name == 'first':
+            release_first.wait(5)
+        order.append(name)
+
+    threads = [threading.Thread(target=scheduler.run, args=(job, 'first'))]
+    threads[0].start()
+    while scheduler.stats()['active'] == 0:
+        time.sleep(0.01)
+
+    threads.append(threading.Thread(target=scheduler.run, args=(job, 'batch'), kwargs={'priority': PRIORITY_BATCH}))
+    threads[1].start()
+    while scheduler.stats()['queued'] < 1:
+        time.sleep(0.01)
+    threads.append(threading.Thread(target=scheduler.run, args=(job, 'interactive')))
+    threads[2].start()
+    while scheduler.stats()['queued'] < 2:
+        time.sleep(0.01)
+
+    with pytest.raises(SynthesisQueueFull):
+        scheduler.run(job, 'rejected')
+
+    release_first.set()
+    for thread in threads:
+        thread.join(5)
+    assert order == ['first', 'interactive', 'batch']
+    assert scheduler.stats()['rejected'] == 1
+
+
+def test_default_synthesis_concurrency_is_capped_at_piper_workers(client, mocker):
+    mocker.patch('app.os.cpu_count', return_value=16)
+    mocker.patch('app.app_config.LOCAL_TTS_PROVIDER', 'piper', create=True)
+    mocker.patch('app.app_config.PIPER_POOL_SIZE', 2, create=True)
+    mocker.patch('app.app_config.PIPER_MAX_RESIDENT_VOICES', 3, create=True)
+    assert _default_synthesis_concurrency() == 6
+
+    mocker.patch('app.app_config.PIPER_POOL_SIZE', 0, create=True)
+    assert _default_synthesis_concurrency() == 16
+
+    response = client.get('/api/stats')
+    assert {'active', 'queued', 'maxConcurrent', 'rejected'} <= set(response.get_json()['synthesisScheduler'])
+
+
+def test_tts_batch_mixed_results(client, mocker):
+    def fake_tts(text, priority=None, rate=1.0, voice=None, audio_format='wav'):
+        if text == 'Kiitos':
+            raise ConnectionError('down')
+        return b'RIFF' + text.encode('utf-8'), 'audio/wav'
+
+    mock_tts = mocker.patch('app.synthesize_speech_with_local_tts', side_effect=fake_tts)
+    response = client.post('/api/tts-batch', json={'lines': ['Hei', 'Kiitos', '', ' Hei ']})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert results[0]['success'] is True
+    assert base64.b64decode(results[0]['audio']) == b'RIFFHei'
+    assert results[0]['mimetype'] == 'audio/wav'
+    assert results[1] == {'success': False, 'audio': '', 'error': 'Service unavailable'}
+    assert results[2]['success'] is False
+    assert results[3] == results[0]
+    assert mock_tts.call_count == 2
+
+
+def test_tts_batch_too_many_lines(client):
+    response = client.post('/api/tts-batch', json={'lines': ['Hei'] * 21})
+    assert response.status_code == 400
+
+
+def test_wav_round_trip():
+    wav_format = pcm_format(1, 22050, 16)
+    wav_bytes = build_wav(wav_format, b'\x01\x00\x02\x00')
+    assert parse_wav(wav_bytes) == (wav_format, b'\x01\x00\x02\x00')
+
+
+def test_tts_stream_sends_segments_and_caches_result(client, mocker):
+    wav_format = pcm_format(1, 22050, 16)
+    mocker.patch('app.app_config', SimpleNamespace(LOCAL_TTS_ENABLED=True, LOCAL_TTS_PROVIDER='piper'))
+    mocker.patch('app._tts_cache', LRUCache())
+    mock_piper = mocker.patch('app.synthesize_speech_with_piper', side_effect=[
+        (build_wav(wav_format, b'\x01\x00'), 'audio/wav'),
+        (build_wav(wav_format, b'\x02\x00'), 'audio/wav'),
+    ])
+
+    response = client.post('/api/tts', json={'text': 'Hei! Mitä kuuluu?', 'stream': True})
+    assert response.status_code == 200
+    assert response.mimetype == 'audio/wav'
+    assert response.data.endswith(b'\x01\x00\x02\x00')
+    assert [call.args[0] for call in mock_piper.call_args_list] == ['Hei!', 'Mitä kuuluu?']
+
+    cached_audio, _content_type = synthesize_speech_with_local_tts('Hei! Mitä kuuluu?')
+    assert parse_wav(cached_audio) == (wav_format, b'\x01\x00\x02\x00')
+    assert mock_piper.call_count == 2
+
+
 def test_lessons_list_success(client):
     response = client.get('/api/lessons')
     assert response.status_code == 200
@@ -151,6 +1097,18 @@ def test_lessons_filter_by_level(client):
     assert all(lesson['level'] == 'A1' for lesson in data['lessons'])
 
 
+def test_lessons_filter_by_grammar_and_theme_from_indexes(client):
+    greetings = client.get('/api/lessons/a1-01-greetings-introductions').get_json()['lesson']
+    response = client.get('/api/lessons', query_string={'level': 'a1', 'grammar': greetings['grammar'][0].upper()})
+    lessons = response.get_json()['lessons']
+    assert 'a1-01-greetings-introductions' in [lesson['id'] for lesson in lessons]
+    assert all(lesson['level'] == 'A1' and greetings['grammar'][0] in lesson['grammar'] for lesson in lessons)
+
+    by_theme = client.get('/api/lessons', query_string={'theme': f"  {greetings['theme']} "}).get_json()['lessons']
+    assert all(lesson['theme'] == greetings['theme'] for lesson in by_theme)
+    assert client.get('/api/lessons?level=Z9').get_json()['lessons'] == []
+
+
 def test_lesson_detail_success(client):
     response = client.get('/api/lessons/a1-01-greetings-introductions')
     assert response.status_code == 200
@@ -160,12 +1118,39 @@ def test_lesson_detail_success(client):
     assert len(data['lesson']['items']) == 8
 
 
+def test_lesson_items_pages_through_annotated_level_items(client):
+    a1_lessons = client.get('/api/lessons?level=A1').get_json()['lessons']
+    items, offset = [], 0
+    while offset is not None:
+        page = client.get('/api/lessons/items', query_string={'level': 'A1', 'offset': offset, 'limit': 700}).get_json()
+        assert len(page['items']) <= 700
+        items.extend(page['items'])
+        offset = page['nextOffset']
+
+    assert len(items) == page['total'] == sum(lesson['itemCount'] for lesson in a1_lessons)
+    first_lesson = client.get(f"/api/lessons/{a1_lessons[0]['id']}").get_json()['lesson']
+    assert items[0] == {
+        **first_lesson['items'][0],
+        'lessonCode': first_lesson['code'],
+        'lessonTitle': first_lesson['title'],
+        'lessonLevel': 'A1',
+        'lessonTheme': first_lesson['theme'],
+    }
+    assert client.get('/api/lessons/items?level=all&limit=1').get_json()['total'] > len(items)
+    assert client.get('/api/lessons/items?limit=0').status_code == 400
+
+
 def test_lesson_detail_not_found(client):
     response = client.get('/api/lessons/does-not-exist')
     assert response.status_code == 404
 
 
 def test_synthesize_speech_with_piper_success(mocker):
+    mocker.patch('app.app_config', SimpleNamespace(
+        PIPER_POOL_SIZE=0,
+        PIPER_BINARY_PATH='/opt/piper/piper',
+        PIPER_MODEL_PATH='/opt/piper/fi_FI-harri-medium.onnx',
+    ))
     mocker.patch('app.os.path.isfile', return_value=True)
     mock_run = mocker.patch('app.subprocess.run')
     mock_run.return_value = SimpleNamespace(returncode=0, stdout=b'RIFFDATA', stderr=b'')
@@ -184,4 +1169,212 @@ def test_synthesize_speech_with_local_tts_routes_to_piper(mocker):
     result = synthesize_speech_with_local_tts('Hei')
 
     assert result == (b'RIFFDATA', 'audio/wav')
-    mock_piper.assert_called_once_with('Hei')
+    mock_piper.assert_called_once_with('Hei', None)
+
+
+def test_piper_pool_reuses_workers(fake_piper):
+    pool = PiperPool([fake_piper], size=1, timeout=5, health_interval=0)
+    try:
+        assert pool.synthesize('Hei') == (b'RIFFHei', 'audio/wav')
+        assert pool.synthesize('Moi') == (b'RIFFMoi', 'audio/wav')
+        stats = pool.stats()
+        assert stats['jobs'] == 2
+        assert stats['restarts'] == 0
+    finally:
+        pool.close()
+
+
+def test_piper_pool_restarts_crashed_worker(fake_piper):
+    pool = PiperPool([fake_piper], size=1, timeout=5, health_interval=0)
+    try:
+        with pytest.raises(ConnectionError):
+            pool.synthesize('crash')
+        assert pool.synthesize('Hei') == (b'RIFFHei', 'audio/wav')
+        assert pool.stats()['restarts'] == 1
+        assert os.listdir(pool.output_dir) == []
+    finally:
+        pool.close()
+
+
+def test_piper_pool_keeps_worker_when_restart_fails(fake_piper, tmp_path):
+    pool = PiperPool([fake_piper], size=1, timeout=5, health_interval=0)
+    worker = pool._workers[0]
+    try:
+        worker.process.kill()
+        worker.process.wait()
+        worker.command = [str(tmp_path / 'missing-piper')]
+        with pytest.raises(ConnectionError):
+            pool.synthesize('Hei')
+        assert pool.stats()['idle'] == 1
+
+        worker.command = [fake_piper]
+        pool.health_check()
+        assert pool.synthesize('Hei') == (b'RIFFHei', 'audio/wav')
+    finally:
+        pool.close()
+
+
+def test_piper_pool_stops_started_workers_when_init_fails(fake_piper, mocker):
+    started = MagicMock()
+    mocker.patch('piper_pool.PiperWorker', side_effect=[started, OSError('no model')])
+    with pytest.raises(OSError):
+        PiperPool([fake_piper], size=2, health_interval=0)
+    started.stop.assert_called_once()
+
+
+def test_audio_store_round_trip_and_eviction(tmp_path):
+    store = AudioStore(str(tmp_path), max_bytes=100)
+    first_key = audio_key('piper', 'fi_FI-harri-medium.onnx', 'Hei')
+    second_key = audio_key('piper', 'fi_FI-harri-medium.onnx', 'Moi')
+    assert first_key != second_key
+
+    store.set(first_key, b'RIFF' + b'a' * 60, 'audio/wav')
+    assert store.get(first_key) == (b'RIFF' + b'a' * 60, 'audio/wav')
+
+    store.set(second_key, b'RIFF' + b'b' * 60, 'audio/wav')
+    assert store.get(first_key) is None
+    assert store.get(second_key) == (b'RIFF' + b'b' * 60, 'audio/wav')
+
+
+def test_synthesize_speech_with_local_tts_uses_disk_store(mocker, tmp_path):
+    mocker.patch('app.app_config', SimpleNamespace(
+        LOCAL_TTS_ENABLED=True,
+        LOCAL_TTS_PROVIDER='piper',
+        PIPER_MODEL_PATH='voices/fi_FI-harri-medium.onnx',
+        TTS_AUDIO_CACHE_DIR=str(tmp_path),
+    ))
+    mocker.patch('app._tts_cache', LRUCache())
+    mock_piper = mocker.patch('app.synthesize_speech_with_piper', return_value=(b'RIFFDISK', 'audio/wav'))
+
+    assert synthesize_speech_with_local_tts('Hyvää yötä') == (b'RIFFDISK', 'audio/wav')
+    mocker.patch('app._tts_cache', LRUCache())
+    assert synthesize_speech_with_local_tts('Hyvää yötä') == (b'RIFFDISK', 'audio/wav')
+    mock_piper.assert_called_once()
+
+
+def test_lesson_audio_pack_served_with_range(client, mocker, tmp_path):
+    mocker.patch('app.get_audio_pack_dir', return_value=str(tmp_path))
+    lesson = get_lesson_by_id('a1-01-greetings-introductions')
+    written, failed = render_lessons(
+        [lesson],
+        lambda text: (b'RIFF' + text.encode('utf-8'), 'audio/wav'),
+        str(tmp_path),
+        workers=2,
+    )
+    assert written == [lesson['id']]
+    assert failed == []
+
+    index_response = client.get(f'/api/lessons/{lesson["id"]}/audio-pack/index')
+    assert index_response.status_code == 200
+    entry = index_response.get_json()['pack']['items'][1]
+    assert entry['finnish'] == lesson['items'][1]['finnish']
+
+    start = entry['offset']
+    end = start + entry['length'] - 1
+    range_response = client.get(
+        f'/api/lessons/{lesson["id"]}/audio-pack',
+        headers={'Range': f'bytes={start}-{end}'},
+    )
+    assert range_response.status_code == 206
+    assert range_response.data == b'RIFF' + entry['finnish'].encode('utf-8')
+
+
+def test_lesson_audio_pack_missing(client, mocker, tmp_path):
+    mocker.patch('app.get_audio_pack_dir', return_value=str(tmp_path))
+    response = client.get('/api/lessons/a1-01-greetings-introductions/audio-pack')
+    assert response.status_code == 404
+
+
+def test_voice_registry_keeps_bounded_lru_of_pools(tmp_path):
+    for name in ['fi_FI-harri-low', 'fi_FI-harri-medium', 'fi_FI-asmo-medium']:
+        (tmp_path / f'{name}.onnx').write_bytes(b'model')
+    (tmp_path / 'fi_FI-harri-low.onnx.json').write_text('{"language": {"code": "fi_FI"}, "audio": {"quality": "low"}}')
+
+    closed = []
+
+    class FakePool:
+        def __init__(self, voice):
+            self.voice = voice
+
+        def synthesize(self, text):
+            return f'{self.voice["name"]}:{text}'.encode('utf-8'), 'audio/wav'
+
+        def pids(self):
+            return []
+
+        def close(self):
+            closed.append(self.voice['name'])
+
+    registry = VoiceRegistry(str(tmp_path), FakePool, max_resident=2)
+    assert registry.synthesize('fi_FI-harri-low', 'Hei') == (b'fi_FI-harri-low:Hei', 'audio/wav')
+    registry.synthesize('fi_FI-harri-medium', 'Hei')
+    registry.synthesize('fi_FI-harri-low', 'Moi')
+    registry.synthesize('fi_FI-asmo-medium', 'Hei')
+
+    deadline = time.monotonic() + 2
+    while not closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert closed == ['fi_FI-harri-medium']
+    stats = {voice['name']: voice for voice in registry.voice_stats()}
+    assert stats['fi_FI-harri-low']['resident'] is True
+    assert stats['fi_FI-harri-low']['quality'] == 'low'
+    assert stats['fi_FI-harri-medium']['resident'] is False
+    with pytest.raises(LookupError):
+        registry.get_pool('sv_SE-nst-medium')
+
+
+def test_voice_registry_closes_evicted_pool_after_its_last_job(tmp_path):
+    for name in ['fi_FI-harri-low', 'fi_FI-harri-medium']:
+        (tmp_path / f'{name}.onnx').write_bytes(b'model')
+
+    job_started = threading.Event()
+    release_job = threading.Event()
+    slow_load = threading.Event()
+    closed = []
+
+    class FakePool:
+        def __init__(self, voice):
+            self.voice = voice
+            if voice['name'] == 'fi_FI-harri-medium':
+                slow_load.wait(5)
+
+        def synthesize(self, text):
+            job_started.set()
+            release_job.wait(5)
+            return b'RIFF', 'audio/wav'
+
+        def pids(self):
+            return []
+
+        def close(self):
+            closed.append(self.voice['name'])
+
+    registry = VoiceRegistry(str(tmp_path), FakePool, max_resident=1)
+    job = threading.Thread(target=registry.synthesize, args=('fi_FI-harri-low', 'Hei'))
+    job.start()
+    assert job_started.wait(2)
+
+    loader = threading.Thread(target=registry.get_pool, args=('fi_FI-harri-medium',))
+    loader.start()
+    # Building one voice's pool does not block the registry for the others.
+    assert registry.voice_stats()[0]['resident'] is True
+    slow_load.set()
+    loader.join(2)
+
+    assert registry.voice_stats()[0]['resident'] is False
+    time.sleep(0.05)
+    assert closed == []
+
+    release_job.set()
+    job.join(2)
+    deadline = time.monotonic() + 2
+    while not closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert closed == ['fi_FI-harri-low']
+
+
+def test_tts_rejects_unknown_voice(client, mocker):
+    mocker.patch('app.get_voice_registry', return_value=SimpleNamespace(get_voice=lambda name: None))
+    mocker.patch('app.app_config', SimpleNamespace(LOCAL_TTS_ENABLED=True, LOCAL_TTS_PROVIDER='piper'))
+    response = client.post('/api/tts', json={'text': 'Hei', 'voice': 'sv_SE-nst-medium'})
+    assert response.status_code == 400
@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+
+class TranslationJob:
+    """One document translation: its lines, per-line results and progress.
+
+    Results are recorded in completion order as ``(index, result)`` events,
+    so pollers and streams can pick up where they left off.
+    """
+
+    def __init__(self, lines):
+        self.id = uuid.uuid4().hex
+        self.lines = lines
+        self.status = JOB_QUEUED
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.results = [None] * len(lines)
+        self.events = []
+        self.cancel_requested = False
+        self._condition = threading.Condition()
+
+    def add_result(self, index, result):
+        with self._condition:
+            self.results[index] = result
+            self.events.append((index, result))
+            self._condition.notify_all()
+
+    def start(self):
+        with self._condition:
+            if self.status == JOB_QUEUED:
+                self.status = JOB_RUNNING
+
+    def finish(self, status, error=None):
+        with self._condition:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+            self._condition.notify_all()
+
+    def cancel(self):
+        with self._condition:
+            self.cancel_requested = True
+            if self.status == JOB_QUEUED:
+                self.status = JOB_CANCELLED
+                self.finished_at = time.time()
+            self._condition.notify_all()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATES
+
+    def events_since(self, cursor, timeout):
+        """Wait up to ``timeout`` for events after ``cursor``; return ``(events, finished)``."""
+        with self._condition:
+            if len(self.events) <= cursor and not self.finished:
+                self._condition.wait(timeout)
+            return self.events[cursor:], self.finished
+
+    def summary(self, include_results=False):
+        with self._condition:
+            completed = len(self.events)
+            summary = {
+                'id': self.id,
+                'status': self.status,
+                'total': len(self.lines),
+                'completed': completed,
+                'failed': sum(1 for _index, result in self.events if not result['success']),
+                'createdAt': self.created_at,
+                'finishedAt': self.finished_at,
+            }
+            if self.error:
+                summary['error'] = self.error
+            if include_results:
+                summary['results'] = list(self.results)
+            return summary
+
+
+class TranslationJobManager:
+    """Runs translation jobs on a background worker pool and keeps their results.
+
+    ``run_job(job)`` does the work and reports through ``job.add_result``;
+    it should return early once ``job.cancel_requested`` is set. Finished
+    jobs are forgotten ``result_ttl_seconds`` after they finish.
+    """
+
+    def __init__(self, run_job, max_workers=2, result_ttl_seconds=3600, max_jobs=100):
+        self.run_job = run_job
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_jobs = max(1, int(max_jobs))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix='translation-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, lines):
+        """Queue a job for ``lines``; raise ``OverflowError`` when too many jobs are kept."""
+        self.expire()
+        job = TranslationJob(lines)
+        with self._lock:
+            active = sum(1 for existing in self._jobs.values() if not existing.finished)
+            if active >= self.max_jobs:
+                raise OverflowError('Too many translation jobs are queued')
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        if job.cancel_requested:
+            return
+        job.start()
+        try:
+            self.run_job(job)
+        except Exception as exc:
+            logger.error('Translation job %s failed: %s', job.id, str(exc))
+            job.finish(JOB_FAILED, 'Translation job failed')
+            return
+        job.finish(JOB_CANCELLED if job.cancel_requested else JOB_DONE)
+
+    def get(self, job_id):
+        self.expire()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def expire(self):
+        cutoff = time.time() - self.result_ttl_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            'jobs': len(jobs),
+            'active': sum(1 for job in jobs if not job.finished),
+        }
+
+    def close(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,201 @@
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+TranslationMatch = namedtuple('TranslationMatch', ['translation', 'similarity', 'source_text'])
+
+SIGNATURE_SIZE = 32
+# Candidates whose MinHash estimate falls this far below the threshold's
+# Jaccard similarity are skipped without exact scoring (about 3 standard
+# deviations of a 32-value estimate).
+ESTIMATE_SLACK = 0.2
+_NON_WORD = re.compile(r'[^\w\s]+')
+
+
+def memory_key(text):
+    """Fold case, punctuation and whitespace, which rarely change a translation."""
+    return ' '.join(_NON_WORD.sub(' ', text.casefold()).split())
+
+
+def char_ngrams(key, size=3):
+    padded = f' {key} '
+    return frozenset(padded[index:index + size] for index in range(max(1, len(padded) - size + 1)))
+
+
+def dice_similarity(grams, other_grams):
+    return 2 * len(grams & other_grams) / (len(grams) + len(other_grams))
+
+
+def _rows_per_band(min_similarity):
+    """Fewest LSH bands that still find ~98% of pairs at ``min_similarity``.
+
+    Fewer, wider bands mean fewer false candidates to verify.
+    """
+    jaccard = min_similarity / (2 - min_similarity)
+    for rows in (8, 4, 2):
+        bands = SIGNATURE_SIZE // rows
+        if 1 - (1 - jaccard ** rows) ** bands >= 0.98:
+            return rows
+    return 1
+
+
+class _Entry:
+    __slots__ = ('key', 'text', 'translation')
+
+    def __init__(self, key, text, translation):
+        self.key = key
+        self.text = text
+        self.translation = translation
+
+
+class TranslationMemory:
+    """Fuzzy lookup of earlier translations by character trigram similarity.
+
+    Similarity is the Dice coefficient of the two sentences' trigram sets,
+    after folding case and punctuation. Exact folded matches come from a
+    dict. Near matches are found with MinHash locality-sensitive hashing:
+    each sentence gets a ``SIGNATURE_SIZE``-value MinHash of its trigrams,
+    split into bands, and only sentences sharing a band bucket with the
+    query are scored exactly. Lookup cost therefore depends on the number of
+    near neighbours, not the memory size. Candidates are first screened by
+    how many signature values they share with the query, in one numpy
+    comparison; only plausible ones are scored exactly. The bands are sized
+    so a sentence at ``min_similarity`` is found about 98% of the time, and
+    closer ones almost always. Past ``max_entries`` the oldest entry is
+    forgotten.
+    """
+
+    def __init__(self, min_similarity=0.9, max_entries=200000, ngram_size=3, seed=1):
+        self.min_similarity = min_similarity
+        self.max_entries = max(1, int(max_entries))
+        self.ngram_size = ngram_size
+        self.rows_per_band = _rows_per_band(min_similarity)
+        random_state = np.random.RandomState(seed)
+        # Multiply-shift hashing: (a * x + b) mod 2**64, top 32 bits; a must be odd.
+        self._multipliers = random_state.randint(1, 2 ** 62, SIGNATURE_SIZE, dtype=np.int64).astype(np.uint64) * 2 + 1
+        self._offsets = random_state.randint(0, 2 ** 62, SIGNATURE_SIZE, dtype=np.int64).astype(np.uint64)
+        self._entries = OrderedDict()
+        self._ids_by_key = {}
+        self._buckets = [{} for _ in range(SIGNATURE_SIZE // self.rows_per_band)]
+        # Row ``entry_id % max_entries``; live ids are the latest max_entries, so rows never clash.
+        self._signatures = np.zeros((min(self.max_entries, 1024), SIGNATURE_SIZE), dtype=np.uint32)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _signature(self, grams):
+        hashes = np.fromiter((hash(gram) & 0xFFFFFFFFFFFF for gram in grams), dtype=np.uint64, count=len(grams))
+        with np.errstate(over='ignore'):
+            mixed = self._multipliers[:, None] * hashes[None, :] + self._offsets[:, None]
+        return (mixed >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        rows = self.rows_per_band
+        return [signature[start:start + rows].tobytes() for start in range(0, SIGNATURE_SIZE, rows)]
+
+    def _store_signature(self, entry_id, signature):
+        row = entry_id % self.max_entries
+        if row >= len(self._signatures):
+            grown = np.zeros((min(self.max_entries, len(self._signatures) * 2), SIGNATURE_SIZE), dtype=np.uint32)
+            grown[:len(self._signatures)] = self._signatures
+            self._signatures = grown
+        self._signatures[row] = signature
+
+    def add(self, text, translation):
+        key = memory_key(text)
+        if not key or not translation:
+            return
+        with self._lock:
+            entry_id = self._ids_by_key.get(key)
+            if entry_id is not None:
+                entry = self._entries[entry_id]
+                entry.text = text
+                entry.translation = translation
+                return
+
+            # Evict first: the new entry reuses the oldest entry's signature row.
+            while len(self._entries) >= self.max_entries:
+                self._forget(*self._entries.popitem(last=False))
+
+            signature = self._signature(char_ngrams(key, self.ngram_size))
+            entry_id = self._next_id
+            self._next_id += 1
+            self._store_signature(entry_id, signature)
+            self._entries[entry_id] = _Entry(key, text, translation)
+            self._ids_by_key[key] = entry_id
+            for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+                buckets.setdefault(band_key, set()).add(entry_id)
+
+    def add_many(self, pairs):
+        for text, translation in pairs:
+            self.add(text, translation)
+
+    def _forget(self, entry_id, entry):
+        del self._ids_by_key[entry.key]
+        signature = self._signatures[entry_id % self.max_entries]
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del buckets[band_key]
+
+    def lookup(self, text, min_similarity=None):
+        """Return the best ``TranslationMatch`` at or above the threshold, or None."""
+        threshold = self.min_similarity if min_similarity is None else min_similarity
+        key = memory_key(text)
+        if not key:
+            return None
+
+        with self._lock:
+            entry_id = self._ids_by_key.get(key)
+            if entry_id is not None:
+                entry = self._entries[entry_id]
+                self.hits += 1
+                return TranslationMatch(entry.translation, 1.0, entry.text)
+
+            best = self._best_fuzzy_match(key, threshold)
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            similarity, entry = best
+            return TranslationMatch(entry.translation, round(similarity, 4), entry.text)
+
+    def _best_fuzzy_match(self, key, threshold):
+        if threshold <= 0 or threshold > 1:
+            return None
+        grams = char_ngrams(key, self.ngram_size)
+        signature = self._signature(grams)
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        if not candidates:
+            return None
+
+        candidate_ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        estimates = (self._signatures[candidate_ids % self.max_entries] == signature).mean(axis=1)
+        min_estimate = threshold / (2 - threshold) - ESTIMATE_SLACK
+
+        best = None
+        for entry_id in candidate_ids[estimates >= min_estimate].tolist():
+            entry = self._entries[entry_id]
+            similarity = dice_similarity(grams, char_ngrams(entry.key, self.ngram_size))
+            if similarity >= threshold and (best is None or similarity > best[0]):
+                best = (similarity, entry)
+        return best
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'minSimilarity': self.min_similarity,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import threading
+import time
+
+# SQLite's default limit on bound parameters is 999 in older builds.
+_LOOKUP_BATCH_SIZE = 500
+# Expired rows are deleted on a write at most this often.
+PURGE_INTERVAL_SECONDS = 60 * 60
+
+
+class TranslationStore:
+    """SQLite-backed translation cache shared by worker processes.
+
+    The database runs in WAL mode, so readers in other processes are not
+    blocked by a writer. Rows are keyed by provider, source and target
+    language and the normalized source text. Each thread keeps its own
+    connection, as sqlite3 connections must not be shared across threads.
+
+    Rows older than ``max_age_seconds`` (0 keeps them forever) are ignored
+    by lookups and deleted by a later write. Triggers keep the row count in
+    a one-row ``store_stats`` table, so ``stats`` never scans the table.
+    """
+
+    def __init__(self, path, max_age_seconds=0):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS translations ('
+            ' provider TEXT NOT NULL,'
+            ' source TEXT NOT NULL,'
+            ' target TEXT NOT NULL,'
+            ' text_key TEXT NOT NULL,'
+            ' translation TEXT NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' PRIMARY KEY (provider, source, target, text_key)'
+            ') WITHOUT ROWID'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS translations_created_at ON translations (created_at)')
+        connection.execute('CREATE TABLE IF NOT EXISTS store_stats (id INTEGER PRIMARY KEY CHECK (id = 1), entries INTEGER NOT NULL)')
+        # Seeds the count once, for databases written before it was kept.
+        connection.execute('INSERT OR IGNORE INTO store_stats (id, entries) SELECT 1, COUNT(*) FROM translations')
+        connection.execute(
+            'CREATE TRIGGER IF NOT EXISTS translations_count_insert AFTER INSERT ON translations'
+            ' BEGIN UPDATE store_stats SET entries = entries + 1 WHERE id = 1; END'
+        )
+        connection.execute(
+            'CREATE TRIGGER IF NOT EXISTS translations_count_delete AFTER DELETE ON translations'
+            ' BEGIN UPDATE store_stats SET entries = entries - 1 WHERE id = 1; END'
+        )
+        connection.commit()
+        self._next_purge_at = 0.0
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def get_many(self, text_keys, source, target, provider):
+        """Return ``{text_key: translation}`` for the keys found, in one query per 500 keys."""
+        text_keys = list(dict.fromkeys(text_keys))
+        min_created_at = time.time() - self.max_age_seconds if self.max_age_seconds else 0
+        found = {}
+        connection = self._connection()
+        for start in range(0, len(text_keys), _LOOKUP_BATCH_SIZE):
+            batch = text_keys[start:start + _LOOKUP_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = connection.execute(
+                'SELECT text_key, translation FROM translations'
+                ' WHERE provider = ? AND source = ? AND target = ? AND created_at >= ?'
+                f' AND text_key IN ({placeholders})',
+                [provider, source, target, min_created_at, *batch],
+            )
+            found.update(rows)
+        return found
+
+    def get(self, text_key, source, target, provider):
+        return self.get_many([text_key], source, target, provider).get(text_key)
+
+    def set_many(self, translations, source, target, provider):
+        """Store ``{text_key: translation}`` in one transaction."""
+        if not translations:
+            return
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete skips the count trigger.
+            connection.executemany(
+                'INSERT INTO translations'
+                ' (provider, source, target, text_key, translation, created_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?)'
+                ' ON CONFLICT (provider, source, target, text_key)'
+                ' DO UPDATE SET translation = excluded.translation, created_at = excluded.created_at',
+                [
+                    (provider, source, target, text_key, translation, now)
+                    for text_key, translation in translations.items()
+                ],
+            )
+        if self.max_age_seconds and now >= self._next_purge_at:
+            self._next_purge_at = now + PURGE_INTERVAL_SECONDS
+            self.purge_expired()
+
+    def set(self, text_key, translation, source, target, provider):
+        self.set_many({text_key: translation}, source, target, provider)
+
+    def purge_expired(self):
+        """Delete rows older than ``max_age_seconds``; return how many were deleted."""
+        if not self.max_age_seconds:
+            return 0
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                'DELETE FROM translations WHERE created_at < ?', (time.time() - self.max_age_seconds,)
+            )
+        return cursor.rowcount
+
+    def stats(self):
+        row = self._connection().execute('SELECT entries FROM store_stats WHERE id = 1').fetchone()
+        return {'entries': row[0], 'path': self.path, 'maxAgeSeconds': self.max_age_seconds}
@@ -0,0 +1,190 @@
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+MODEL_SUFFIX = '.onnx'
+
+
+def voice_name(model_path):
+    name = os.path.basename(model_path)
+    return name[:-len(MODEL_SUFFIX)] if name.endswith(MODEL_SUFFIX) else name
+
+
+def _process_rss_bytes(pid):
+    """Resident set size of ``pid`` from /proc, or None where unavailable."""
+    try:
+        with open(f'/proc/{pid}/statm', 'r', encoding='ascii') as statm_file:
+            resident_pages = int(statm_file.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+
+class VoiceRegistry:
+    """Piper voices found on disk, with a bounded LRU of loaded worker pools.
+
+    Voices are ``*.onnx`` models (with an optional ``*.onnx.json`` config) in
+    ``voices_dir``. Only ``max_resident`` voices keep worker processes, and
+    so their model, in memory; loading another voice unloads the least
+    recently used pool. Pools are built outside the registry lock, once per
+    voice however many requests want it, and an unloaded pool is closed in
+    the background after its last running job finishes.
+    """
+
+    def __init__(self, voices_dir, pool_factory, max_resident=2, extra_models=()):
+        self.voices_dir = voices_dir
+        self.pool_factory = pool_factory
+        self.max_resident = max(1, int(max_resident))
+        self.extra_models = [path for path in extra_models if path]
+        self._voices = {}
+        self._pools = OrderedDict()
+        self._users = {}
+        self._retiring = set()
+        self._loading = SingleFlight()
+        self._lock = threading.Lock()
+        self.discover()
+
+    def discover(self):
+        voices = {}
+        model_paths = list(self.extra_models)
+        if self.voices_dir and os.path.isdir(self.voices_dir):
+            model_paths.extend(
+                os.path.join(self.voices_dir, file_name)
+                for file_name in sorted(os.listdir(self.voices_dir))
+                if file_name.endswith(MODEL_SUFFIX)
+            )
+
+        for model_path in model_paths:
+            if not os.path.isfile(model_path):
+                continue
+            config_path = model_path + '.json'
+            metadata = {}
+            if os.path.isfile(config_path):
+                try:
+                    with open(config_path, 'r', encoding='utf-8') as config_file:
+                        metadata = json.load(config_file)
+                except (OSError, ValueError) as exc:
+                    logger.warning('Ignoring unreadable voice config %s: %s', config_path, str(exc))
+            else:
+                config_path = ''
+
+            name = voice_name(model_path)
+            voices.setdefault(name, {
+                'name': name,
+                'model': model_path,
+                'config': config_path,
+                'language': (metadata.get('language') or {}).get('code', ''),
+                'quality': (metadata.get('audio') or {}).get('quality', ''),
+                'sampleRate': (metadata.get('audio') or {}).get('sample_rate'),
+            })
+
+        with self._lock:
+            self._voices = voices
+        return list(voices)
+
+    def get_voice(self, name):
+        return self._voices.get(name)
+
+    def _load(self, name, voice):
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is not None:
+                return pool
+
+        pool = self.pool_factory(voice)
+        idle = []
+        with self._lock:
+            self._pools[name] = pool
+            while len(self._pools) > self.max_resident:
+                evicted_name, evicted_pool = self._pools.popitem(last=False)
+                logger.info('Unloading Piper voice %s', evicted_name)
+                if self._users.get(evicted_pool):
+                    self._retiring.add(evicted_pool)
+                else:
+                    idle.append(evicted_pool)
+
+        for evicted_pool in idle:
+            self._close_in_background(evicted_pool)
+        return pool
+
+    def _checkout(self, name):
+        """Return the voice's pool, loading it if needed, counted as in use until ``_release``."""
+        voice = self._voices.get(name)
+        if voice is None:
+            raise LookupError(f'Unknown voice: {name}')
+
+        while True:
+            with self._lock:
+                pool = self._pools.get(name)
+                if pool is not None:
+                    self._pools.move_to_end(name)
+                    self._users[pool] = self._users.get(pool, 0) + 1
+                    return pool
+            # Another voice may evict it again before we get the lock; then load it anew.
+            self._loading.do(name, self._load, name, voice)
+
+    def _release(self, pool):
+        with self._lock:
+            self._users[pool] -= 1
+            if self._users[pool]:
+                return
+            del self._users[pool]
+            if pool not in self._retiring:
+                return
+            self._retiring.discard(pool)
+        self._close_in_background(pool)
+
+    @staticmethod
+    def _close_in_background(pool):
+        threading.Thread(target=pool.close, name='piper-pool-close', daemon=True).start()
+
+    def get_pool(self, name):
+        """Return the voice's pool, loading it if needed.
+
+        The pool may be closed once it is evicted; ``synthesize`` keeps it
+        loaded for the length of a job.
+        """
+        pool = self._checkout(name)
+        self._release(pool)
+        return pool
+
+    def synthesize(self, name, text):
+        pool = self._checkout(name)
+        try:
+            return pool.synthesize(text)
+        finally:
+            self._release(pool)
+
+    def voice_stats(self):
+        with self._lock:
+            pools = dict(self._pools)
+        stats = []
+        for name, voice in self._voices.items():
+            pool = pools.get(name)
+            memory = None
+            if pool is not None:
+                sizes = [_process_rss_bytes(pid) for pid in pool.pids()]
+                known = [size for size in sizes if size is not None]
+                memory = sum(known) if known else None
+            stats.append({
+                'name': name,
+                'language': voice['language'],
+                'quality': voice['quality'],
+                'resident': pool is not None,
+                'residentBytes': memory,
+            })
+        return stats
+
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values()) + list(self._retiring)
+            self._pools.clear()
+            self._retiring.clear()
+        for pool in pools:
+            pool.close()
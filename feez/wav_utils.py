@@ -0,0 +1,75 @@
+import struct
+from collections import namedtuple
+
+WAVE_FORMAT_PCM = 1
+
+# Size value used in RIFF/data headers when the total length is not known yet.
+STREAMING_SIZE = 0xFFFFFFFF
+
+WavFormat = namedtuple(
+    'WavFormat',
+    ['audio_format', 'channels', 'sample_rate', 'byte_rate', 'block_align', 'bits_per_sample', 'extra'],
+)
+
+
+def pcm_format(channels, sample_rate, bits_per_sample):
+    block_align = channels * bits_per_sample // 8
+    return WavFormat(
+        WAVE_FORMAT_PCM,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        bits_per_sample,
+        b'',
+    )
+
+
+def parse_wav(data):
+    """Split a RIFF/WAVE blob into ``(WavFormat, data_chunk_bytes)``."""
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError('Not a WAV file')
+
+    wav_format = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack_from('<I', data, offset + 4)[0]
+        body_start = offset + 8
+        if chunk_id == b'fmt ':
+            fields = struct.unpack_from('<HHIIHH', data, body_start)
+            extra = data[body_start + 16:body_start + chunk_size]
+            wav_format = WavFormat(*fields, extra)
+        elif chunk_id == b'data':
+            if wav_format is None:
+                raise ValueError('WAV data chunk precedes fmt chunk')
+            # Streamed WAVs may carry a placeholder size; clamp to what is present.
+            return wav_format, data[body_start:body_start + min(chunk_size, len(data) - body_start)]
+        offset = body_start + chunk_size + (chunk_size & 1)
+
+    raise ValueError('WAV file has no data chunk')
+
+
+def wav_header(wav_format, data_size=STREAMING_SIZE, fact_samples=None):
+    fmt_body = struct.pack(
+        '<HHIIHH',
+        wav_format.audio_format,
+        wav_format.channels,
+        wav_format.sample_rate,
+        wav_format.byte_rate,
+        wav_format.block_align,
+        wav_format.bits_per_sample,
+    ) + wav_format.extra
+    chunks = b'fmt ' + struct.pack('<I', len(fmt_body)) + fmt_body
+    if fact_samples is not None:
+        chunks += b'fact' + struct.pack('<II', 4, fact_samples)
+
+    if data_size == STREAMING_SIZE:
+        riff_size = STREAMING_SIZE
+    else:
+        riff_size = 4 + len(chunks) + 8 + data_size
+    return b'RIFF' + struct.pack('<I', riff_size) + b'WAVE' + chunks + b'data' + struct.pack('<I', data_size)
+
+
+def build_wav(wav_format, data, fact_samples=None):
+    return wav_header(wav_format, len(data), fact_samples) + data